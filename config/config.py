@@ -34,6 +34,66 @@ MAX_CONCURRENT_WORKERS = 4
 MAX_RETRIES = 3
 BACKOFF_FACTOR = 5
 
+# Define LLM response cache configuration
+LLM_CACHE_PATH = os.path.join(DATA_PATH, "llm_cache.sqlite3")
+LLM_CACHE_MAX_MEMORY_ENTRIES = 256
+LLM_CACHE_MAX_DISK_ENTRIES = 10000
+LLM_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+# Define the shared HTTP connection pool used for LLM calls
+LLM_HTTP_MAX_CONNECTIONS = 20
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+LLM_HTTP_KEEPALIVE_EXPIRY = 60.0
+LLM_HTTP_TIMEOUT = 600.0
+LLM_HTTP_CONNECT_TIMEOUT = 5.0
+LLM_HTTP2 = False
+
+# Define the LLM rate governor (defaults are OpenAI's tier 1 limits for gpt-4o)
+USE_LLM_RATE_GOVERNOR = True
+LLM_REQUESTS_PER_MINUTE = 500
+LLM_TOKENS_PER_MINUTE = 30000
+LLM_MAX_CONCURRENCY = 8
+LLM_ESTIMATED_COMPLETION_TOKENS = 1000
+# Seconds a request waits for a concurrency slot before the governor gives up
+LLM_RATE_GOVERNOR_TIMEOUT = 600
+
+# Define job post download configuration
+DOWNLOAD_POOL_SIZE = 10
+DOWNLOAD_CONNECT_TIMEOUT = 5.0
+DOWNLOAD_READ_TIMEOUT = 30.0
+DOWNLOAD_RATE_PER_HOST = 1.0  # requests per second
+DOWNLOAD_BURST_PER_HOST = 5
+DOWNLOAD_USE_PROXY_ON_RATE_LIMIT = False
+FETCH_MAX_CONCURRENCY = 16
+FETCH_MAX_PER_HOST = 2
+
+# Define the raw job posting archive used for conditional GETs
+HTML_ARCHIVE_PATH = os.path.join(DATA_PATH, "html_archive")
+USE_HTML_ARCHIVE = True
+
+# Define the durable task queue used for batch tailoring
+TASK_QUEUE_PATH = os.path.join(DATA_PATH, "task_queue.sqlite3")
+TASK_QUEUE_LEASE_SECONDS = 30 * 60
+TASK_QUEUE_MAX_ATTEMPTS = 3
+TASK_QUEUE_POLL_INTERVAL = 5.0
+
+# Define per-stage checkpoints stored in each job directory
+USE_STAGE_CHECKPOINTS = True
+
+# Define the manual review wait
+FILE_WATCH_POLL_INTERVAL = 0.25  # seconds, used where inotify is unavailable
+MANUAL_REVIEW_TIMEOUT = None  # seconds, None waits indefinitely
+
+# Define batch PDF rendering
+PDF_RENDER_WORKERS = None  # worker processes, None uses one per CPU
+PDF_SECTION_CACHE_MAX_ENTRIES = 512  # built resume sections kept per generator, 0 disables
+
+# Define the cache of rendered PDFs, keyed by resume content and style sheet
+USE_PDF_RENDER_CACHE = True
+PDF_RENDER_CACHE_PATH = os.path.join(DATA_PATH, "pdf_render_cache")
+PDF_RENDER_CACHE_MAX_ENTRIES = 1000
+PDF_RENDER_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
 
 # Confirm presence of OpenAI API key
 def ensure_openai_api_key():
@@ -1,4 +1,5 @@
-from langchain_core.pydantic_v1 import BaseModel, Field
+from functools import lru_cache
+from langchain_core.pydantic_v1 import BaseModel, Field, create_model
 from typing import List, Optional
 from ..prompts.prompts import Prompts
 from .. import config
@@ -46,10 +47,32 @@ class JobDescription(BaseModel):
     )
 
 
+@lru_cache(maxsize=None)
+def partial_job_description(fields: tuple[str, ...]) -> type[BaseModel]:
+    """Build a `JobDescription` schema restricted to the given fields.
+
+    Args:
+        fields (tuple[str, ...]): The names of the fields to keep.
+
+    Returns:
+        type[BaseModel]: A model named `JobDescription` with only those fields.
+    """
+    model = create_model(
+        "JobDescription",
+        **{
+            name: (JobDescription.__fields__[name].outer_type_, JobDescription.__fields__[name].field_info)
+            for name in fields
+        },
+    )
+    model.__doc__ = JobDescription.__doc__
+    return model
+
+
 class JobPost:
-    def __init__(self, posting: str):
-        """Initialize JobPost with the job posting string."""
+    def __init__(self, posting: str, html: str = None):
+        """Initialize JobPost with the job posting string and, optionally, the page HTML."""
         self.posting = posting
+        self.html = html
         self.extractor_llm = services.langchain_helpers.create_llm(
             chat_model=config.CHAT_MODEL,
             model_name=config.MODEL_NAME,
@@ -59,7 +82,19 @@ class JobPost:
         self.parsed_job = None
 
     def parse_job_post(self, **chain_kwargs) -> dict:
-        """Parse the job posting to extract job description and skills."""
-        model = self.extractor_llm.with_structured_output(JobDescription)
-        self.parsed_job = model.invoke(self.posting).dict()
+        """Parse the job posting to extract job description and skills.
+
+        Fields found in the page's schema.org `JobPosting` JSON-LD are used as-is and
+        the LLM is only asked for the remaining ones, so its output schema is smaller.
+        """
+        prefilled = services.extract_structured_job_fields(self.html)
+        missing = tuple(f for f in JobDescription.__fields__ if f not in prefilled)
+        if len(missing) == len(JobDescription.__fields__):
+            schema = JobDescription
+        else:
+            schema = partial_job_description(missing)
+        model = self.extractor_llm.with_structured_output(schema)
+        parsed_job = model.invoke(self.posting).dict()
+        parsed_job.update(prefilled)
+        self.parsed_job = JobDescription(**parsed_job).dict()
         return self.parsed_job
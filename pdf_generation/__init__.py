@@ -1 +1,4 @@
 from .resume_pdf_generator import *
+from .fonts import *
+from .batch_render import *
+from .render_cache import *
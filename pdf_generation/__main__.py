@@ -0,0 +1,4 @@
+import sys
+from .batch_render import batch_render_main
+
+sys.exit(batch_render_main())
@@ -0,0 +1,184 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional
+from .. import config
+from .resume_pdf_generator import get_resume_pdf_generator
+
+RESUME_YAML_NAME = "resume.yaml"
+
+
+class RenderResult:
+    """The outcome of rendering the PDF of one job directory."""
+
+    def __init__(
+        self,
+        job_data_location: str,
+        pdf_location: Optional[str] = None,
+        error: Optional[str] = None,
+        seconds: float = 0.0,
+    ):
+        """Initialize the result.
+
+        Args:
+            job_data_location (str): The job directory.
+            pdf_location (str, optional): The rendered PDF, None if rendering failed.
+            error (str, optional): The error that stopped rendering.
+            seconds (float, optional): Time spent rendering in the worker.
+        """
+        self.job_data_location = job_data_location
+        self.pdf_location = pdf_location
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_dict(self) -> dict:
+        """Summarize the result."""
+        return dict(self.__dict__)
+
+
+def find_job_directories(root: str, yaml_name: str = RESUME_YAML_NAME) -> list:
+    """Find every directory below `root` that holds a tailored resume.
+
+    Args:
+        root (str): The directory to search, e.g. `config.DATA_PATH`.
+        yaml_name (str, optional): The resume file name. Defaults to `resume.yaml`.
+
+    Returns:
+        list: The job directories, sorted.
+    """
+    return sorted(
+        directory
+        for directory, _, filenames in os.walk(root)
+        if yaml_name in filenames
+    )
+
+
+def _warm_worker():
+    """Register fonts once in a pool worker, before its first render."""
+    get_resume_pdf_generator()._register_fonts()
+
+
+def render_job_pdf(
+    job_data_location: str, yaml_name: str = RESUME_YAML_NAME
+) -> RenderResult:
+    """Render the PDF of one job directory from its resume YAML.
+
+    Args:
+        job_data_location (str): The job directory.
+        yaml_name (str, optional): The resume file name. Defaults to `resume.yaml`.
+
+    Returns:
+        RenderResult: The PDF location, or the error that stopped rendering.
+    """
+    start = time.perf_counter()
+    try:
+        pdf_location = get_resume_pdf_generator().generate_pdf_from_resume_yaml(
+            os.path.join(job_data_location, yaml_name), job_data_location
+        )
+    except Exception as e:
+        return RenderResult(
+            job_data_location,
+            error=f"{type(e).__name__}: {e}",
+            seconds=time.perf_counter() - start,
+        )
+    return RenderResult(
+        job_data_location, pdf_location, seconds=time.perf_counter() - start
+    )
+
+
+def render_pdfs(
+    job_data_locations: Iterable[str],
+    max_workers: int = None,
+    yaml_name: str = RESUME_YAML_NAME,
+) -> Iterator[RenderResult]:
+    """Render the PDFs of many job directories across a process pool.
+
+    reportlab holds the GIL while laying out a document, so renders are spread over
+    processes rather than threads. Each worker registers its fonts once when it starts.
+
+    Args:
+        job_data_locations (Iterable[str]): The job directories to render.
+        max_workers (int, optional): Number of worker processes. Defaults to
+            `config.PDF_RENDER_WORKERS`, or the number of CPUs if that is None.
+            With 1, renders run in the current process.
+        yaml_name (str, optional): The resume file name. Defaults to `resume.yaml`.
+
+    Yields:
+        RenderResult: The result of each job, as soon as its render finishes.
+    """
+    job_data_locations = list(job_data_locations)
+    max_workers = max_workers or config.PDF_RENDER_WORKERS or os.cpu_count() or 1
+    max_workers = min(max_workers, len(job_data_locations))
+    if max_workers <= 1:
+        for job_data_location in job_data_locations:
+            yield render_job_pdf(job_data_location, yaml_name)
+        return
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_warm_worker
+    ) as executor:
+        futures = {
+            executor.submit(render_job_pdf, job_data_location, yaml_name): job_data_location
+            for job_data_location in job_data_locations
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # The worker died (e.g. BrokenProcessPool) before returning a result
+                yield RenderResult(futures[future], error=f"{type(e).__name__}: {e}")
+
+
+def batch_render_main(argv=None) -> int:
+    """Render PDFs from the command line. Returns 1 if any render failed."""
+    parser = argparse.ArgumentParser(
+        prog="python -m ResumeGPT.pdf_generation",
+        description="Render resume PDFs of many job directories in parallel.",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Job directories, or directories to search for them with --recursive. "
+        "Defaults to the data directory.",
+    )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help=f"Render every directory below the given paths that holds a {RESUME_YAML_NAME}.",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None, help="Number of worker processes."
+    )
+    parser.add_argument(
+        "--yaml-name", default=RESUME_YAML_NAME, help="Name of the resume YAML file."
+    )
+    args = parser.parse_args(argv)
+
+    paths = args.paths or [config.DATA_PATH]
+    if args.recursive or not args.paths:
+        job_data_locations = [
+            directory
+            for path in paths
+            for directory in find_job_directories(path, args.yaml_name)
+        ]
+    else:
+        job_data_locations = paths
+
+    failures = 0
+    for result in render_pdfs(job_data_locations, args.workers, args.yaml_name):
+        if result.ok:
+            print(f"{result.pdf_location} ({result.seconds:.2f}s)")
+        else:
+            failures += 1
+            print(f"FAILED {result.job_data_location}: {result.error}", file=sys.stderr)
+    print(
+        f"Rendered {len(job_data_locations) - failures}/{len(job_data_locations)} PDFs.",
+        file=sys.stderr,
+    )
+    return 1 if failures else 0
@@ -0,0 +1,58 @@
+import threading
+from reportlab.pdfbase import pdfmetrics, ttfonts
+from . import resume_pdf_styles
+
+_font_lock = threading.Lock()
+
+
+def register_font(font_name: str) -> bool:
+    """
+    Load and register one of the resume fonts, unless it is already registered.
+
+    Args:
+        font_name (str): The name of the font, a value of `resume_pdf_styles.FONT_NAMES`.
+
+    Returns:
+        bool: True if the font was loaded by this call, False if it was already registered
+            or is not one of the resume fonts (e.g. a ReportLab built-in).
+    """
+    styles_by_name = {name: style for style, name in resume_pdf_styles.FONT_NAMES.items()}
+    if font_name not in styles_by_name:
+        return False
+    with _font_lock:
+        if font_name in pdfmetrics.getRegisteredFontNames():
+            return False
+        path = resume_pdf_styles.FONT_PATHS[styles_by_name[font_name]]
+        pdfmetrics.registerFont(ttfonts.TTFont(font_name, path))
+    return True
+
+
+def fonts_used_by(paragraph_styles) -> set:
+    """
+    Collect the font names used by paragraph styles.
+
+    Args:
+        paragraph_styles (Iterable[ParagraphStyle]): The styles.
+
+    Returns:
+        set: The font names.
+    """
+    return {style.fontName for style in paragraph_styles}
+
+
+def ensure_fonts_registered(paragraph_styles=None, font_names=()) -> set:
+    """
+    Register the resume fonts a style sheet needs. Each font file is parsed once per process.
+
+    Args:
+        paragraph_styles (Iterable[ParagraphStyle], optional): The styles to render with.
+            Defaults to `resume_pdf_styles.PARAGRAPH_STYLES`.
+        font_names (Iterable[str], optional): Fonts used in inline `<font>` markup.
+
+    Returns:
+        set: The font names that were loaded by this call.
+    """
+    if paragraph_styles is None:
+        paragraph_styles = resume_pdf_styles.PARAGRAPH_STYLES.values()
+    needed = fonts_used_by(paragraph_styles) | set(font_names)
+    return {name for name in sorted(needed) if register_font(name)}
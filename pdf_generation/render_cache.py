@@ -0,0 +1,221 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+from .. import config
+from .. import utils
+from . import resume_pdf_styles
+
+# Bump to invalidate every cached PDF, e.g. after upgrading reportlab
+RENDER_CACHE_VERSION = 1
+# Stores between scans for expired entries, when the entry limit is not exceeded
+EVICTION_INTERVAL = 100
+# Resume fields read by ResumePDFGenerator; others, like `editing`, do not change the PDF
+RENDERED_FIELDS = (
+    "basic",
+    "objective",
+    "experiences",
+    "projects",
+    "education",
+    "skills",
+    "debug",
+)
+# Modules whose code decides the layout of a resume
+_LAYOUT_SOURCES = ("resume_pdf_generator.py", "resume_pdf_styles.py")
+
+
+def _style_signature(style) -> list:
+    """Describe a ParagraphStyle by its attributes, naming its parent instead of nesting it."""
+    return sorted(
+        (key, getattr(value, "name", None) if key == "parent" else repr(value))
+        for key, value in vars(style).items()
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def render_fingerprint() -> str:
+    """Hash the style sheet, fonts and layout code that a rendered PDF depends on.
+
+    Computed once per process. Editing a style, swapping a font file or changing the
+    layout code gives a new fingerprint, so PDFs cached before the change are not reused.
+
+    Returns:
+        str: The fingerprint.
+    """
+    digest = hashlib.sha256(f"render-cache-v{RENDER_CACHE_VERSION}".encode("utf-8"))
+    package_path = os.path.dirname(os.path.abspath(__file__))
+    for source in _LAYOUT_SOURCES:
+        with open(os.path.join(package_path, source), "rb") as stream:
+            digest.update(stream.read())
+    for style, path in sorted(resume_pdf_styles.FONT_PATHS.items()):
+        stat = os.stat(path)
+        font = (style, resume_pdf_styles.FONT_NAMES[style], stat.st_size, stat.st_mtime_ns)
+        digest.update(repr(font).encode("utf-8"))
+    styles = {
+        name: _style_signature(style)
+        for name, style in resume_pdf_styles.PARAGRAPH_STYLES.items()
+    }
+    digest.update(
+        repr(
+            (
+                sorted(styles.items()),
+                resume_pdf_styles.DOCUMENT_ALIGNMENT,
+                resume_pdf_styles.DEBUG_STYLE,
+                resume_pdf_styles.DEFAULT_PADDING,
+                resume_pdf_styles.FULL_COLUMN_WIDTH,
+            )
+        ).encode("utf-8")
+    )
+    return digest.hexdigest()
+
+
+def render_cache_key(data: dict) -> str:
+    """Hash the rendered fields of resume data canonically, together with the render fingerprint.
+
+    Key order and whitespace of the YAML do not matter, and only `RENDERED_FIELDS` are
+    hashed, so saving a resume without changing its content, or only flipping its
+    `editing` flag, keeps the same key.
+
+    Args:
+        data (dict): The resume data.
+
+    Returns:
+        str: The cache key.
+    """
+    rendered = {field: data[field] for field in RENDERED_FIELDS if field in data}
+    canonical = json.dumps(
+        rendered, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(
+        f"{render_fingerprint()}\x00{canonical}".encode("utf-8")
+    ).hexdigest()
+
+
+class PDFRenderCache:
+    """On-disk cache of rendered resume PDFs keyed by `render_cache_key`.
+
+    Each hit refreshes the entry's modification time, which eviction uses to drop
+    entries older than the TTL and the least recently used ones beyond `max_entries`.
+    Eviction scans the cache directory, so it only runs once the entries counted
+    since the last scan exceed `max_entries`, or every `EVICTION_INTERVAL` stores.
+    Files are written atomically, so several processes can share the cache.
+    """
+
+    def __init__(
+        self,
+        root: str = None,
+        max_entries: int = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """Initialize the cache. The directory is created on first store.
+
+        Args:
+            root (str, optional): Directory of the cache. Defaults to `config.PDF_RENDER_CACHE_PATH`.
+            max_entries (int, optional): Maximum PDFs kept. Defaults to `config.PDF_RENDER_CACHE_MAX_ENTRIES`.
+            ttl_seconds (float, optional): Age after which unused entries expire. Defaults to `config.PDF_RENDER_CACHE_TTL_SECONDS`.
+        """
+        self.root = root or config.PDF_RENDER_CACHE_PATH
+        self.max_entries = (
+            max_entries if max_entries is not None else config.PDF_RENDER_CACHE_MAX_ENTRIES
+        )
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else config.PDF_RENDER_CACHE_TTL_SECONDS
+        )
+        self._lock = threading.Lock()
+        self._entry_count = None
+        self._stores_since_eviction = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> str:
+        """Path of the cached PDF with the given key."""
+        return os.path.join(self.root, key[:2], f"{key}.pdf")
+
+    def load(self, key: str) -> Optional[bytes]:
+        """Return the cached PDF for a key, or None if it is missing."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as stream:
+                pdf = stream.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return pdf
+
+    def store(self, key: str, pdf):
+        """Cache a rendered PDF (bytes or memoryview), evicting stale or excess entries when due."""
+        path = self._path(key)
+        is_new = not os.path.exists(path)
+        try:
+            utils.atomic_write(path, pdf)
+        except OSError as e:
+            config.logger.warning(f"Could not cache the rendered PDF: {e}")
+            return
+        with self._lock:
+            self._stores_since_eviction += 1
+            if self._entry_count is not None and is_new:
+                self._entry_count += 1
+            due = (
+                self._entry_count is None
+                or bool(self.max_entries) and self._entry_count > self.max_entries
+                or self._stores_since_eviction >= EVICTION_INTERVAL
+            )
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Remove entries older than the TTL and the least recently used beyond `max_entries`.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith(".pdf"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    entries.append((os.stat(path).st_mtime, path))
+                except OSError:
+                    continue
+        entries.sort(reverse=True)
+        stale = []
+        if self.ttl_seconds:
+            oldest = time.time() - self.ttl_seconds
+            stale = [path for mtime, path in entries if mtime < oldest]
+            entries = [entry for entry in entries if entry[0] >= oldest]
+        if self.max_entries:
+            stale.extend(path for _, path in entries[self.max_entries :])
+            entries = entries[: self.max_entries]
+        evicted = 0
+        for path in stale:
+            try:
+                os.unlink(path)
+                evicted += 1
+            except OSError:
+                continue
+        with self._lock:
+            self.evictions += evicted
+            self._entry_count = len(entries)
+            self._stores_since_eviction = 0
+        return evicted
+
+    def stats(self) -> dict:
+        """Return hit, miss and eviction counters for this process."""
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, evictions=self.evictions)
+
+
+@utils.process_singleton
+def get_pdf_render_cache() -> PDFRenderCache:
+    """Return the render cache at `config.PDF_RENDER_CACHE_PATH`, whose counters cover every render in this process."""
+    return PDFRenderCache()
@@ -1,4 +1,7 @@
 import configparser
+import copy
+import hashlib
+import io
 import json
 import os
 import random
@@ -12,7 +15,6 @@ from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.pdfbase import pdfmetrics, ttfonts
 from reportlab.platypus import (
     Paragraph,
     SimpleDocTemplate,
@@ -21,7 +23,11 @@ from reportlab.platypus import (
     Spacer,
     HRFlowable,
 )
+import threading
+from collections import OrderedDict
 from . import resume_pdf_styles
+from .fonts import ensure_fonts_registered
+from .render_cache import get_pdf_render_cache, render_cache_key
 
 
 class ResumePDFGenerator:
@@ -31,18 +37,24 @@ class ResumePDFGenerator:
 
     def __init__(self):
         """
-        Initialize the ResumePDFGenerator by registering fonts.
+        Initialize the ResumePDFGenerator. Fonts are registered on first use.
         """
-        self._register_fonts()
+        self._fonts_ready = False
+        self._sections = OrderedDict()
+        self._sections_lock = threading.Lock()
+        self.section_hits = 0
+        self.section_misses = 0
 
     def _register_fonts(self):
         """
-        Register fonts for use in the PDF.
+        Register the fonts used by the resume styles, once per process.
         """
-        for style, path in resume_pdf_styles.FONT_PATHS.items():
-            pdfmetrics.registerFont(
-                ttfonts.TTFont(resume_pdf_styles.FONT_NAMES[style], path)
+        if not self._fonts_ready:
+            ensure_fonts_registered(
+                resume_pdf_styles.PARAGRAPH_STYLES.values(),
+                font_names=[resume_pdf_styles.FONT_NAMES["bold"]],
             )
+            self._fonts_ready = True
 
     def _append_section_table_style(self, table_styles, row_index):
         """
@@ -60,6 +72,26 @@ class ResumePDFGenerator:
             ]
         )
 
+    def _add_section_heading(self, table_data, table_styles, row_index, title):
+        """
+        Add a section heading, underlined across the table, to the resume.
+
+        Args:
+            table_data (list): The table data to be extended.
+            table_styles (list): The table styles to be extended.
+            row_index (int): The current row index in the table.
+            title (str): The section title, e.g. `Experience`.
+        """
+        row_index = self._add_table_row(
+            table_data=table_data,
+            table_styles=table_styles,
+            row_index=row_index,
+            content_style_map=[(title, resume_pdf_styles.PARAGRAPH_STYLES["section"])],
+            span=True,
+        )
+        self._append_section_table_style(table_styles, row_index - 1)
+        return row_index
+
     def _add_table_row(
         self,
         table_data,
@@ -117,88 +149,100 @@ class ResumePDFGenerator:
             row_index (int): The current row index in the table.
             experiences (list): The list of experiences to be added.
         """
-        row_index = self._add_table_row(
-            table_data=table_data,
-            table_styles=table_styles,
-            row_index=row_index,
-            content_style_map=[
-                ("Experience", resume_pdf_styles.PARAGRAPH_STYLES["section"])
-            ],
-            span=True,
+        row_index = self._add_section_heading(
+            table_data, table_styles, row_index, "Experience"
         )
-        self._append_section_table_style(table_styles, row_index - 1)
 
-        for idx, job in enumerate(experiences):
-            # Create a duration string from startdate and enddate
-            duration = f"{job['titles'][0]['startdate']}-{job['titles'][0]['enddate']}"
-            if job['skip_name']:
-                row_index = self._add_table_row(
-                    table_data=table_data,
-                    table_styles=table_styles,
-                    row_index=row_index,
-                    content_style_map=[
-                        (
-                            job["titles"][0]["name"],
-                            resume_pdf_styles.PARAGRAPH_STYLES["company_title"],
-                        ),
-                        (duration, resume_pdf_styles.PARAGRAPH_STYLES["company_duration"]),
-                    ],
-                )
+        for job in experiences:
+            row_index = self._add_experience(
+                table_data=table_data,
+                table_styles=table_styles,
+                row_index=row_index,
+                job=job,
+            )
 
-            else:
-                row_index = self._add_table_row(
-                    table_data=table_data,
-                    table_styles=table_styles,
-                    row_index=row_index,
-                    content_style_map=[
-                        (
-                            job["company"],
-                            resume_pdf_styles.PARAGRAPH_STYLES["company_heading"],
-                        ),
-                        (duration, resume_pdf_styles.PARAGRAPH_STYLES["company_duration"]),
-                    ],
-                )
-
-                row_index = self._add_table_row(
-                    table_data=table_data,
-                    table_styles=table_styles,
-                    row_index=row_index,
-                    content_style_map=[
-                        (
-                            job["titles"][0]["name"],
-                            resume_pdf_styles.PARAGRAPH_STYLES["company_title"],
-                        ),
-                        (
-                            job["location"],
-                            resume_pdf_styles.PARAGRAPH_STYLES["company_location"],
-                        ),
-                    ],
-                )
-
-            for i, bullet_point in enumerate(job["highlights"]):
-                bullet_point = bullet_point.replace("'", "").replace('"', "").strip()
-                style = (
-                    resume_pdf_styles.PARAGRAPH_STYLES["last_bullet_point"]
-                    if i == len(job["highlights"]) - 1
-                    else resume_pdf_styles.PARAGRAPH_STYLES["bullet_points"]
-                )
-                padding = (0, 1)
-                if i == len(job["highlights"]) - 1:
-                    padding = (5, 1)
-                row_index = self._add_table_row(
-                    table_data=table_data,
-                    table_styles=table_styles,
-                    bullet_point="•",
-                    row_index=row_index,
-                    content_style_map=[
-                        (
-                            bullet_point,
-                            style,
-                        )
-                    ],
-                    span=True,
-                    padding=padding,
-                )
+        return row_index
+
+    def _add_experience(self, table_data, table_styles, row_index, job):
+        """
+        Add one experience, with its heading rows and bullet points, to the resume.
+
+        Args:
+            table_data (list): The table data to be extended.
+            table_styles (list): The table styles to be extended.
+            row_index (int): The current row index in the table.
+            job (dict): The experience to be added.
+        """
+        # Create a duration string from startdate and enddate
+        duration = f"{job['titles'][0]['startdate']}-{job['titles'][0]['enddate']}"
+        if job['skip_name']:
+            row_index = self._add_table_row(
+                table_data=table_data,
+                table_styles=table_styles,
+                row_index=row_index,
+                content_style_map=[
+                    (
+                        job["titles"][0]["name"],
+                        resume_pdf_styles.PARAGRAPH_STYLES["company_title"],
+                    ),
+                    (duration, resume_pdf_styles.PARAGRAPH_STYLES["company_duration"]),
+                ],
+            )
+
+        else:
+            row_index = self._add_table_row(
+                table_data=table_data,
+                table_styles=table_styles,
+                row_index=row_index,
+                content_style_map=[
+                    (
+                        job["company"],
+                        resume_pdf_styles.PARAGRAPH_STYLES["company_heading"],
+                    ),
+                    (duration, resume_pdf_styles.PARAGRAPH_STYLES["company_duration"]),
+                ],
+            )
+
+            row_index = self._add_table_row(
+                table_data=table_data,
+                table_styles=table_styles,
+                row_index=row_index,
+                content_style_map=[
+                    (
+                        job["titles"][0]["name"],
+                        resume_pdf_styles.PARAGRAPH_STYLES["company_title"],
+                    ),
+                    (
+                        job["location"],
+                        resume_pdf_styles.PARAGRAPH_STYLES["company_location"],
+                    ),
+                ],
+            )
+
+        for i, bullet_point in enumerate(job["highlights"]):
+            bullet_point = bullet_point.replace("'", "").replace('"', "").strip()
+            style = (
+                resume_pdf_styles.PARAGRAPH_STYLES["last_bullet_point"]
+                if i == len(job["highlights"]) - 1
+                else resume_pdf_styles.PARAGRAPH_STYLES["bullet_points"]
+            )
+            padding = (0, 1)
+            if i == len(job["highlights"]) - 1:
+                padding = (5, 1)
+            row_index = self._add_table_row(
+                table_data=table_data,
+                table_styles=table_styles,
+                bullet_point="•",
+                row_index=row_index,
+                content_style_map=[
+                    (
+                        bullet_point,
+                        style,
+                    )
+                ],
+                span=True,
+                padding=padding,
+            )
 
         return row_index
 
@@ -212,94 +256,106 @@ class ResumePDFGenerator:
             row_index (int): The current row index in the table.
             projects (list): The list of projects to be added.
         """
-        row_index = self._add_table_row(
-            table_data=table_data,
-            table_styles=table_styles,
-            row_index=row_index,
-            content_style_map=[
-                ("Projects", resume_pdf_styles.PARAGRAPH_STYLES["section"])
-            ],
-            span=True,
+        row_index = self._add_section_heading(
+            table_data, table_styles, row_index, "Projects"
         )
-        self._append_section_table_style(table_styles, row_index - 1)
 
-        for idx, project in enumerate(projects):
-            project_name = project["name"]
-            raw_link = project["link"]
-            clean_link = raw_link.replace("https://", "").replace("http://", "").replace("www.", "")
-            if project["show_link"]:
-                if project["hyperlink"]:
-                    hyperlink_text = '<a href="%s">%s</a>'%(raw_link, clean_link)
-                    link_style = resume_pdf_styles.PARAGRAPH_STYLES["link"]
-                else:
-                    hyperlink_text = clean_link
-                    link_style = resume_pdf_styles.PARAGRAPH_STYLES["link-no-hyperlink"]
-                heading_style = resume_pdf_styles.PARAGRAPH_STYLES["company_heading"]
-                combined_style = ParagraphStyle(
-                    'combined_project_style',
-                    parent=heading_style,
-                    allowWidows=0,
-                    allowOrphans=0
-                )
-                link_color_hex = '#' +link_style.textColor.hexval()[2:]
-                paragraph_text = (
-                    f'<font name="{heading_style.fontName}" size="{heading_style.fontSize}">'
-                    f'{project_name}: </font>'
-                    f'<font name="{link_style.fontName}" size="{link_style.fontSize}" color="{link_color_hex}">'
-                    f'{hyperlink_text}</font>'
-                )
-
-                row_index = self._add_table_row(
-                    table_data=table_data,
-                    table_styles=table_styles,
-                    row_index=row_index,
-                    content_style_map=[
-                        (
-                            paragraph_text,
-                            combined_style
-                        ),
-                        (project["date"], resume_pdf_styles.PARAGRAPH_STYLES["company_duration"]),
-                    ],
-                )
+        for project in projects:
+            row_index = self._add_project(
+                table_data=table_data,
+                table_styles=table_styles,
+                row_index=row_index,
+                project=project,
+            )
+
+        return row_index
+
+    def _add_project(self, table_data, table_styles, row_index, project):
+        """
+        Add one project, with its heading row and bullet points, to the resume.
+
+        Args:
+            table_data (list): The table data to be extended.
+            table_styles (list): The table styles to be extended.
+            row_index (int): The current row index in the table.
+            project (dict): The project to be added.
+        """
+        project_name = project["name"]
+        raw_link = project["link"]
+        clean_link = raw_link.replace("https://", "").replace("http://", "").replace("www.", "")
+        if project["show_link"]:
+            if project["hyperlink"]:
+                hyperlink_text = '<a href="%s">%s</a>'%(raw_link, clean_link)
+                link_style = resume_pdf_styles.PARAGRAPH_STYLES["link"]
             else:
-                row_index = self._add_table_row(
-                    table_data=table_data,
-                    table_styles=table_styles,
-                    row_index=row_index,
-                    content_style_map=[
-                        (
-                            project_name,
-                            resume_pdf_styles.PARAGRAPH_STYLES["company_heading"]
-                        ),
-                        (project["date"], resume_pdf_styles.PARAGRAPH_STYLES["company_duration"]),
-                    ],
-                )
-
-
-            for i, bullet_point in enumerate(project["highlights"]):
-                bullet_point = bullet_point.replace("'", "").replace('"', "").strip()
-                style = (
-                    resume_pdf_styles.PARAGRAPH_STYLES["last_bullet_point"]
-                    if i == len(project["highlights"]) - 1
-                    else resume_pdf_styles.PARAGRAPH_STYLES["bullet_points"]
-                )
-                padding = (0, 1)
-                if i == len(project["highlights"]) - 1:
-                    padding = (5, 1)
-                row_index = self._add_table_row(
-                    table_data=table_data,
-                    table_styles=table_styles,
-                    bullet_point="•",
-                    row_index=row_index,
-                    content_style_map=[
-                        (
-                            bullet_point,
-                            style,
-                        )
-                    ],
-                    span=True,
-                    padding=padding,
-                )
+                hyperlink_text = clean_link
+                link_style = resume_pdf_styles.PARAGRAPH_STYLES["link-no-hyperlink"]
+            heading_style = resume_pdf_styles.PARAGRAPH_STYLES["company_heading"]
+            combined_style = ParagraphStyle(
+                'combined_project_style',
+                parent=heading_style,
+                allowWidows=0,
+                allowOrphans=0
+            )
+            link_color_hex = '#' +link_style.textColor.hexval()[2:]
+            paragraph_text = (
+                f'<font name="{heading_style.fontName}" size="{heading_style.fontSize}">'
+                f'{project_name}: </font>'
+                f'<font name="{link_style.fontName}" size="{link_style.fontSize}" color="{link_color_hex}">'
+                f'{hyperlink_text}</font>'
+            )
+
+            row_index = self._add_table_row(
+                table_data=table_data,
+                table_styles=table_styles,
+                row_index=row_index,
+                content_style_map=[
+                    (
+                        paragraph_text,
+                        combined_style
+                    ),
+                    (project["date"], resume_pdf_styles.PARAGRAPH_STYLES["company_duration"]),
+                ],
+            )
+        else:
+            row_index = self._add_table_row(
+                table_data=table_data,
+                table_styles=table_styles,
+                row_index=row_index,
+                content_style_map=[
+                    (
+                        project_name,
+                        resume_pdf_styles.PARAGRAPH_STYLES["company_heading"]
+                    ),
+                    (project["date"], resume_pdf_styles.PARAGRAPH_STYLES["company_duration"]),
+                ],
+            )
+
+
+        for i, bullet_point in enumerate(project["highlights"]):
+            bullet_point = bullet_point.replace("'", "").replace('"', "").strip()
+            style = (
+                resume_pdf_styles.PARAGRAPH_STYLES["last_bullet_point"]
+                if i == len(project["highlights"]) - 1
+                else resume_pdf_styles.PARAGRAPH_STYLES["bullet_points"]
+            )
+            padding = (0, 1)
+            if i == len(project["highlights"]) - 1:
+                padding = (5, 1)
+            row_index = self._add_table_row(
+                table_data=table_data,
+                table_styles=table_styles,
+                bullet_point="•",
+                row_index=row_index,
+                content_style_map=[
+                    (
+                        bullet_point,
+                        style,
+                    )
+                ],
+                span=True,
+                padding=padding,
+            )
 
         return row_index
 
@@ -314,16 +370,9 @@ class ResumePDFGenerator:
             row_index (int): The current row index in the table.
             education (list): The list of education entries to be added.
         """
-        row_index = self._add_table_row(
-            table_data=table_data,
-            table_styles=table_styles,
-            row_index=row_index,
-            content_style_map=[
-                ("Education", resume_pdf_styles.PARAGRAPH_STYLES["section"])
-            ],
-            span=True,
+        row_index = self._add_section_heading(
+            table_data, table_styles, row_index, "Education"
         )
-        self._append_section_table_style(table_styles, row_index - 1)
 
         for edu in education:
             degrees = ", ".join(edu["degrees"][0]["names"])
@@ -351,16 +400,9 @@ class ResumePDFGenerator:
             row_index (int): The current row index in the table.
             skills (list): The list of skills to be added.
         """
-        row_index = self._add_table_row(
-            table_data=table_data,
-            table_styles=table_styles,
-            row_index=row_index,
-            content_style_map=[
-                ("Skills", resume_pdf_styles.PARAGRAPH_STYLES["section"])
-            ],
-            span=True,
+        row_index = self._add_section_heading(
+            table_data, table_styles, row_index, "Skills"
         )
-        self._append_section_table_style(table_styles, row_index - 1)
 
         for group in skills:
             group_keys = list(group.keys())
@@ -380,41 +422,17 @@ class ResumePDFGenerator:
             )
         return row_index
 
-    def generate_resume(self, job_data_location, data):
+    def _add_header(self, table_data, table_styles, row_index, name, info):
         """
-        Generate a resume PDF from JSON data.
+        Add the name and contact information to the resume.
 
         Args:
-            job_data_location (str): The path where the PDF will be saved.
-            data (dict): The JSON data containing resume information.
+            table_data (list): The table data to be extended.
+            table_styles (list): The table styles to be extended.
+            row_index (int): The current row index in the table.
+            name (str): The name of the resume author.
+            info (str): The contact line.
         """
-        email = data["basic"]["email"]
-        name = data["basic"]["name"]
-        phone = data["basic"]["phone"]
-
-        info = f"{email} | {phone}"
-        def clean_url(url):
-            return (
-                url.replace("https://", "").replace("http://", "").replace("www.", "")
-            )
-        for website in data["basic"]["websites"]:
-            info+=f" | {clean_url(website)}"
-
-        address = data["basic"]["address"]
-        info+= f" | {address}"
-        doc, pdf_location = resume_pdf_styles.generate_doc_template(
-            name, job_data_location
-        )
-        table_data = []
-        table_styles = []
-        row_index = 0
-
-        if data.get("debug", False):
-            table_styles.append(resume_pdf_styles.DEBUG_STYLE)
-
-        table_styles.extend(resume_pdf_styles.DOCUMENT_ALIGNMENT)
-
-        # Add name and contact information
         row_index = self._add_table_row(
             table_data=table_data,
             table_styles=table_styles,
@@ -422,72 +440,124 @@ class ResumePDFGenerator:
             content_style_map=[(name, resume_pdf_styles.PARAGRAPH_STYLES["name"])],
             span=True,
         )
-
-        row_index = self._add_table_row(
+        return self._add_table_row(
             table_data=table_data,
             table_styles=table_styles,
             row_index=row_index,
-            content_style_map=[
-                (
-                    info,
-                    resume_pdf_styles.PARAGRAPH_STYLES["contact"],
-                )
-            ],
+            content_style_map=[(info, resume_pdf_styles.PARAGRAPH_STYLES["contact"])],
             span=True,
         )
 
-        # Add objective
-        row_index = self._add_table_row(
-            table_data=table_data,
-            table_styles=table_styles,
-            row_index=row_index,
-            content_style_map=[
-                ("Objective", resume_pdf_styles.PARAGRAPH_STYLES["section"])
-            ],
-            span=True,
-        )
-        self._append_section_table_style(table_styles, row_index - 1)
+    def _add_objective(self, table_data, table_styles, row_index, objective):
+        """
+        Add the objective section to the resume.
 
-        row_index = self._add_table_row(
+        Args:
+            table_data (list): The table data to be extended.
+            table_styles (list): The table styles to be extended.
+            row_index (int): The current row index in the table.
+            objective (str): The objective.
+        """
+        row_index = self._add_section_heading(
+            table_data, table_styles, row_index, "Objective"
+        )
+        return self._add_table_row(
             table_data=table_data,
             table_styles=table_styles,
             row_index=row_index,
             content_style_map=[
-                (data["objective"], resume_pdf_styles.PARAGRAPH_STYLES["objective"])
+                (objective, resume_pdf_styles.PARAGRAPH_STYLES["objective"])
             ],
             span=True,
         )
 
-        # Add experience
-        row_index = self.add_experiences(
-            table_data=table_data,
-            table_styles=table_styles,
-            row_index=row_index,
-            experiences=data["experiences"],
-        )
-        # Add projects
-        row_index = self.add_projects(
-            table_data=table_data,
-            table_styles=table_styles,
-            row_index=row_index,
-            projects=data["projects"],
-        )
+    def _cached_section(self, builder, *content):
+        """
+        Build the rows of a resume section, reusing them while the section's content is unchanged.
 
-        # Add education
-        row_index = self.add_education(
-            table_data=table_data,
-            table_styles=table_styles,
-            row_index=row_index,
-            education=data["education"],
-        )
+        Parsing the markup of a Paragraph is the expensive part of building it, so cached
+        Paragraphs are handed out as shallow copies: the parsed fragments are shared, while
+        the layout state each build stores on a Paragraph stays private to that build.
 
-        # Add skills
-        row_index = self.add_skills(
-            table_data=table_data,
-            table_styles=table_styles,
-            row_index=row_index,
-            skills=data["skills"],
+        Args:
+            builder (Callable): A section builder such as `_add_experience`, called as
+                `builder(table_data, table_styles, 0, *content)`.
+            *content: The section's content.
+
+        Returns:
+            tuple: The section's rows and its table styles, with row indices counted from 0.
+        """
+        key = (
+            builder.__name__,
+            hashlib.sha256(
+                json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest(),
         )
+        with self._sections_lock:
+            section = self._sections.get(key)
+            if section is not None:
+                self._sections.move_to_end(key)
+                self.section_hits += 1
+        if section is None:
+            rows, styles = [], []
+            builder(rows, styles, 0, *content)
+            section = (rows, styles)
+            with self._sections_lock:
+                self.section_misses += 1
+                if config.PDF_SECTION_CACHE_MAX_ENTRIES:
+                    self._sections[key] = section
+                    while len(self._sections) > config.PDF_SECTION_CACHE_MAX_ENTRIES:
+                        self._sections.popitem(last=False)
+        rows, styles = section
+        return [[copy.copy(cell) for cell in row] for row in rows], styles
+
+    def _build_table(self, data):
+        """
+        Build the table holding the whole resume.
+
+        Args:
+            data (dict): The JSON data containing resume information.
+
+        Returns:
+            Table: The resume table, ready to be laid out.
+        """
+        email = data["basic"]["email"]
+        name = data["basic"]["name"]
+        phone = data["basic"]["phone"]
+
+        info = f"{email} | {phone}"
+        def clean_url(url):
+            return (
+                url.replace("https://", "").replace("http://", "").replace("www.", "")
+            )
+        for website in data["basic"]["websites"]:
+            info+=f" | {clean_url(website)}"
+
+        address = data["basic"]["address"]
+        info+= f" | {address}"
+        table_data = []
+        table_styles = []
+
+        if data.get("debug", False):
+            table_styles.append(resume_pdf_styles.DEBUG_STYLE)
+
+        table_styles.extend(resume_pdf_styles.DOCUMENT_ALIGNMENT)
+
+        sections = [
+            (self._add_header, name, info),
+            (self._add_objective, data["objective"]),
+            (self._add_section_heading, "Experience"),
+            *((self._add_experience, job) for job in data["experiences"]),
+            (self._add_section_heading, "Projects"),
+            *((self._add_project, project) for project in data["projects"]),
+            (self.add_education, data["education"]),
+            (self.add_skills, data["skills"]),
+        ]
+        for builder, *content in sections:
+            rows, styles = self._cached_section(builder, *content)
+            offset = len(table_data)
+            table_data.extend(rows)
+            table_styles.extend(_shift_rows(style, offset) for style in styles)
 
         table = Table(
             table_data,
@@ -499,10 +569,73 @@ class ResumePDFGenerator:
             spaceAfter=0,
         )
         table.setStyle(TableStyle(table_styles))
+        return table
 
-        doc.build([table])
+    def generate_resume(self, job_data_location, data, use_cache=None):
+        """
+        Generate a resume PDF from JSON data.
+
+        Args:
+            job_data_location (str): The path where the PDF will be saved.
+            data (dict): The JSON data containing resume information.
+            use_cache (bool, optional): Reuse the PDF rendered earlier from identical data and
+                styles. Defaults to `config.USE_PDF_RENDER_CACHE`.
+        """
+        if config.USE_PDF_RENDER_CACHE if use_cache is None else use_cache:
+            self.generate_resume_bytes(data, job_data_location, use_cache=True)
+            return resume_pdf_styles.resume_pdf_location(
+                data["basic"]["name"], job_data_location
+            )
+        self._register_fonts()
+        doc, pdf_location = resume_pdf_styles.generate_doc_template(
+            data["basic"]["name"], job_data_location
+        )
+        doc.build([self._build_table(data)])
         return pdf_location
 
+    def generate_resume_bytes(
+        self, data, job_data_location=None, as_memoryview=False, use_cache=None
+    ):
+        """
+        Generate a resume PDF in memory, with the same layout as `generate_resume`.
+
+        Args:
+            data (dict): The JSON data containing resume information.
+            job_data_location (str, optional): If given, the PDF is also saved there.
+            as_memoryview (bool, optional): Return a memoryview of the buffer instead of
+                copying it into bytes. Defaults to False.
+            use_cache (bool, optional): Reuse the PDF rendered earlier from identical data and
+                styles. Defaults to `config.USE_PDF_RENDER_CACHE`.
+
+        Returns:
+            bytes | memoryview: The PDF document.
+        """
+        use_cache = config.USE_PDF_RENDER_CACHE if use_cache is None else use_cache
+        pdf = None
+        if use_cache:
+            cache = get_pdf_render_cache()
+            key = render_cache_key(data)
+            pdf = cache.load(key)
+        if pdf is None:
+            self._register_fonts()
+            buffer = io.BytesIO()
+            doc, _ = resume_pdf_styles.generate_doc_template(
+                data["basic"]["name"], output=buffer
+            )
+            doc.build([self._build_table(data)])
+            pdf = buffer.getbuffer() if as_memoryview else buffer.getvalue()
+            if use_cache:
+                cache.store(key, pdf)
+        elif as_memoryview:
+            pdf = memoryview(pdf)
+        if job_data_location is not None:
+            pdf_location = resume_pdf_styles.resume_pdf_location(
+                data["basic"]["name"], job_data_location
+            )
+            with open(pdf_location, "wb") as stream:
+                stream.write(pdf)
+        return pdf
+
     def generate_pdf_from_resume_yaml(self, yaml_path, job_data_location):
         """
         Generate a resume PDF from YAML data.
@@ -514,3 +647,22 @@ class ResumePDFGenerator:
         return self.generate_resume(
             job_data_location, utils.read_yaml(filename=yaml_path)
         )
+
+
+def _shift_rows(table_style, offset):
+    """
+    Move a table style command, e.g. `("SPAN", (0, 2), (1, 2))`, down by `offset` rows.
+    """
+    command, (start_column, start_row), (end_column, end_row), *args = table_style
+    return (command, (start_column, start_row + offset), (end_column, end_row + offset), *args)
+
+
+@utils.process_singleton
+def get_resume_pdf_generator() -> ResumePDFGenerator:
+    """
+    Return the ResumePDFGenerator shared by every render in this process.
+
+    The generator keeps no per-resume state and locks its section cache, so it can be
+    shared between threads. Sharing it also shares the cache.
+    """
+    return ResumePDFGenerator()
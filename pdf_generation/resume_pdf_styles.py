@@ -9,21 +9,41 @@ from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate, Paragraph
 
 
-def generate_doc_template(name, job_data_location):
+def resume_pdf_location(name, job_data_location):
+    """
+    Return the path of the resume PDF of an author in a job directory.
+
+    Args:
+        name (str): The name of the resume author.
+        job_data_location (str): The directory where the PDF is saved.
+
+    Returns:
+        str: The PDF location.
+    """
+    author_name_formatted = name.replace(" ", "_") + "_resume"
+    return os.path.join(job_data_location, f"{author_name_formatted}.pdf")
+
+
+def generate_doc_template(name, job_data_location=None, output=None):
     """
     Generate and return a SimpleDocTemplate for the resume PDF.
 
     Args:
         name (str): The name of the resume author.
-        job_data_location (str): The path where the PDF will be saved.
+        job_data_location (str, optional): The path where the PDF will be saved.
+        output (file-like, optional): A binary buffer, e.g. `io.BytesIO`, to build the PDF
+            into instead of writing it to `job_data_location`.
 
     Returns:
-        tuple: A tuple containing the document template for the resume PDF and the PDF location.
+        tuple: A tuple containing the document template for the resume PDF and the PDF location,
+            which is None when building into `output` without a `job_data_location`.
     """
     author_name_formatted = name.replace(" ", "_") + "_resume"
-    pdf_location = os.path.join(job_data_location, f"{author_name_formatted}.pdf")
+    pdf_location = None
+    if job_data_location is not None:
+        pdf_location = resume_pdf_location(name, job_data_location)
     doc = SimpleDocTemplate(
-        pdf_location,
+        output if output is not None else pdf_location,
         pagesize=A4,
         showBoundary=0,
         leftMargin=0.1 * inch,
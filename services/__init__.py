@@ -1,3 +1,15 @@
 from .resume_improver import *
 from .langchain_helpers import *
 from .background_runner import *
+from .stage_graph import *
+from .llm_cache import *
+from .http_client import *
+from .downloader import *
+from .async_fetcher import *
+from .html_archive import *
+from .html_extractor import *
+from .structured_data import *
+from .task_queue import *
+from .checkpoints import *
+from .rate_governor import *
+from .resume_digest import *
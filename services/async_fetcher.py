@@ -0,0 +1,114 @@
+import asyncio
+import random
+from collections import defaultdict
+from typing import AsyncIterator, Iterable, Optional
+from urllib.parse import urlsplit
+import httpx
+from ..config import config
+from .downloader import RETRYABLE_STATUS_CODES, parse_retry_after
+
+
+async def _fetch_one(
+    client: httpx.AsyncClient,
+    url: str,
+    global_limit: asyncio.Semaphore,
+    host_limit: asyncio.Semaphore,
+) -> tuple[str, Optional[str]]:
+    """Download one URL while holding its per-host slot.
+
+    The per-host slot is taken first, so a backlog for one host waits on its own
+    limit instead of filling the global slots. The global slot is only held while a
+    request is in flight, not while backing off before a retry.
+
+    Returns:
+        tuple[str, Optional[str]]: The URL and its HTML, or None if the download failed.
+    """
+    async with host_limit:
+        for attempt in range(config.MAX_RETRIES):
+            async with global_limit:
+                try:
+                    response = await client.get(url)
+                except httpx.TimeoutException as e:
+                    response = None
+                    timeout_error = e
+                except httpx.HTTPError as e:
+                    config.logger.error(f"Failed to download URL {url}: {e}")
+                    return url, None
+
+            if response is None:
+                delay = config.BACKOFF_FACTOR * 2**attempt * random.uniform(0.5, 1.5)
+                config.logger.warning(
+                    f"Request to {url} timed out ({timeout_error}). Retrying in {delay:.1f} seconds..."
+                )
+                await asyncio.sleep(delay)
+                continue
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = config.BACKOFF_FACTOR * 2**attempt * random.uniform(0.5, 1.5)
+                config.logger.warning(
+                    f"{url} returned {response.status_code}. Retrying in {delay:.1f} seconds..."
+                )
+                await asyncio.sleep(delay)
+                continue
+            if response.is_error:
+                config.logger.error(
+                    f"Failed to download URL {url}: HTTP {response.status_code}"
+                )
+                return url, None
+            return url, response.text
+
+    config.logger.error(f"Exceeded maximum retries for URL {url}")
+    return url, None
+
+
+async def fetch_job_posts(
+    urls: Iterable[str],
+    max_concurrency: int = None,
+    max_per_host: int = None,
+    client: httpx.AsyncClient = None,
+) -> AsyncIterator[tuple[str, Optional[str]]]:
+    """Download job postings concurrently and yield `(url, html)` as each one completes.
+
+    Failed downloads are logged and yielded with `html` set to None. Each result can be
+    passed straight to `ResumeImprover(url, raw_html=html)` or `parse_raw_job_post`.
+
+    Args:
+        urls (Iterable[str]): The job posting URLs.
+        max_concurrency (int, optional): Maximum downloads in flight. Defaults to `config.FETCH_MAX_CONCURRENCY`.
+        max_per_host (int, optional): Maximum downloads in flight per host. Defaults to `config.FETCH_MAX_PER_HOST`.
+        client (httpx.AsyncClient, optional): Client to use. One is created (and closed) if not given.
+
+    Yields:
+        tuple[str, Optional[str]]: The URL and its HTML.
+    """
+    global_limit = asyncio.Semaphore(max_concurrency or config.FETCH_MAX_CONCURRENCY)
+    host_limits = defaultdict(
+        lambda: asyncio.Semaphore(max_per_host or config.FETCH_MAX_PER_HOST)
+    )
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(
+            headers=config.REQUESTS_HEADERS,
+            timeout=httpx.Timeout(
+                config.DOWNLOAD_READ_TIMEOUT, connect=config.DOWNLOAD_CONNECT_TIMEOUT
+            ),
+            follow_redirects=True,
+        )
+    tasks = [
+        asyncio.create_task(
+            _fetch_one(
+                client, url, global_limit, host_limits[urlsplit(url).netloc.lower()]
+            )
+        )
+        for url in urls
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if owns_client:
+            await client.aclose()
@@ -1,56 +1,180 @@
+import concurrent.futures
 import threading
 import time
+from typing import Optional
 from ..config import config
 import logging
 
 
+class BackgroundTask:
+    """A function submitted to the `BackgroundRunner`, with its future and timings."""
+
+    def __init__(self, name: str):
+        """Initialize the task.
+
+        Args:
+            name (str): Name of the submitted function.
+        """
+        self.name = name
+        self.future = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def status(self) -> str:
+        """One of `pending`, `running`, `completed`, `failed` or `cancelled`."""
+        if self.future.cancelled():
+            return "cancelled"
+        if not self.future.done():
+            return "running" if self.started_at is not None else "pending"
+        return "failed" if self.future.exception() is not None else "completed"
+
+    @property
+    def queued_seconds(self) -> Optional[float]:
+        """Time spent waiting for a worker, or None if the task has not started."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    @property
+    def run_seconds(self) -> Optional[float]:
+        """Time spent running so far, or None if the task has not started."""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def as_dict(self) -> dict:
+        """Summarize the task's status, timings and outcome."""
+        status = self.status
+        return dict(
+            name=self.name,
+            status=status,
+            queued_seconds=self.queued_seconds,
+            run_seconds=self.run_seconds,
+            result=self.future.result() if status == "completed" else None,
+            exception=self.future.exception() if status == "failed" else None,
+        )
+
+
 class BackgroundRunner:
-    def __init__(self):
-        self.threads = []
+    def __init__(self, max_workers: int = None):
+        """Initialize the runner with a bounded pool of worker threads.
+
+        Args:
+            max_workers (int, optional): Maximum number of tasks running at once.
+                Defaults to `config.MAX_CONCURRENT_WORKERS`.
+        """
+        self.max_workers = max_workers or config.MAX_CONCURRENT_WORKERS
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="BackgroundRunner"
+        )
+        self.tasks = []
+        self._lock = threading.Lock()
         self.logger = self._create_logger()
 
     def _create_logger(self):
         """Creates a custom logger for the BackgroundRunner."""
         logger = logging.getLogger(__name__)
-        handler = logging.FileHandler(config.BACKGROUND_TASKS_LOG)
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        if not any(
+            isinstance(h, logging.FileHandler)
+            and h.baseFilename == config.BACKGROUND_TASKS_LOG
+            for h in logger.handlers
+        ):
+            handler = logging.FileHandler(config.BACKGROUND_TASKS_LOG)
+            formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
         logger.setLevel(logging.INFO)
         return logger
 
-    def run_in_background(self, func, *args, **kwargs):
-        """Submits a function to be run in the background."""
+    def run_in_background(self, func, *args, **kwargs) -> concurrent.futures.Future:
+        """Submits a function to be run in the background.
+
+        Returns:
+            concurrent.futures.Future: The future holding the function's result or exception.
+        """
         self.logger.info(
             f"Submitting task {func.__name__} with args {args} and kwargs {kwargs}"
         )
-        thread = threading.Thread(target=func, args=args, kwargs=kwargs)
-        self.threads.append(thread)
-        thread.start()
+        task = BackgroundTask(func.__name__)
+
+        def run():
+            task.started_at = time.time()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                self.logger.exception(f"Task {task.name} failed.")
+                raise
+            finally:
+                task.finished_at = time.time()
+                self.logger.info(
+                    f"Task {task.name} finished in {task.run_seconds:.2f}s "
+                    f"after waiting {task.queued_seconds:.2f}s."
+                )
+
+        task.future = self.executor.submit(run)
+        with self._lock:
+            self.tasks.append(task)
         self.logger.info("Task submitted.")
+        return task.future
 
-    def check_status(self):
-        """Checks the status of the background tasks."""
-        if not self.threads:
+    def check_status(self) -> list[dict]:
+        """Checks the status of the background tasks.
+
+        Returns:
+            list[dict]: The status, timings and outcome of every submitted task.
+        """
+        with self._lock:
+            tasks = list(self.tasks)
+        if not tasks:
             self.logger.info("No tasks submitted.")
-            return "No tasks submitted."
-        
-        statuses = []
-        for thread in self.threads:
-            if thread.is_alive():
-                self.logger.info("Task is running.")
-                statuses.append("Task is running.")
-            else:
-                self.logger.info("Task completed.")
-                statuses.append("Task completed.")
+            return []
+
+        statuses = [task.as_dict() for task in tasks]
+        counts = {}
+        for status in statuses:
+            counts[status["status"]] = counts.get(status["status"], 0) + 1
+        self.logger.info(f"Task statuses: {counts}")
         return statuses
 
+    def wait(self, timeout: Optional[float] = None) -> list:
+        """Wait for every submitted task to finish.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+
+        Returns:
+            list: Each task's result, or its exception if it failed or was cancelled.
+        """
+        with self._lock:
+            futures = [task.future for task in self.tasks]
+        concurrent.futures.wait(futures, timeout=timeout)
+        results = []
+        for future in futures:
+            if future.cancelled():
+                results.append(concurrent.futures.CancelledError())
+            elif not future.done():
+                results.append(None)
+            else:
+                results.append(future.exception() or future.result())
+        return results
+
     def stop_all_tasks(self):
-        """Stops all running background tasks."""
+        """Cancels every queued task. Running tasks are left to complete on their own."""
         self.logger.info("Stopping all tasks.")
-        for thread in self.threads:
-            if thread.is_alive():
-                # Python does not provide a direct way to kill threads.
-                self.logger.warning("Cannot directly stop threads. They will complete on their own.")
+        with self._lock:
+            tasks = list(self.tasks)
+        cancelled = sum(task.future.cancel() for task in tasks)
+        running = sum(task.status == "running" for task in tasks)
+        self.logger.info(f"Cancelled {cancelled} queued tasks.")
+        if running:
+            # Python does not provide a direct way to kill threads.
+            self.logger.warning(
+                f"Cannot directly stop {running} running tasks. They will complete on their own."
+            )
         self.logger.info("All tasks stopped.")
 
+    def shutdown(self, wait: bool = True):
+        """Cancel queued tasks and release the worker threads."""
+        self.executor.shutdown(wait=wait, cancel_futures=True)
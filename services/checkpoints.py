@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+from ..config import config
+from ..prompts import Prompts
+from .. import utils
+
+
+def prompt_version(prompt_key: str) -> str:
+    """Hash the message templates of a prompt, so that editing a prompt invalidates its checkpoints.
+
+    Args:
+        prompt_key (str): The key of the prompt in `Prompts.lookup`.
+
+    Returns:
+        str: The hash of the prompt's messages.
+    """
+    parts = []
+    for message in Prompts.lookup[prompt_key]:
+        template = getattr(getattr(message, "prompt", None), "template", None)
+        parts.append(template if template is not None else message.content)
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def stage_fingerprint(
+    prompt_key: str, pydantic_object, llm_kwargs: dict, chain_inputs: dict
+) -> str:
+    """Fingerprint everything that determines the output of a chain call.
+
+    Args:
+        prompt_key (str): The key of the prompt in `Prompts.lookup`.
+        pydantic_object: The output schema for structured output.
+        llm_kwargs (dict): Keyword arguments of the model.
+        chain_inputs (dict): The formatted prompt inputs, i.e. the resume section and parsed job.
+
+    Returns:
+        str: The fingerprint.
+    """
+    payload = dict(
+        prompt_key=prompt_key,
+        prompt_version=prompt_version(prompt_key),
+        schema=pydantic_object.schema(),
+        model=dict(
+            model_name=config.MODEL_NAME,
+            **{k: repr(v) for k, v in sorted(llm_kwargs.items())},
+        ),
+        inputs=chain_inputs,
+    )
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class StageCheckpoints:
+    """Outputs of chain calls stored in a job directory, keyed by the fingerprint of their inputs.
+
+    A checkpoint is reused only when the prompt, output schema, model and formatted
+    inputs all match, so re-tailoring a resume re-runs just the stages (and the
+    individual experiences and projects) whose inputs changed.
+    """
+
+    def __init__(self, job_data_location: str):
+        """Initialize the checkpoints of a job.
+
+        Args:
+            job_data_location (str): The job directory. Checkpoints go in its `checkpoints` folder.
+        """
+        self.directory = os.path.join(job_data_location, "checkpoints")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, stage: str, fingerprint: str) -> str:
+        """Path of the checkpoint of a stage with the given fingerprint."""
+        return os.path.join(self.directory, stage.lower(), f"{fingerprint}.json")
+
+    def load(self, stage: str, fingerprint: str) -> Optional[Any]:
+        """Return the checkpointed output, or None if the stage has to run.
+
+        Args:
+            stage (str): The stage, i.e. the prompt key.
+            fingerprint (str): The fingerprint of the stage inputs.
+        """
+        try:
+            with open(self._path(stage, fingerprint), "r") as stream:
+                output = json.load(stream)["output"]
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return output
+
+    def save(self, stage: str, fingerprint: str, output: Any):
+        """Checkpoint the output of a stage.
+
+        Args:
+            stage (str): The stage, i.e. the prompt key.
+            fingerprint (str): The fingerprint of the stage inputs.
+            output (Any): The JSON-serializable output.
+        """
+        entry = dict(
+            stage=stage, fingerprint=fingerprint, output=output, created_at=time.time()
+        )
+        utils.atomic_write(
+            self._path(stage, fingerprint), json.dumps(entry).encode("utf-8")
+        )
+
+    def stats(self) -> dict:
+        """Return the checkpoint hits and misses of this job."""
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses)
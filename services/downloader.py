@@ -0,0 +1,287 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from fp.fp import FreeProxy
+from ..config import config
+from .. import utils
+
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header into a delay in seconds.
+
+    Args:
+        value (str, optional): The header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        Optional[float]: The delay in seconds, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Thread-safe token bucket that blocks callers until a request may be sent."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum number of tokens, i.e. the allowed burst.
+            clock (Callable, optional): Monotonic clock. Defaults to `time.monotonic`.
+            sleep (Callable, optional): Sleep function. Defaults to `time.sleep`.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the tokens accumulated since the last update."""
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = max(self._updated, now)
+
+    def acquire(self, amount: float = 1):
+        """Take tokens, sleeping until enough are available and any pause has ended.
+
+        Args:
+            amount (float, optional): Tokens to take, capped at the capacity. Defaults to 1.
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= amount:
+                        self._tokens -= amount
+                        return
+                    wait = (amount - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def debit(self, amount: float):
+        """Take tokens without waiting, e.g. to settle usage that differs from an estimate.
+
+        A negative amount gives tokens back. The bucket may go negative, which delays
+        later callers accordingly.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds`, then restart from an empty bucket."""
+        with self._lock:
+            now = self._clock()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = self._blocked_until
+
+
+class HostRateLimiter:
+    """Token-bucket rate limits kept separately for each host."""
+
+    def __init__(self, rate: float, burst: float, **bucket_kwargs):
+        """Initialize the limiter.
+
+        Args:
+            rate (float): Requests per second allowed for each host.
+            burst (float): Requests each host may receive back to back.
+            **bucket_kwargs: Passed to every `TokenBucket`.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._bucket_kwargs = bucket_kwargs
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Return the bucket for the host of `url`."""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(
+                    self.rate, self.burst, **self._bucket_kwargs
+                )
+            return self._buckets[host]
+
+    def acquire(self, url: str):
+        """Block until a request to the host of `url` may be sent."""
+        self.bucket(url).acquire()
+
+    def pause(self, url: str, seconds: float):
+        """Pause all requests to the host of `url` for `seconds`."""
+        self.bucket(url).pause(seconds)
+
+
+class JobPostDownloader:
+    """Pooled, rate-limited HTTP client for downloading job postings."""
+
+    def __init__(
+        self,
+        rate_per_host: float = None,
+        burst_per_host: float = None,
+        pool_size: int = None,
+        connect_timeout: float = None,
+        read_timeout: float = None,
+        max_retries: int = None,
+        backoff_factor: float = None,
+    ):
+        """Initialize the downloader. Unset arguments default to the `DOWNLOAD_*` settings in `config`.
+
+        Args:
+            rate_per_host (float, optional): Requests per second allowed for each host.
+            burst_per_host (float, optional): Requests each host may receive back to back.
+            pool_size (int, optional): Connections kept alive per host.
+            connect_timeout (float, optional): Seconds to wait for a connection.
+            read_timeout (float, optional): Seconds to wait for the server to respond.
+            max_retries (int, optional): Attempts per URL. Defaults to `config.MAX_RETRIES`.
+            backoff_factor (float, optional): Base backoff in seconds. Defaults to `config.BACKOFF_FACTOR`.
+        """
+        pool_size = pool_size or config.DOWNLOAD_POOL_SIZE
+        self.timeout = (
+            connect_timeout or config.DOWNLOAD_CONNECT_TIMEOUT,
+            read_timeout or config.DOWNLOAD_READ_TIMEOUT,
+        )
+        self.max_retries = max_retries or config.MAX_RETRIES
+        self.backoff_factor = (
+            backoff_factor if backoff_factor is not None else config.BACKOFF_FACTOR
+        )
+        self.rate_limiter = HostRateLimiter(
+            rate_per_host or config.DOWNLOAD_RATE_PER_HOST,
+            burst_per_host or config.DOWNLOAD_BURST_PER_HOST,
+        )
+        self.session = requests.Session()
+        self.session.headers.update(config.REQUESTS_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given attempt."""
+        return self.backoff_factor * 2**attempt * random.uniform(0.5, 1.5)
+
+    def get(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        """Download a URL, pacing requests per host and retrying timeouts, connection errors, 429s and 5xx responses.
+
+        Args:
+            url (str): The URL to download.
+            headers (dict, optional): Extra request headers.
+
+        Returns:
+            requests.Response: The successful (or 304 Not Modified) response.
+
+        Raises:
+            requests.RequestException: If the download fails or retries are exhausted.
+        """
+        proxies = None
+        last_error = None
+        for attempt in range(self.max_retries):
+            retries_left = attempt + 1 < self.max_retries
+            self.rate_limiter.acquire(url)
+            try:
+                response = self.session.get(
+                    url, headers=headers, proxies=proxies, timeout=self.timeout
+                )
+            except requests.exceptions.SSLError:
+                raise
+            except (requests.Timeout, requests.ConnectionError) as e:
+                last_error = e
+                if not retries_left:
+                    break
+                delay = self._backoff(attempt)
+                config.logger.warning(
+                    f"Request to {url} failed ({e}). Retrying in {delay:.1f} seconds..."
+                )
+                self.rate_limiter.pause(url, delay)
+                continue
+
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                if not retries_left:
+                    break
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = self._backoff(attempt)
+                config.logger.warning(
+                    f"{url} returned {response.status_code}. Retrying in {delay:.1f} seconds..."
+                )
+                self.rate_limiter.pause(url, delay)
+                if response.status_code == 429 and config.DOWNLOAD_USE_PROXY_ON_RATE_LIMIT:
+                    proxy = FreeProxy(rand=True).get()
+                    proxies = {"http": proxy, "https": proxy}
+                continue
+
+            response.raise_for_status()
+            return response
+
+        raise requests.exceptions.RetryError(
+            f"Exceeded maximum retries for URL {url}"
+        ) from last_error
+
+    def fetch_text(self, url: str, archive=None) -> str:
+        """Download a URL's text, reusing the archived copy when the server reports it unchanged.
+
+        Args:
+            url (str): The URL to download.
+            archive (HTMLArchive, optional): Archive used for conditional GETs. New responses are stored in it.
+
+        Returns:
+            str: The response body.
+
+        Raises:
+            requests.RequestException: If the download fails or retries are exhausted.
+        """
+        headers = archive.conditional_headers(url) if archive is not None else None
+        response = self.get(url, headers=headers)
+        if response.status_code == 304 and archive is not None:
+            html = archive.load(url)
+            if html is not None:
+                config.logger.info(f"{url} is unchanged. Using the archived copy.")
+                return html
+            response = self.get(url)
+        if archive is not None:
+            archive.store(
+                url,
+                response.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return response.text
+
+
+@utils.process_singleton
+def get_downloader() -> JobPostDownloader:
+    """Return the downloader whose connection pool and per-host rate limits every job post download shares."""
+    return JobPostDownloader()
@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from ..config import config
+from .. import utils
+
+TRACKING_PARAMS = {"gclid", "fbclid", "gh_src", "lever-source", "lever-origin", "ref"}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so that trivially different links to the same posting share one key.
+
+    Lowercases the scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the remaining query parameters.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The canonical URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    netloc = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in {("http", 80), ("https", 443)}:
+        netloc = f"{netloc}:{parts.port}"
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+
+class HTMLArchive:
+    """On-disk, content-addressed archive of raw job posting HTML keyed by canonical URL.
+
+    Bodies are stored gzip-compressed under `objects/` by the SHA-256 of their content,
+    so identical pages are kept once. `index/` maps each canonical URL to its body and
+    the `ETag`/`Last-Modified` validators used for conditional GETs.
+    """
+
+    def __init__(self, root: str = None):
+        """Initialize the archive.
+
+        Args:
+            root (str, optional): Directory of the archive. Defaults to `config.HTML_ARCHIVE_PATH`.
+        """
+        self.root = root or config.HTML_ARCHIVE_PATH
+
+    def _index_path(self, canonical_url: str) -> str:
+        """Path of the index entry for a canonical URL."""
+        key = hashlib.sha256(canonical_url.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, "index", key[:2], f"{key}.json")
+
+    def _object_path(self, content_hash: str) -> str:
+        """Path of the compressed body with the given content hash."""
+        return os.path.join(
+            self.root, "objects", content_hash[:2], f"{content_hash}.html.gz"
+        )
+
+    def lookup(self, url: str) -> Optional[dict]:
+        """Return the archived metadata for a URL, or None if it has not been archived."""
+        try:
+            with open(self._index_path(canonicalize_url(url)), "r") as stream:
+                return json.load(stream)
+        except (OSError, ValueError):
+            return None
+
+    def load(self, url: str) -> Optional[str]:
+        """Return the archived HTML for a URL, or None if it is missing."""
+        entry = self.lookup(url)
+        if entry is None:
+            return None
+        try:
+            with gzip.open(self._object_path(entry["content_hash"]), "rb") as stream:
+                return stream.read().decode("utf-8")
+        except OSError:
+            return None
+
+    def conditional_headers(self, url: str) -> dict:
+        """Return the `If-None-Match`/`If-Modified-Since` headers for a conditional GET."""
+        entry = self.lookup(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(
+        self, url: str, html: str, etag: str = None, last_modified: str = None
+    ) -> dict:
+        """Archive the HTML of a URL together with its cache validators.
+
+        Args:
+            url (str): The URL the HTML was downloaded from.
+            html (str): The response body.
+            etag (str, optional): The response's `ETag` header.
+            last_modified (str, optional): The response's `Last-Modified` header.
+
+        Returns:
+            dict: The index entry that was written.
+        """
+        body = html.encode("utf-8")
+        content_hash = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(content_hash)
+        if not os.path.exists(object_path):
+            utils.atomic_write(object_path, gzip.compress(body, mtime=0))
+        canonical_url = canonicalize_url(url)
+        entry = dict(
+            url=canonical_url,
+            content_hash=content_hash,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+        )
+        utils.atomic_write(
+            self._index_path(canonical_url), json.dumps(entry).encode("utf-8")
+        )
+        return entry
+
+    def iter_postings(self) -> Iterator[tuple[str, str]]:
+        """Yield `(url, html)` for every archived posting, without touching the network."""
+        index_root = os.path.join(self.root, "index")
+        for dirpath, _, filenames in os.walk(index_root):
+            for filename in sorted(filenames):
+                if not filename.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(dirpath, filename), "r") as stream:
+                        url = json.load(stream)["url"]
+                except (OSError, ValueError, KeyError):
+                    continue
+                html = self.load(url)
+                if html is not None:
+                    yield url, html
+
+
+@utils.process_singleton
+def get_html_archive() -> HTMLArchive:
+    """Return the archive at `config.HTML_ARCHIVE_PATH` that job post downloads are checked against."""
+    return HTMLArchive()
@@ -0,0 +1,151 @@
+import importlib.util
+import re
+from bs4 import BeautifulSoup
+from ..config import config
+
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+NON_CONTENT_TAGS = [
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "link",
+    "meta",
+]
+CHROME_TAGS = ["nav", "aside", "form", "button"]
+PAGE_CHROME_TAGS = CHROME_TAGS + ["header", "footer"]
+BOILERPLATE_PATTERN = re.compile(
+    r"cookie|consent|gdpr|onetrust|newsletter|modal|popup", re.IGNORECASE
+)
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "dialog", "alertdialog"}
+MAIN_REGION_SELECTORS = [
+    "main",
+    "[role=main]",
+    "article",
+    "#job-description",
+    ".job-description",
+    "#content",
+    ".posting-page",
+    "#app_body",
+]
+CHARS_PER_TOKEN = 4
+
+
+class ExtractionResult:
+    """Text extracted from a job posting page, with the size saved compared to the whole page."""
+
+    def __init__(self, text: str, full_page_chars: int):
+        """Initialize the result.
+
+        Args:
+            text (str): The extracted text.
+            full_page_chars (int): Length of the text of the whole page before stripping boilerplate.
+        """
+        self.text = text
+        self.full_page_chars = full_page_chars
+
+    @property
+    def chars_saved(self) -> int:
+        """Characters removed compared to the text of the whole page."""
+        return max(0, self.full_page_chars - len(self.text))
+
+    @property
+    def tokens_saved(self) -> int:
+        """Rough estimate of the prompt tokens saved."""
+        return self.chars_saved // CHARS_PER_TOKEN
+
+
+class HTMLTextExtractor:
+    """Extract the job description text from a posting page, dropping page boilerplate."""
+
+    def __init__(
+        self,
+        parser: str = None,
+        main_region_selectors: list[str] = None,
+        min_main_region_chars: int = 200,
+    ):
+        """Initialize the extractor.
+
+        Args:
+            parser (str, optional): BeautifulSoup parser. Defaults to lxml when it is installed, else html.parser.
+            main_region_selectors (list[str], optional): CSS selectors tried, in order, to find the job description.
+            min_main_region_chars (int, optional): Minimum text length for a region to count as the job description.
+        """
+        self.parser = parser or HTML_PARSER
+        self.main_region_selectors = main_region_selectors or MAIN_REGION_SELECTORS
+        self.min_main_region_chars = min_main_region_chars
+
+    def _is_boilerplate(self, tag) -> bool:
+        """Check whether an element is a cookie banner, dialog or navigation landmark."""
+        if tag.name in ("html", "body", "main", "article"):
+            return False
+        if tag.get("role") in BOILERPLATE_ROLES:
+            return True
+        attributes = " ".join([tag.get("id") or ""] + (tag.get("class") or []))
+        return bool(BOILERPLATE_PATTERN.search(attributes))
+
+    def _find_main_region(self, soup):
+        """Return the element holding the job description, or None if none stands out."""
+        for selector in self.main_region_selectors:
+            region = soup.select_one(selector)
+            if (
+                region is not None
+                and len(region.get_text(strip=True)) >= self.min_main_region_chars
+            ):
+                return region
+        return None
+
+    def extract(self, html: str) -> ExtractionResult:
+        """Extract the job description text from HTML.
+
+        Args:
+            html (str): The raw HTML of the posting.
+
+        Returns:
+            ExtractionResult: The extracted text and the size saved.
+        """
+        soup = BeautifulSoup(html, self.parser)
+        full_page_chars = len(soup.get_text(separator=" ", strip=True))
+        title = soup.title.get_text(strip=True) if soup.title else ""
+
+        for tag in soup(NON_CONTENT_TAGS):
+            tag.decompose()
+        for tag in soup.find_all(self._is_boilerplate):
+            tag.decompose()
+
+        region = self._find_main_region(soup)
+        chrome_tags = CHROME_TAGS
+        if region is None:
+            region = soup.body or soup
+            chrome_tags = PAGE_CHROME_TAGS
+        for tag in region(chrome_tags):
+            tag.decompose()
+
+        text = region.get_text(separator=" ", strip=True)
+        if title and title not in text:
+            text = f"{title} {text}"
+        return ExtractionResult(text, full_page_chars)
+
+
+_default_extractor = HTMLTextExtractor()
+
+
+def extract_job_text(html: str, extractor: HTMLTextExtractor = None) -> ExtractionResult:
+    """Extract the job description text from HTML and log how much was saved.
+
+    Args:
+        html (str): The raw HTML of the posting.
+        extractor (HTMLTextExtractor, optional): Extractor to use. Defaults to a shared `HTMLTextExtractor`.
+
+    Returns:
+        ExtractionResult: The extracted text and the size saved.
+    """
+    result = (extractor or _default_extractor).extract(html)
+    config.logger.info(
+        f"Extracted {len(result.text)} characters of job post text, "
+        f"saving {result.chars_saved} characters (~{result.tokens_saved} tokens)."
+    )
+    return result
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import httpx
+from ..config import config
+from .rate_governor import AsyncGovernedTransport, GovernedTransport, get_rate_governor
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class ConnectionStats:
+    """Thread-safe counters describing how often pooled connections are reused."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+
+    def _trace(self, event_name: str, info: dict):
+        """Count connection setup events reported by httpcore."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.new_connections += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def on_request(self, request: httpx.Request):
+        """httpx request hook that counts the request and traces its connection."""
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def on_async_request(self, request: httpx.Request):
+        """Async variant of `on_request` for the async client."""
+        self.on_request(request)
+
+    def as_dict(self) -> dict:
+        """Return the counters, including how many requests reused a connection."""
+        with self._lock:
+            return dict(
+                requests=self.requests,
+                new_connections=self.new_connections,
+                reused_connections=max(0, self.requests - self.new_connections),
+                tls_handshakes=self.tls_handshakes,
+            )
+
+
+connection_stats = ConnectionStats()
+_http_client = None
+_async_http_client = None
+_http_client_lock = threading.Lock()
+# Pending closes of async clients; the event loop only keeps weak references to tasks
+_closing_tasks = set()
+
+
+def _client_options() -> tuple:
+    """Return the transport and client options shared by the sync and async clients."""
+    http2 = config.LLM_HTTP2
+    if http2 and not HTTP2_AVAILABLE:
+        config.logger.warning(
+            "HTTP/2 was requested but the `h2` package is not installed. Falling back to HTTP/1.1."
+        )
+        http2 = False
+    transport_options = dict(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.LLM_HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+    client_options = dict(
+        timeout=httpx.Timeout(
+            config.LLM_HTTP_TIMEOUT, connect=config.LLM_HTTP_CONNECT_TIMEOUT
+        ),
+        follow_redirects=True,
+    )
+    return transport_options, client_options
+
+
+def get_http_client() -> httpx.Client:
+    """Return the pooled HTTP client that every model from `create_llm` sends its requests through.
+
+    It is created on first use and again after `close_http_client`.
+
+    Requests go through the process-wide `RateGovernor` unless
+    `config.USE_LLM_RATE_GOVERNOR` is False.
+
+    Returns:
+        httpx.Client: A thread-safe client with keep-alive connection pooling.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            transport_options, client_options = _client_options()
+            transport = httpx.HTTPTransport(**transport_options)
+            if config.USE_LLM_RATE_GOVERNOR:
+                transport = GovernedTransport(transport, get_rate_governor())
+            _http_client = httpx.Client(
+                transport=transport,
+                event_hooks={"request": [connection_stats.on_request]},
+                **client_options,
+            )
+        return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the pooled async HTTP client used for the async calls of models from `create_llm`.
+
+    Like `get_http_client`, it is created on first use and again after `close_http_client`. It has the same limits as `get_http_client` and goes through the same `RateGovernor`.
+    Its pooled connections belong to the event loop that opened them, so use it from
+    one long-running event loop.
+
+    Returns:
+        httpx.AsyncClient: An async client with keep-alive connection pooling.
+    """
+    global _async_http_client
+    with _http_client_lock:
+        if _async_http_client is None:
+            transport_options, client_options = _client_options()
+            transport = httpx.AsyncHTTPTransport(**transport_options)
+            if config.USE_LLM_RATE_GOVERNOR:
+                transport = AsyncGovernedTransport(transport, get_rate_governor())
+            _async_http_client = httpx.AsyncClient(
+                transport=transport,
+                event_hooks={"request": [connection_stats.on_async_request]},
+                **client_options,
+            )
+        return _async_http_client
+
+
+def get_http_client_stats() -> dict:
+    """Return connection reuse metrics for the shared HTTP clients."""
+    return connection_stats.as_dict()
+
+
+def _close_async_client(client: httpx.AsyncClient):
+    """Close an async client from sync code, inside or outside a running event loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    try:
+        if loop is None:
+            asyncio.run(client.aclose())
+        else:
+            task = loop.create_task(client.aclose())
+            _closing_tasks.add(task)
+            task.add_done_callback(_closing_tasks.discard)
+    except Exception as e:
+        config.logger.warning(f"Could not close the async HTTP client cleanly: {e}")
+
+
+def close_http_client():
+    """Close the shared HTTP clients. The next call to `get_http_client` creates a new one.
+
+    Chains compiled by `get_compiled_chain` hold models bound to the closed clients, so
+    they are dropped too and rebuilt on next use.
+    """
+    global _http_client, _async_http_client
+    # Imported here because langchain_helpers imports this module
+    from .langchain_helpers import clear_compiled_chains
+
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+        if _async_http_client is not None:
+            _close_async_client(_async_http_client)
+            _async_http_client = None
+    clear_compiled_chains()
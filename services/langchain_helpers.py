@@ -1,25 +1,72 @@
+import functools
+import re
+import threading
 from datetime import datetime
 from typing import List
 from dateutil import parser as dateparser
 from dateutil.relativedelta import relativedelta
 from langchain_openai import ChatOpenAI
-import langchain
-from langchain_community.cache import InMemoryCache
+from langchain.globals import set_llm_cache
+from langchain.prompts import ChatPromptTemplate
 from .. import config
 from .. import utils
+from ..prompts import Prompts
+from .llm_cache import TieredLLMCache
+from .http_client import get_async_http_client, get_http_client
 
-# Set up LLM cache
-langchain.llm_cache = InMemoryCache()
+# Set up LLM cache shared by every model created with `create_llm`
+set_llm_cache(TieredLLMCache())
 
 
 def create_llm(**kwargs):
     """Create an LLM instance with specified parameters."""
     chat_model = kwargs.pop("chat_model", ChatOpenAI)
     kwargs.setdefault("model_name", config.MODEL_NAME)
-    kwargs.setdefault("cache", False)
+    kwargs.setdefault("cache", True)
+    if "http_client" in getattr(chat_model, "__fields__", {}):
+        kwargs.setdefault("http_client", get_http_client())
+    if "http_async_client" in getattr(chat_model, "__fields__", {}):
+        kwargs.setdefault("http_async_client", get_async_http_client())
     return chat_model(**kwargs)
 
 
+_compiled_chains = {}
+_compiled_chains_lock = threading.Lock()
+
+
+def get_compiled_chain(prompt_key: str, pydantic_object, **llm_kwargs) -> tuple:
+    """Return the runnable for a prompt and output schema, building it once per process.
+
+    Args:
+        prompt_key (str): The key of the prompt in `Prompts.lookup`.
+        pydantic_object: The output schema for structured output.
+        **llm_kwargs: Keyword arguments passed to `create_llm`.
+
+    Returns:
+        tuple: The runnable and the list of prompt inputs it requires.
+    """
+    key = (
+        prompt_key,
+        pydantic_object,
+        tuple(sorted((k, repr(v)) for k, v in llm_kwargs.items())),
+    )
+    with _compiled_chains_lock:
+        compiled = _compiled_chains.get(key)
+        if compiled is None:
+            prompt = ChatPromptTemplate(messages=Prompts.lookup[prompt_key])
+            llm = create_llm(**llm_kwargs)
+            runnable = prompt | llm.with_structured_output(schema=pydantic_object)
+            compiled = (runnable, list(prompt.input_variables))
+            _compiled_chains[key] = compiled
+    return compiled
+
+
+def clear_compiled_chains():
+    """Drop every chain built by `get_compiled_chain`, e.g. after the shared HTTP clients are closed."""
+    with _compiled_chains_lock:
+        _compiled_chains.clear()
+
+
 def format_list_as_string(lst: list, list_sep: str = "\n- ") -> str:
     """Format a list as a string with a specified separator."""
     if isinstance(lst, list):
@@ -35,15 +82,90 @@ def format_prompt_inputs_as_strings(prompt_inputs: list[str], **kwargs):
     }
 
 
+PRESENT_DATES = {"present", "current", "now", "today"}
+MONTHS = {
+    name: index
+    for index, names in enumerate(
+        [
+            ("jan", "january"),
+            ("feb", "february"),
+            ("mar", "march"),
+            ("apr", "april"),
+            ("may",),
+            ("jun", "june"),
+            ("jul", "july"),
+            ("aug", "august"),
+            ("sep", "sept", "september"),
+            ("oct", "october"),
+            ("nov", "november"),
+            ("dec", "december"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+YEAR_PATTERN = re.compile(r"(\d{4})")
+MONTH_YEAR_PATTERN = re.compile(r"([a-z]+)\.?,?\s+(\d{4})")
+ISO_DATE_PATTERN = re.compile(r"(\d{4})-(\d{1,2})(?:-(\d{1,2}))?")
+NUMERIC_MONTH_YEAR_PATTERN = re.compile(r"(\d{1,2})/(\d{4})")
+
+
+def _parse_date_fast(text: str):
+    """Parse the common resume date formats without dateutil.
+
+    Handles bare years (`2024`), month names (`Jan 2024`, `January, 2024`), ISO dates
+    (`2024-01`, `2024-01-15`) and numeric months (`01/2024`). Missing months and days
+    default to 1, like `dateutil` with a January 1st default.
+
+    Returns:
+        datetime: The parsed date, or None if the text is in another format.
+    """
+    try:
+        if match := YEAR_PATTERN.fullmatch(text):
+            return datetime(int(match[1]), 1, 1)
+        if (match := MONTH_YEAR_PATTERN.fullmatch(text)) and match[1] in MONTHS:
+            return datetime(int(match[2]), MONTHS[match[1]], 1)
+        if match := ISO_DATE_PATTERN.fullmatch(text):
+            return datetime(int(match[1]), int(match[2]), int(match[3] or 1))
+        if match := NUMERIC_MONTH_YEAR_PATTERN.fullmatch(text):
+            return datetime(int(match[2]), int(match[1]), 1)
+    except ValueError:
+        return None
+    return None
+
+
+_parse_date_fast_cached = functools.lru_cache(maxsize=4096)(_parse_date_fast)
+
+
+def _parse_normalized_date(text: str) -> datetime:
+    """Parse a normalized date string, trying the memoized fast paths before dateutil.
+
+    Only fast-path results are memoized. dateutil fills a missing year with the
+    current one, so its results would go stale in a long-running process.
+    """
+    parsed = _parse_date_fast_cached(text)
+    if parsed is None:
+        parsed = dateparser.parse(text, default=datetime(datetime.today().year, 1, 1))
+    return parsed
+
+
 def parse_date(date_str: str) -> datetime:
-    """Given an arbitrary string, parse it to a date."""
-    default_date = datetime(datetime.today().year, 1, 1)
+    """Given an arbitrary string, parse it to a date.
+
+    `Present`, `current`, `now` and `today` resolve to today's date. Dates in the common
+    formats handled by `_parse_date_fast` are memoized.
+
+    Raises:
+        ValueError: If the date could not be parsed.
+    """
+    text = " ".join(str(date_str).lower().split())
+    if text in PRESENT_DATES:
+        return datetime.combine(datetime.today().date(), datetime.min.time())
     try:
-        return dateparser.parse(str(date_str), default=default_date)
-    except dateparser._parser.ParserError as e:
-        langchain.llm_cache.clear()
+        return _parse_normalized_date(text)
+    except (ValueError, OverflowError) as e:
         config.logger.error(f"Date input `{date_str}` could not be parsed.")
-        raise e
+        raise ValueError(f"Date input `{date_str}` could not be parsed.") from e
 
 
 def datediff_years(start_date: str, end_date: str) -> float:
@@ -51,13 +173,11 @@ def datediff_years(start_date: str, end_date: str) -> float:
 
     Args:
         start_date (str): The start date in string format.
-        end_date (str): The end date in string format. Can be "Present" to use the current date.
+        end_date (str): The end date in string format. Can be "Present" or "current" to use the current date.
 
     Returns:
         float: The difference in years, including fractional years.
     """
-    if isinstance(end_date, str) and end_date.lower() == "present":
-        end_date = datetime.today().strftime("%Y-%m-%d")
     datediff = relativedelta(parse_date(end_date), parse_date(start_date))
     return datediff.years + datediff.months / 12.0
 
@@ -66,21 +186,21 @@ def chain_formatter(format_type: str, input_data) -> str:
     """Format resume/job inputs for inclusion in a runnable sequence.
 
     Args:
-        format_type (str): The type of data to format (e.g., 'experience', 'projects', 'skills', 'education').
+        format_type (str): The type of data to format (e.g., 'experiences', 'projects', 'skills', 'education').
         input_data: The data to be formatted.
 
     Returns:
         str: The formatted data as a string.
     """
-    if format_type == 'experience':
+    if format_type in ('experience', 'experiences'):
         as_list = format_experiences_for_prompt(input_data)
-        return format_prompt_inputs_as_strings(as_list)
+        return format_list_as_string(as_list)
     elif format_type == 'projects':
         as_list = format_projects_for_prompt(input_data)
-        return format_prompt_inputs_as_strings(as_list)
+        return format_list_as_string(as_list)
     elif format_type == 'skills':
         as_list = format_skills_for_prompt(input_data)
-        return format_prompt_inputs_as_strings(as_list)
+        return format_list_as_string(as_list)
     elif format_type == 'education':
         return format_education_for_resume(input_data)
     else:
@@ -136,11 +256,7 @@ def get_cumulative_time_from_titles(titles) -> int:
     result = 0.0
     for t in titles:
         if "startdate" in t and "enddate" in t:
-            if t["enddate"] == "current":
-                last_date = datetime.today().strftime("%Y-%m-%d")
-            else:
-                last_date = t["enddate"]
-        result += datediff_years(start_date=t["startdate"], end_date=last_date)
+            result += datediff_years(start_date=t["startdate"], end_date=t["enddate"])
     return round(result)
 
 def format_experiences_for_prompt(input_data) -> list:
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from typing import Any, Optional
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+from ..config import config
+
+
+class TieredLLMCache(BaseCache):
+    """LLM response cache with a bounded in-memory LRU tier in front of a SQLite store.
+
+    Entries are keyed by a hash of the serialized prompt messages and the LLM string,
+    which LangChain builds from the model name, temperature and bound tools (i.e. the
+    structured output schema). SQLite handles locking, so several processes can share
+    the same cache file.
+    """
+
+    def __init__(
+        self,
+        database_path: str = None,
+        max_memory_entries: int = None,
+        max_disk_entries: int = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """Initialize the cache. The database file is created on first use.
+
+        Args:
+            database_path (str, optional): Path to the SQLite file. Defaults to `config.LLM_CACHE_PATH`.
+            max_memory_entries (int, optional): Size of the in-memory LRU. Defaults to `config.LLM_CACHE_MAX_MEMORY_ENTRIES`.
+            max_disk_entries (int, optional): Maximum rows kept on disk. Defaults to `config.LLM_CACHE_MAX_DISK_ENTRIES`.
+            ttl_seconds (float, optional): Age after which entries expire. Defaults to `config.LLM_CACHE_TTL_SECONDS`.
+        """
+        self.database_path = database_path or config.LLM_CACHE_PATH
+        self.max_memory_entries = (
+            max_memory_entries
+            if max_memory_entries is not None
+            else config.LLM_CACHE_MAX_MEMORY_ENTRIES
+        )
+        self.max_disk_entries = (
+            max_disk_entries
+            if max_disk_entries is not None
+            else config.LLM_CACHE_MAX_DISK_ENTRIES
+        )
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else config.LLM_CACHE_TTL_SECONDS
+        )
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """Hash a prompt and LLM string into a cache key."""
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database, creating its table if needed."""
+        if not self._schema_ready:
+            os.makedirs(os.path.dirname(self.database_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.database_path, timeout=30)
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_accessed_at ON llm_cache (accessed_at)"
+            )
+            conn.commit()
+            self._schema_ready = True
+        return conn
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        """Check whether an entry created at `created_at` has outlived the TTL."""
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, value: RETURN_VAL_TYPE):
+        """Insert an entry into the in-memory tier, evicting the least recently used."""
+        with self._lock:
+            self._memory[key] = (created_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+                self.evictions += 1
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Look up a cached response, checking memory before disk."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0], now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and not self._expired(row[1], now):
+                conn.execute(
+                    "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            else:
+                row = None
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        value = [loads(item) for item in json.loads(row[0])]
+        self._remember(key, row[1], value)
+        with self._lock:
+            self.disk_hits += 1
+        return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store a response in both tiers and evict stale or excess disk entries."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        value = json.dumps([dumps(generation) for generation in return_val])
+        self._remember(key, now, return_val)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            evicted = 0
+            if self.ttl_seconds:
+                evicted += conn.execute(
+                    "DELETE FROM llm_cache WHERE created_at < ?",
+                    (now - self.ttl_seconds,),
+                ).rowcount
+            if self.max_disk_entries:
+                evicted += conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache "
+                    "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                ).rowcount
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> dict:
+        """Return hit, miss and eviction counters for this process."""
+        with self._lock:
+            return dict(
+                memory_hits=self.memory_hits,
+                disk_hits=self.disk_hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                memory_entries=len(self._memory),
+            )
@@ -0,0 +1,325 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+import httpx
+from ..config import config
+from .. import utils
+from .downloader import TokenBucket, parse_retry_after
+
+CHARS_PER_TOKEN = 4
+THROTTLE_STATUS_CODES = {429}
+OVERLOAD_STATUS_CODES = {500, 502, 503, 504, 529}
+
+
+class RatePermit:
+    """Permission to send one LLM request, returned by `RateGovernor.acquire`."""
+
+    def __init__(self, estimated_tokens: int, queued_seconds: float):
+        self.estimated_tokens = estimated_tokens
+        self.queued_seconds = queued_seconds
+
+
+class RateGovernor:
+    """Process-wide governor for LLM traffic.
+
+    Requests wait for a concurrency slot, then for the requests-per-minute and
+    tokens-per-minute budgets. The concurrency limit adapts AIMD-style: it grows by
+    about one slot per limit's worth of successful requests and is halved on a 429 or
+    an overloaded 5xx, so throughput settles just below the provider's limit.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = None,
+        tokens_per_minute: float = None,
+        max_concurrency: int = None,
+        min_concurrency: int = 1,
+        decrease_cooldown: float = 1.0,
+        acquire_timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize the governor.
+
+        Args:
+            requests_per_minute (float, optional): Request budget. Defaults to `config.LLM_REQUESTS_PER_MINUTE`.
+            tokens_per_minute (float, optional): Token budget. Defaults to `config.LLM_TOKENS_PER_MINUTE`.
+            max_concurrency (int, optional): Upper bound of the adaptive limit. Defaults to `config.LLM_MAX_CONCURRENCY`.
+            min_concurrency (int, optional): Lower bound of the adaptive limit. Defaults to 1.
+            decrease_cooldown (float, optional): Seconds during which further throttling responses
+                do not shrink the limit again, so one burst of 429s halves it only once.
+            acquire_timeout (float, optional): Seconds `acquire` waits for a concurrency slot
+                before raising `TimeoutError`. Defaults to `config.LLM_RATE_GOVERNOR_TIMEOUT`.
+            clock (Callable, optional): Monotonic clock. Defaults to `time.monotonic`.
+            sleep (Callable, optional): Sleep function. Defaults to `time.sleep`.
+        """
+        self.requests_per_minute = requests_per_minute or config.LLM_REQUESTS_PER_MINUTE
+        self.tokens_per_minute = tokens_per_minute or config.LLM_TOKENS_PER_MINUTE
+        self.max_concurrency = max_concurrency or config.LLM_MAX_CONCURRENCY
+        self.min_concurrency = min_concurrency
+        self.decrease_cooldown = decrease_cooldown
+        self.acquire_timeout = (
+            acquire_timeout
+            if acquire_timeout is not None
+            else config.LLM_RATE_GOVERNOR_TIMEOUT
+        )
+        self._clock = clock
+        self.request_bucket = TokenBucket(
+            self.requests_per_minute / 60.0,
+            self.requests_per_minute,
+            clock=clock,
+            sleep=sleep,
+        )
+        self.token_bucket = TokenBucket(
+            self.tokens_per_minute / 60.0,
+            self.tokens_per_minute,
+            clock=clock,
+            sleep=sleep,
+        )
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._last_decrease = None
+        self._condition = threading.Condition()
+        self.requests = 0
+        self.throttled = 0
+        self.overloaded = 0
+        self.limit_decreases = 0
+        self.total_queued_seconds = 0.0
+        self.max_queued_seconds = 0.0
+
+    def acquire(self, estimated_tokens: int = 0) -> RatePermit:
+        """Block until a request may be sent.
+
+        Args:
+            estimated_tokens (int, optional): Estimated prompt and completion tokens of the request.
+
+        Returns:
+            RatePermit: The permit to pass to `release` once the response arrives.
+
+        Raises:
+            TimeoutError: If no concurrency slot frees up within `acquire_timeout` seconds.
+        """
+        start = self._clock()
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self.in_flight < int(self.limit), timeout=self.acquire_timeout
+            ):
+                raise TimeoutError(
+                    f"No LLM concurrency slot freed up within {self.acquire_timeout} seconds."
+                )
+            self.in_flight += 1
+        try:
+            self.request_bucket.acquire()
+            if estimated_tokens:
+                self.token_bucket.acquire(estimated_tokens)
+        except BaseException:
+            self._release_slot()
+            raise
+        queued_seconds = self._clock() - start
+        with self._condition:
+            self.requests += 1
+            self.total_queued_seconds += queued_seconds
+            self.max_queued_seconds = max(self.max_queued_seconds, queued_seconds)
+        return RatePermit(estimated_tokens, queued_seconds)
+
+    def _release_slot(self):
+        """Free a concurrency slot and wake up a waiting request."""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def release(
+        self,
+        permit: RatePermit,
+        status_code: int = None,
+        used_tokens: int = None,
+        retry_after: Optional[float] = None,
+    ):
+        """Record the outcome of a request and adapt the concurrency limit.
+
+        Args:
+            permit (RatePermit): The permit returned by `acquire`.
+            status_code (int, optional): HTTP status of the response, or None if the request failed.
+            used_tokens (int, optional): Tokens reported by the provider, to settle the estimate.
+            retry_after (float, optional): Delay requested by the provider, in seconds.
+        """
+        if used_tokens is not None:
+            self.token_bucket.debit(used_tokens - permit.estimated_tokens)
+        with self._condition:
+            if status_code in THROTTLE_STATUS_CODES or status_code in OVERLOAD_STATUS_CODES:
+                if status_code in THROTTLE_STATUS_CODES:
+                    self.throttled += 1
+                else:
+                    self.overloaded += 1
+                now = self._clock()
+                if (
+                    self._last_decrease is None
+                    or now - self._last_decrease >= self.decrease_cooldown
+                ):
+                    self.limit = max(float(self.min_concurrency), self.limit / 2)
+                    self._last_decrease = now
+                    self.limit_decreases += 1
+                    config.logger.warning(
+                        f"LLM provider returned {status_code}; "
+                        f"concurrency limit lowered to {int(self.limit)}."
+                    )
+            elif status_code is not None and status_code < 400:
+                self.limit = min(
+                    float(self.max_concurrency), self.limit + 1 / max(1.0, self.limit)
+                )
+        if retry_after:
+            self.request_bucket.pause(retry_after)
+        self._release_slot()
+
+    def stats(self) -> dict:
+        """Return the current limit, throttle events and queueing delay."""
+        with self._condition:
+            return dict(
+                concurrency_limit=int(self.limit),
+                in_flight=self.in_flight,
+                requests=self.requests,
+                throttled=self.throttled,
+                overloaded=self.overloaded,
+                limit_decreases=self.limit_decreases,
+                total_queued_seconds=self.total_queued_seconds,
+                mean_queued_seconds=self.total_queued_seconds / self.requests
+                if self.requests
+                else 0.0,
+                max_queued_seconds=self.max_queued_seconds,
+            )
+
+
+def estimate_request_tokens(request: httpx.Request) -> int:
+    """Estimate the prompt and completion tokens of an OpenAI-style JSON request."""
+    try:
+        body = json.loads(request.content or b"{}")
+    except (ValueError, UnicodeDecodeError, httpx.RequestNotRead):
+        return 0
+    if not isinstance(body, dict) or not (body.get("messages") or body.get("input")):
+        return 0
+    prompt_chars = len(json.dumps(body.get("messages") or body.get("input")))
+    prompt_chars += len(json.dumps(body.get("tools", [])))
+    completion_tokens = (
+        body.get("max_tokens")
+        or body.get("max_completion_tokens")
+        or config.LLM_ESTIMATED_COMPLETION_TOKENS
+    )
+    return prompt_chars // CHARS_PER_TOKEN + completion_tokens
+
+
+def _used_tokens(response: httpx.Response) -> Optional[int]:
+    """Read the token usage reported in a JSON response body."""
+    try:
+        usage = response.json().get("usage") or {}
+    except (ValueError, AttributeError):
+        return None
+    return usage.get("total_tokens")
+
+
+class GovernedTransport(httpx.BaseTransport):
+    """httpx transport that sends every request through a `RateGovernor`."""
+
+    def __init__(self, transport: httpx.BaseTransport, governor: RateGovernor):
+        """Initialize the transport.
+
+        Args:
+            transport (httpx.BaseTransport): The transport that actually sends requests.
+            governor (RateGovernor): The governor to go through.
+        """
+        self.transport = transport
+        self.governor = governor
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Wait for the governor, send the request and report the outcome."""
+        permit = self.governor.acquire(estimate_request_tokens(request))
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException:
+            self.governor.release(permit)
+            raise
+        used_tokens = None
+        if response.status_code < 400 and "json" in response.headers.get(
+            "content-type", ""
+        ):
+            response.read()
+            used_tokens = _used_tokens(response)
+        self.governor.release(
+            permit,
+            status_code=response.status_code,
+            used_tokens=used_tokens,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+        )
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+# Threads in which async requests wait for the governor, off the event loop
+_acquire_executor = ThreadPoolExecutor(thread_name_prefix="rate-governor")
+
+
+class AsyncGovernedTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of `GovernedTransport`, sharing the same `RateGovernor`."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, governor: RateGovernor):
+        """Initialize the transport.
+
+        Args:
+            transport (httpx.AsyncBaseTransport): The transport that actually sends requests.
+            governor (RateGovernor): The governor to go through.
+        """
+        self.transport = transport
+        self.governor = governor
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Wait for the governor without blocking the event loop, send the request and report the outcome."""
+        future = _acquire_executor.submit(
+            self.governor.acquire, estimate_request_tokens(request)
+        )
+        try:
+            permit = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # The worker thread may still get a permit after the request was cancelled
+            future.add_done_callback(self._release_abandoned)
+            raise
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            self.governor.release(permit)
+            raise
+        used_tokens = None
+        if response.status_code < 400 and "json" in response.headers.get(
+            "content-type", ""
+        ):
+            await response.aread()
+            used_tokens = _used_tokens(response)
+        self.governor.release(
+            permit,
+            status_code=response.status_code,
+            used_tokens=used_tokens,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+        )
+        return response
+
+    def _release_abandoned(self, future):
+        """Release the permit acquired for a request that was cancelled while it waited."""
+        if not future.cancelled() and future.exception() is None:
+            self.governor.release(future.result())
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+@utils.process_singleton
+def get_rate_governor() -> RateGovernor:
+    """Return the governor that the sync and async LLM clients share, so one budget covers both."""
+    return RateGovernor()
+
+
+def get_rate_governor_stats() -> dict:
+    """Return queueing delay, throttle events and the concurrency limit of the LLM governor."""
+    return get_rate_governor().stats()
@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+from datetime import date
+from typing import Optional
+from ..config import config
+from .. import utils
+from .langchain_helpers import chain_formatter
+
+# Resume fields that prompts consume
+RESUME_PROMPT_KEYS = ("experiences", "projects", "skills", "education", "objective")
+# Bump when the prompt formatters change, to invalidate digests stored on disk
+DIGEST_VERSION = 4
+
+
+def format_resume_field(key: str, value) -> str:
+    """Format a resume field exactly as it appears in a prompt.
+
+    Args:
+        key (str): The resume field, e.g. `experiences`.
+        value: The field's content.
+
+    Returns:
+        str: The prompt-ready text.
+    """
+    return str(chain_formatter(key, value))
+
+
+def _today() -> str:
+    """Today's date. Experience durations ending at Present are counted up to it."""
+    return date.today().isoformat()
+
+
+class ResumeDigest:
+    """Prompt-ready text of every resume field, computed once per version of a resume file and day."""
+
+    def __init__(self, version: tuple, fragments: dict, as_of: str = None):
+        """Initialize the digest.
+
+        Args:
+            version (tuple): The resume file's `(mtime_ns, size)`.
+            fragments (dict): The prompt-ready text of each field in `RESUME_PROMPT_KEYS`.
+            as_of (str, optional): The ISO date the fragments were formatted on. Defaults to today.
+        """
+        self.version = version
+        self.fragments = fragments
+        self.as_of = as_of or _today()
+
+    @classmethod
+    def from_resume(cls, resume: dict, version: tuple = None) -> "ResumeDigest":
+        """Build the digest of a parsed resume."""
+        fragments = {
+            key: format_resume_field(key, resume[key])
+            for key in RESUME_PROMPT_KEYS
+            if resume.get(key)
+        }
+        return cls(version, fragments)
+
+    def is_current(self, version: tuple) -> bool:
+        """Check whether the digest matches a resume version and was formatted today."""
+        return self.version == version and self.as_of == _today()
+
+
+def _digest_path(resume_location: str) -> str:
+    """Path of the digest stored next to a resume, e.g. `.resume.yaml.digest.json`."""
+    directory, name = os.path.split(os.path.abspath(resume_location))
+    return os.path.join(directory, f".{name}.digest.json")
+
+
+def _load_digest(resume_location: str, version: tuple) -> Optional[ResumeDigest]:
+    """Load the digest stored next to a resume, or None if it is missing, stale or from another day."""
+    try:
+        with open(_digest_path(resume_location), "r") as stream:
+            stored = json.load(stream)
+    except (OSError, ValueError):
+        return None
+    if stored.get("digest_version") != DIGEST_VERSION:
+        return None
+    digest = ResumeDigest(
+        tuple(stored.get("version", ())), stored.get("fragments", {}), stored.get("as_of")
+    )
+    return digest if digest.is_current(version) else None
+
+
+def _store_digest(resume_location: str, digest: ResumeDigest):
+    """Store a digest next to its resume. Failures only cost a recomputation later."""
+    entry = dict(
+        digest_version=DIGEST_VERSION,
+        version=list(digest.version),
+        as_of=digest.as_of,
+        fragments=digest.fragments,
+    )
+    try:
+        utils.atomic_write(_digest_path(resume_location), json.dumps(entry).encode("utf-8"))
+    except OSError as e:
+        config.logger.warning(f"Could not store the resume digest: {e}")
+
+
+_resume_digests = {}
+_resume_digests_lock = threading.Lock()
+
+
+def get_resume_digest(resume_location: str) -> ResumeDigest:
+    """Return the digest of a resume file, from memory, from disk, or by computing it.
+
+    Digests are recomputed when the file changes and on each new day, because the
+    experience durations in the prompts count up to today for current positions.
+
+    Args:
+        resume_location (str): The path to the resume YAML file.
+
+    Returns:
+        ResumeDigest: The prompt-ready text of the resume's current version.
+    """
+    path = os.path.abspath(resume_location)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _resume_digests_lock:
+        digest = _resume_digests.get(path)
+        if digest is None or not digest.is_current(version):
+            digest = _load_digest(path, version)
+            if digest is None:
+                digest = ResumeDigest.from_resume(utils.load_resume(path), version)
+                _store_digest(path, digest)
+            _resume_digests[path] = digest
+    return digest
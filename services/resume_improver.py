@@ -1,6 +1,7 @@
 import os
 import time
 import subprocess
+import threading
 from datetime import datetime
 from typing import List, Optional
 from bs4 import BeautifulSoup
@@ -20,23 +21,42 @@ from .. import config
 from .langchain_helpers import *
 from ..prompts import Prompts
 from ..models.job_post import JobPost
-from ..pdf_generation import ResumePDFGenerator
+from ..pdf_generation import ResumePDFGenerator, get_resume_pdf_generator
 import concurrent.futures
-from fp.fp import FreeProxy
 import time
 from ..config import config
 from .background_runner import BackgroundRunner
+from .stage_graph import StageGraph
+from .downloader import get_downloader
+from .html_archive import get_html_archive
+from .html_extractor import HTMLTextExtractor, extract_job_text
+from .checkpoints import StageCheckpoints, stage_fingerprint
+from .resume_digest import RESUME_PROMPT_KEYS, format_resume_field, get_resume_digest
 
 
 class ResumeImprover:
 
-    def __init__(self, url, resume_location=None, llm_kwargs: dict = None):
+    def __init__(
+        self,
+        url,
+        resume_location=None,
+        llm_kwargs: dict = None,
+        raw_html: str = None,
+        html_extractor: HTMLTextExtractor = None,
+        defer: bool = False,
+    ):
         """Initialize ResumeImprover with the job post URL and optional resume location.
 
         Args:
             url (str): The URL of the job post.
             resume_location (str, optional): The file path to the resume. Defaults to None.
             llm_kwargs (dict, optional): Additional keyword arguments for the language model. Defaults to None.
+            raw_html (str, optional): Already downloaded HTML of the job post, e.g. from
+                `fetch_job_posts`. When given, the URL is not downloaded again. Defaults to None.
+            html_extractor (HTMLTextExtractor, optional): Extractor that turns the posting HTML into
+                prompt text. Defaults to a shared `HTMLTextExtractor`.
+            defer (bool, optional): Postpone downloading and parsing the job post and loading the
+                resume until `prepare` is called or the pipeline runs. Defaults to False.
         """
         super().__init__()
         self.job_post_html_data = None
@@ -50,15 +70,43 @@ class ResumeImprover:
         self.clean_url = None
         self.job_data_location = None
         self.yaml_loc = None
+        self.stage_timings = {}
+        self.html_extractor = html_extractor
+        self.extraction_result = None
+        self.checkpoints = None
+        self.resume_digest = None
+        self._resume_sources = {}
         self.url = url
-        self.download_and_parse_job_post()
         self.resume_location = resume_location or config.DEFAULT_RESUME_PATH
-        self._update_resume_fields()
+        self._raw_html = raw_html
+        self._prepared = False
+        self._prepare_lock = threading.Lock()
+        # Shared by every draft stage, so their LLM calls together stay within the cap
+        self._llm_slots = threading.BoundedSemaphore(config.MAX_CONCURRENT_WORKERS)
+        if not defer:
+            self.prepare()
+
+    def prepare(self):
+        """Download and parse the job post and load the resume, if not done already.
+
+        Safe to call repeatedly and from several threads; the work happens exactly once.
+        """
+        with self._prepare_lock:
+            if self._prepared:
+                return
+            if self.parsed_job is None:
+                if self._raw_html is not None:
+                    self.parse_raw_job_post(self._raw_html)
+                    self._raw_html = None
+                else:
+                    self.download_and_parse_job_post()
+            if self.resume is None:
+                self._update_resume_fields()
+            self._prepared = True
 
     def _update_resume_fields(self):
         """Update the resume fields based on the current resume location."""
-        utils.check_resume_format(self.resume_location)
-        self.resume = utils.read_yaml(filename=self.resume_location)
+        self.resume = utils.load_resume(self.resume_location)
         self.degrees = self._get_degrees(self.resume)
         self.basic_info = utils.get_dict_field(field="basic", data_dict=self.resume)
         self.education = utils.get_dict_field(field="education", data_dict=self.resume)
@@ -68,6 +116,8 @@ class ResumeImprover:
         self.projects = utils.get_dict_field(field="projects", data_dict=self.resume)
         self.skills = utils.get_dict_field(field="skills", data_dict=self.resume)
         self.objective = utils.get_dict_field(field="objective", data_dict=self.resume)
+        self.resume_digest = get_resume_digest(self.resume_location)
+        self._resume_sources = {key: getattr(self, key) for key in RESUME_PROMPT_KEYS}
 
     def update_resume(self, new_resume_location):
         """Update the resume location and refresh the dependent fields.
@@ -79,14 +129,16 @@ class ResumeImprover:
         self._update_resume_fields()
 
     def _extract_html_data(self):
-        """Extract text content from HTML, removing all HTML tags.
+        """Extract the job description text from HTML, dropping tags and page boilerplate.
 
         Raises:
             Exception: If HTML data extraction fails.
         """
         try:
-            soup = BeautifulSoup(self.job_post_html_data, "html.parser")
-            self.job_post_raw = soup.get_text(separator=" ", strip=True)
+            self.extraction_result = extract_job_text(
+                self.job_post_html_data, extractor=self.html_extractor
+            )
+            self.job_post_raw = self.extraction_result.text
         except Exception as e:
             config.logger.error(f"Failed to extract HTML data: {e}")
             raise
@@ -103,37 +155,13 @@ class ResumeImprover:
         if url:
             self.url = url
 
-        max_retries = config.MAX_RETRIES
-        backoff_factor = config.BACKOFF_FACTOR
-        use_proxy = False
-
-        for attempt in range(max_retries):
-            try:
-                proxies = None
-                if use_proxy:
-                    proxy = FreeProxy(rand=True).get()
-                    proxies = {"http": proxy, "https": proxy}
-
-                response = requests.get(
-                    self.url, headers=config.REQUESTS_HEADERS, proxies=proxies
-                )
-                response.raise_for_status()
-                self.job_post_html_data = response.text
-                return True
-
-            except requests.RequestException as e:
-                if response.status_code == 429:
-                    config.logger.warning(
-                        f"Rate limit exceeded. Retrying in {backoff_factor * 2 ** attempt} seconds..."
-                    )
-                    time.sleep(backoff_factor * 2**attempt)
-                    use_proxy = True
-                else:
-                    config.logger.error(f"Failed to download URL {self.url}: {e}")
-                    return False
-
-        config.logger.error(f"Exceeded maximum retries for URL {self.url}")
-        return False
+        archive = get_html_archive() if config.USE_HTML_ARCHIVE else None
+        try:
+            self.job_post_html_data = get_downloader().fetch_text(self.url, archive=archive)
+        except requests.RequestException as e:
+            config.logger.error(f"Failed to download URL {self.url}: {e}")
+            return False
+        return True
 
     def download_and_parse_job_post(self, url=None):
         """Download and parse the job post from the provided URL.
@@ -145,7 +173,7 @@ class ResumeImprover:
             self.url = url
         self._download_url()
         self._extract_html_data()
-        self.job_post = JobPost(self.job_post_raw)
+        self.job_post = JobPost(self.job_post_raw, html=self.job_post_html_data)
         self.parsed_job = self.job_post.parse_job_post(verbose=False)
         try:
             filename = self.parsed_job["company"] + "_" + self.parsed_job["job_title"]
@@ -163,6 +191,8 @@ class ResumeImprover:
         filepath = os.path.join(config.DATA_PATH, self.clean_url)
         self.job_data_location = filepath
         os.makedirs(self.job_data_location, exist_ok=True)
+        if config.USE_STAGE_CHECKPOINTS:
+            self.checkpoints = StageCheckpoints(self.job_data_location)
         utils.write_yaml(
             self.parsed_job, filename=os.path.join(self.job_data_location, "job.yaml")
         )
@@ -175,7 +205,7 @@ class ResumeImprover:
         """
         self.job_post_html_data = raw_html
         self._extract_html_data()
-        self.job_post = JobPost(self.job_post_raw)
+        self.job_post = JobPost(self.job_post_raw, html=self.job_post_html_data)
         self.parsed_job = self.job_post.parse_job_post(verbose=False)
         try:
             filename = self.parsed_job["company"] + "_" + self.parsed_job["job_title"]
@@ -193,10 +223,55 @@ class ResumeImprover:
         filepath = os.path.join(config.DATA_PATH, self.clean_url)
         self.job_data_location = filepath
         os.makedirs(self.job_data_location, exist_ok=True)
+        if config.USE_STAGE_CHECKPOINTS:
+            self.checkpoints = StageCheckpoints(self.job_data_location)
         utils.write_yaml(
             self.parsed_job, filename=os.path.join(self.job_data_location, "job.yaml")
         )
 
+    def _run_draft_stages(self, logger=None):
+        """Run the skills, objective, experience and project stages concurrently.
+
+        The objective is written from the matched skills, so it starts once the skills
+        stage has finished. The other stages only read the source resume and the parsed
+        job. Results are assigned once every stage has finished. Per-stage timings are
+        kept in `self.stage_timings`.
+
+        Args:
+            logger (logging.Logger, optional): Logger for progress messages. Defaults to `config.logger`.
+        """
+        logger = logger or config.logger
+        graph = StageGraph(logger=logger)
+        graph.add_stage(
+            "skills", lambda: self.extract_matched_skills(verbose=False), outputs=["skills"]
+        )
+        graph.add_stage(
+            "objective",
+            lambda skills: self.write_objective(skills=skills, verbose=False),
+            inputs=["skills"],
+            outputs=["objective"],
+        )
+        graph.add_stage(
+            "experiences",
+            lambda: self.rewrite_unedited_experiences(verbose=False),
+            outputs=["experiences"],
+        )
+        graph.add_stage(
+            "projects",
+            lambda: self.rewrite_unedited_projects(verbose=False),
+            outputs=["projects"],
+        )
+        logger.info("Updating skills, objective, bullet points and projects...")
+        results = graph.run()
+        self.skills = results["skills"]
+        self.objective = results["objective"]
+        self.experiences = results["experiences"]
+        self.projects = results["projects"]
+        self.stage_timings = graph.timings
+        if self.checkpoints is not None:
+            logger.info(f"Stage checkpoints: {self.checkpoints.stats()}")
+        logger.info("Done updating...")
+
     def create_draft_tailored_resume(
         self, auto_open=True, manual_review=True, skip_pdf_create=False
     ):
@@ -206,15 +281,8 @@ class ResumeImprover:
             auto_open (bool, optional): Whether to automatically open the generated resume. Defaults to True.
             manual_review (bool, optional): Whether to wait for manual review. Defaults to True.
         """
-        config.logger.info("Extracting matched skills...")
-        self.skills = self.extract_matched_skills(verbose=False)
-        config.logger.info("Writing objective...")
-        self.objective = self.write_objective(verbose=False)
-        config.logger.info("Updating bullet points...")
-        self.experiences = self.rewrite_unedited_experiences(verbose=False)
-        config.logger.info("Updating projects...")
-        self.projects = self.rewrite_unedited_projects(verbose=False)
-        config.logger.info("Done updating...")
+        self.prepare()
+        self._run_draft_stages(logger=config.logger)
         self.yaml_loc = os.path.join(self.job_data_location, "resume.yaml")
         resume_dict = dict(
             editing=True,
@@ -229,8 +297,13 @@ class ResumeImprover:
         self.resume_yaml = utils.read_yaml(filename=self.yaml_loc)
         if auto_open:
             subprocess.run(config.OPEN_FILE_COMMAND.split(" ") + [self.yaml_loc])
-        while manual_review and utils.read_yaml(filename=self.yaml_loc)["editing"]:
-            time.sleep(5)
+        if manual_review and not utils.wait_until_review_complete(
+            self.yaml_loc, timeout=config.MANUAL_REVIEW_TIMEOUT
+        ):
+            config.logger.warning(
+                f"Review of {self.yaml_loc} timed out. Skipping the PDF."
+            )
+            return
         config.logger.info("Saving PDF")
         if not skip_pdf_create:
             self.create_pdf(auto_open=auto_open)
@@ -250,15 +323,8 @@ class ResumeImprover:
             logger = background_runner.logger
         else:
             logger = config.logger
-        logger.info("Extracting matched skills...")
-        self.skills = self.extract_matched_skills(verbose=False)
-        logger.info("Writing objective...")
-        self.objective = self.write_objective(verbose=False)
-        logger.info("Updating bullet points...")
-        self.experiences = self.rewrite_unedited_experiences(verbose=False)
-        logger.info("Updating projects...")
-        self.projects = self.rewrite_unedited_projects(verbose=False)
-        logger.info("Done updating...")
+        self.prepare()
+        self._run_draft_stages(logger=logger)
         self.yaml_loc = os.path.join(self.job_data_location, "resume.yaml")
         resume_dict = dict(
             editing=True,
@@ -272,14 +338,19 @@ class ResumeImprover:
         utils.write_yaml(resume_dict, filename=self.yaml_loc)
         self.resume_yaml = utils.read_yaml(filename=self.yaml_loc)
 
+    @staticmethod
     def create_draft_tailored_resumes_in_background(background_configs: List[dict]):
         """Run 'create_draft_tailored_resume' for multiple configurations in the background.
 
+        The improvers are created deferred, so each job post is downloaded and parsed
+        exactly once, in its worker thread, rather than in the caller's thread.
+
         Args:
             background_configs (List[dict]): List of configurations for creating draft tailored resumes.
                 Each configuration dictionary should have the following keys:
                 - url (str): The URL of the job posting.
                 - resume_location (str): The file path to the resume to be tailored.
+                - raw_html (str, optional): Already downloaded HTML of the job posting.
                 - auto_open (bool, optional): Whether to automatically open the generated resume. Defaults to True.
                 - manual_review (bool, optional): Whether to wait for manual review. Defaults to True.
         """
@@ -289,21 +360,24 @@ class ResumeImprover:
 
         def run_config(background_config, resume_improver):
             try:
-                resume_improver.download_and_parse_job_post()
+                resume_improver.prepare()
                 resume_improver._create_tailored_resume_in_background(
                     auto_open=background_config.get("auto_open", True),
                     manual_review=background_config.get("manual_review", True),
                 )
             except Exception as e:
                 output["background_runner"].logger.error(
-                    f"An error occurred with config {config}: {e}"
+                    f"An error occurred with config {background_config}: {e}"
                 )
+                raise
 
         for background_config in background_configs:
             output["ResumeImprovers"].append(
                 ResumeImprover(
                     url=background_config["url"],
                     resume_location=background_config.get("resume_location"),
+                    raw_html=background_config.get("raw_html"),
+                    defer=True,
                 )
             )
             output["background_runner"].run_in_background(
@@ -311,30 +385,75 @@ class ResumeImprover:
             )
         return output
 
-    def _get_formatted_chain_inputs(self, chain, section=None):
+    def _get_formatted_chain_inputs(self, input_keys, section=None, inputs=None):
+        """Format the prompt inputs from the resume, the parsed job and the given section.
+
+        Values in `inputs` take precedence over the improver's own fields. Resume fields
+        that are still the ones loaded from the resume file are taken from the shared
+        resume digest instead of being formatted again.
+        """
+        inputs = inputs or {}
         output_dict = {}
-        raw_self_data = self.__dict__
-        if section is not None:
-            raw_self_data = raw_self_data.copy()
-            raw_self_data["section"] = section
-        for key in chain.get_input_schema().schema()["required"]:
-            output_dict[key] = chain_formatter(
-                key, raw_self_data.get(key) or self.parsed_job.get(key)
-            )
+        for key in input_keys:
+            value = section if key == "section" and section is not None else None
+            value = value or inputs.get(key) or self.__dict__.get(key)
+            if value and key in RESUME_PROMPT_KEYS:
+                if value is self._resume_sources.get(key):
+                    output_dict[key] = self.resume_digest.fragments[key]
+                else:
+                    output_dict[key] = format_resume_field(key, value)
+                continue
+            output_dict[key] = chain_formatter(key, value or self.parsed_job.get(key))
         return output_dict
 
     def _chain_updater(
-        self, prompt_msgs, pydantic_object, **chain_kwargs
-    ) -> RunnableSequence:
-        """Create a chain based on the prompt messages.
+        self, prompt_key, pydantic_object, **chain_kwargs
+    ) -> tuple[RunnableSequence, list[str]]:
+        """Get the compiled chain for a prompt from the process-wide registry.
 
         Returns:
-            RunnableSequence: The chain for highlighting resume sections, matching skills, or improving resume content.
+            tuple[RunnableSequence, list[str]]: The chain for highlighting resume sections, matching skills,
+                or improving resume content, and the inputs it requires.
         """
-        prompt = ChatPromptTemplate(messages=prompt_msgs)
-        llm = create_llm(**self.llm_kwargs)
-        runnable = prompt | llm.with_structured_output(schema=pydantic_object)
-        return runnable
+        return get_compiled_chain(prompt_key, pydantic_object, **self.llm_kwargs)
+
+    def _invoke_chain(
+        self, prompt_key, pydantic_object, section=None, inputs=None, **chain_kwargs
+    ) -> dict:
+        """Invoke a chain, reusing the checkpointed output if its inputs are unchanged.
+
+        At most `config.MAX_CONCURRENT_WORKERS` chains of this improver run at once,
+        across all draft stages.
+
+        Args:
+            prompt_key (str): The key of the prompt in `Prompts.lookup`.
+            pydantic_object: The output schema for structured output.
+            section (list | str, optional): The resume section to include in the prompt.
+            inputs (dict, optional): Prompt inputs that override the improver's fields,
+                e.g. the output of an earlier stage.
+            **chain_kwargs: Additional keyword arguments for the chain.
+
+        Returns:
+            dict: The output of the chain.
+        """
+        chain, input_keys = self._chain_updater(
+            prompt_key, pydantic_object, **chain_kwargs
+        )
+        chain_inputs = self._get_formatted_chain_inputs(
+            input_keys, section=section, inputs=inputs
+        )
+        if self.checkpoints is None:
+            with self._llm_slots:
+                return chain.invoke(chain_inputs).dict()
+        fingerprint = stage_fingerprint(
+            prompt_key, pydantic_object, self.llm_kwargs, chain_inputs
+        )
+        output = self.checkpoints.load(prompt_key, fingerprint)
+        if output is None:
+            with self._llm_slots:
+                output = chain.invoke(chain_inputs).dict()
+            self.checkpoints.save(prompt_key, fingerprint, output)
+        return output
 
     def _get_degrees(self, resume: dict):
         """Extract degrees from the resume.
@@ -393,18 +512,41 @@ class ResumeImprover:
         Returns:
             dict: The rewritten section.
         """
-        chain = self._chain_updater(
-            Prompts.lookup["SECTION_HIGHLIGHTER"],
+        section_revised = self._invoke_chain(
+            "SECTION_HIGHLIGHTER",
             ResumeSectionHighlighterOutput,
+            section=section,
             **chain_kwargs,
         )
-        chain_inputs = self._get_formatted_chain_inputs(chain=chain, section=section)
-        section_revised = chain.invoke(chain_inputs).dict()
         section_revised = sorted(
             section_revised["final_answer"], key=lambda d: d["relevance"] * -1
         )
         return [s["highlight"] for s in section_revised]
 
+    def _rewrite_sections(self, sections: list[dict], **chain_kwargs) -> list[dict]:
+        """Rewrite the highlights of several resume sections concurrently.
+
+        At most `config.MAX_CONCURRENT_WORKERS` sections are rewritten at once, and the
+        LLM calls of every stage share the same cap (see `_invoke_chain`).
+
+        Args:
+            sections (list[dict]): The experiences or projects to rewrite.
+            **chain_kwargs: Additional keyword arguments for the chain.
+
+        Returns:
+            list[dict]: The rewritten sections, in their original order.
+        """
+        sections = sections or []
+
+        def rewrite(section):
+            section = dict(section)
+            section["highlights"] = self.rewrite_section(section=section, **chain_kwargs)
+            return section
+
+        max_workers = max(1, min(config.MAX_CONCURRENT_WORKERS, len(sections)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(rewrite, sections))
+
     def rewrite_unedited_experiences(self, **chain_kwargs) -> dict:
         """Rewrite unedited experiences in the resume.
 
@@ -414,12 +556,8 @@ class ResumeImprover:
         Returns:
             dict: The rewritten experiences.
         """
-        result = []
-        for exp in self.experiences:
-            exp = dict(exp)
-            exp["highlights"] = self.rewrite_section(section=exp, **chain_kwargs)
-            result.append(exp)
-        return result
+        self.prepare()
+        return self._rewrite_sections(self.experiences, **chain_kwargs)
 
     def rewrite_unedited_projects(self, **chain_kwargs) -> dict:
         """Rewrite unedited projects in the resume.
@@ -430,12 +568,8 @@ class ResumeImprover:
         Returns:
             dict: The rewritten projects.
         """
-        result = []
-        for exp in self.projects:
-            exp = dict(exp)
-            exp["highlights"] = self.rewrite_section(section=exp, **chain_kwargs)
-            result.append(exp)
-        return result
+        self.prepare()
+        return self._rewrite_sections(self.projects, **chain_kwargs)
 
     def extract_matched_skills(self, **chain_kwargs) -> dict:
         """Extract matched skills from the resume and job post.
@@ -446,12 +580,10 @@ class ResumeImprover:
         Returns:
             dict: The extracted skills.
         """
-
-        chain = self._chain_updater(
-            Prompts.lookup["SKILLS_MATCHER"], ResumeSkillsMatcherOutput, **chain_kwargs
+        self.prepare()
+        extracted_skills = self._invoke_chain(
+            "SKILLS_MATCHER", ResumeSkillsMatcherOutput, **chain_kwargs
         )
-        chain_inputs = self._get_formatted_chain_inputs(chain=chain)
-        extracted_skills = chain.invoke(chain_inputs).dict()
         if not extracted_skills or "final_answer" not in extracted_skills:
             return None
         extracted_skills = extracted_skills["final_answer"]
@@ -470,21 +602,24 @@ class ResumeImprover:
         self._combine_skill_lists(result, self.skills)
         return result
 
-    def write_objective(self, **chain_kwargs) -> dict:
+    def write_objective(self, skills=None, **chain_kwargs) -> dict:
         """Write a objective for the resume.
 
         Args:
+            skills (list, optional): The skills to write the objective from, e.g. the output
+                of `extract_matched_skills`. Defaults to `self.skills`.
             **chain_kwargs: Additional keyword arguments for the chain.
 
         Returns:
             dict: The written objective.
         """
-        chain = self._chain_updater(
-            Prompts.lookup["OBJECTIVE_WRITER"], ResumeSummarizerOutput, **chain_kwargs
+        self.prepare()
+        objective = self._invoke_chain(
+            "OBJECTIVE_WRITER",
+            ResumeSummarizerOutput,
+            inputs=dict(skills=skills) if skills is not None else None,
+            **chain_kwargs,
         )
-
-        chain_inputs = self._get_formatted_chain_inputs(chain=chain)
-        objective = chain.invoke(chain_inputs).dict()
         if not objective or "final_answer" not in objective:
             return None
         return objective["final_answer"]
@@ -498,11 +633,10 @@ class ResumeImprover:
         Returns:
             dict: The suggested improvements.
         """
-        chain = self._chain_updater(
-            Prompts.lookup["IMPROVER"], ResumeImproverOutput, **chain_kwargs
+        self.prepare()
+        improvements = self._invoke_chain(
+            "IMPROVER", ResumeImproverOutput, **chain_kwargs
         )
-        chain_inputs = self._get_formatted_chain_inputs(chain=chain)
-        improvements = chain.invoke(chain_inputs).dict()
         if not improvements or "final_answer" not in improvements:
             return None
         return improvements["final_answer"]
@@ -531,8 +665,7 @@ class ResumeImprover:
         Returns:
             str: The file path to the generated PDF.
         """
-        pdf_generator = ResumePDFGenerator()
-        pdf_location = pdf_generator.generate_resume(
+        pdf_location = get_resume_pdf_generator().generate_resume(
             job_data_location=self.job_data_location,
             data=utils.read_yaml(filename=self.yaml_loc),
         )
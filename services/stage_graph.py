@@ -0,0 +1,136 @@
+import concurrent.futures
+import time
+from typing import Callable, Iterable, Optional
+from ..config import config
+
+
+class Stage:
+    """A unit of work in a `StageGraph`, declared by the values it reads and writes."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+    ):
+        """Initialize the stage.
+
+        Args:
+            name (str): Unique name of the stage.
+            func (Callable): Called with one keyword argument per input.
+            inputs (Iterable[str], optional): Names of the values the stage reads.
+            outputs (Iterable[str], optional): Names of the values the stage produces. A stage
+                with a single output returns its value; a stage with several returns a tuple
+                in the same order.
+        """
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+
+
+class StageGraph:
+    """Run stages concurrently as soon as every input they declare is available."""
+
+    def __init__(self, max_workers: Optional[int] = None, logger=None):
+        """Initialize an empty stage graph.
+
+        Args:
+            max_workers (int, optional): Maximum number of stages running at once.
+                Defaults to `config.MAX_CONCURRENT_WORKERS`.
+            logger (logging.Logger, optional): Logger for stage timings. Defaults to `config.logger`.
+        """
+        self.stages = {}
+        self.max_workers = max_workers or config.MAX_CONCURRENT_WORKERS
+        self.logger = logger or config.logger
+        self.timings = {}
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable,
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+    ) -> "StageGraph":
+        """Declare a stage.
+
+        Args:
+            name (str): Unique name of the stage.
+            func (Callable): Called with one keyword argument per input.
+            inputs (Iterable[str], optional): Names of the values the stage reads.
+            outputs (Iterable[str], optional): Names of the values the stage produces.
+
+        Returns:
+            StageGraph: The graph itself, so calls can be chained.
+        """
+        if name in self.stages:
+            raise ValueError(f"Stage `{name}` is already declared.")
+        stage = Stage(name, func, inputs, outputs)
+        produced = {o for s in self.stages.values() for o in s.outputs}
+        for output in stage.outputs:
+            if output in produced:
+                raise ValueError(f"Output `{output}` is produced by more than one stage.")
+        self.stages[name] = stage
+        return self
+
+    def _run_stage(self, stage: Stage, kwargs: dict):
+        """Run a single stage and record how long it took."""
+        start = time.perf_counter()
+        try:
+            return stage.func(**kwargs)
+        finally:
+            self.timings[stage.name] = time.perf_counter() - start
+            self.logger.info(
+                f"Stage `{stage.name}` finished in {self.timings[stage.name]:.2f}s"
+            )
+
+    def _map_outputs(self, stage: Stage, result) -> dict:
+        """Map a stage's return value onto its declared outputs."""
+        if not stage.outputs:
+            return {}
+        if len(stage.outputs) == 1:
+            return {stage.outputs[0]: result}
+        return dict(zip(stage.outputs, result))
+
+    def run(self, initial_values: Optional[dict] = None) -> dict:
+        """Run every stage, starting each one as soon as its inputs are available.
+
+        Args:
+            initial_values (dict, optional): Values available before any stage runs.
+
+        Returns:
+            dict: The initial values together with every stage output.
+
+        Raises:
+            ValueError: If a stage reads a value that nothing provides, or stages depend on each other cyclically.
+        """
+        values = dict(initial_values or {})
+        available = set(values) | {o for s in self.stages.values() for o in s.outputs}
+        for stage in self.stages.values():
+            missing = [i for i in stage.inputs if i not in available]
+            if missing:
+                raise ValueError(f"Stage `{stage.name}` has unsatisfied inputs: {missing}")
+
+        self.timings = {}
+        pending = dict(self.stages)
+        running = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for stage in list(pending.values()):
+                    if all(i in values for i in stage.inputs):
+                        del pending[stage.name]
+                        kwargs = {i: values[i] for i in stage.inputs}
+                        future = executor.submit(self._run_stage, stage, kwargs)
+                        running[future] = stage
+                if not running:
+                    raise ValueError(
+                        f"Stages {list(pending)} depend on each other cyclically."
+                    )
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    stage = running.pop(future)
+                    values.update(self._map_outputs(stage, future.result()))
+        return values
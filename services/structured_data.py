@@ -0,0 +1,142 @@
+import json
+from typing import Optional
+from bs4 import BeautifulSoup
+from ..config import config
+from .html_extractor import HTML_PARSER
+
+REMOTE_LOCATION_TYPES = {"TELECOMMUTE", "REMOTE"}
+
+
+def _iter_json_ld(soup) -> list:
+    """Return every JSON-LD object embedded in the page, flattening lists and `@graph`s."""
+    objects = []
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or script.get_text())
+        except (TypeError, ValueError):
+            continue
+        pending = data if isinstance(data, list) else [data]
+        while pending:
+            item = pending.pop(0)
+            if isinstance(item, dict):
+                objects.append(item)
+                pending.extend(item.get("@graph", []))
+            elif isinstance(item, list):
+                pending.extend(item)
+    return objects
+
+
+def _is_job_posting(item: dict) -> bool:
+    """Check whether a JSON-LD object is a schema.org `JobPosting`."""
+    types = item.get("@type", [])
+    types = types if isinstance(types, list) else [types]
+    return "JobPosting" in types
+
+
+def _clean_text(value) -> Optional[str]:
+    """Strip markup and whitespace from a JSON-LD text value."""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("description")
+    text = BeautifulSoup(str(value), HTML_PARSER).get_text(separator=" ", strip=True)
+    return text or None
+
+
+def _split_items(value) -> list[str]:
+    """Turn a JSON-LD list, HTML list or multi-line text into a list of items."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [item for item in (_clean_text(v) for v in value) if item]
+    if isinstance(value, dict):
+        value = value.get("description") or value.get("name") or ""
+    soup = BeautifulSoup(str(value), HTML_PARSER)
+    items = [li.get_text(separator=" ", strip=True) for li in soup.find_all("li")]
+    if not items:
+        text = soup.get_text(separator="\n")
+        items = [line.strip(" \t-•*") for line in text.splitlines()]
+    return [item for item in items if item]
+
+
+def _format_amount(amount) -> str:
+    """Format a salary amount with thousands separators."""
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        return str(amount)
+    return f"{amount:,.0f}" if amount.is_integer() else f"{amount:,.2f}"
+
+
+def _format_salary(salary) -> Optional[str]:
+    """Format a schema.org `MonetaryAmount` as text, e.g. `USD 200,000 – 385,000 per year`."""
+    if not isinstance(salary, dict):
+        return _clean_text(salary)
+    currency = salary.get("currency", "")
+    value = salary.get("value", salary)
+    unit = ""
+    if isinstance(value, dict):
+        unit = value.get("unitText", "")
+        if value.get("minValue") is not None and value.get("maxValue") is not None:
+            amount = f"{_format_amount(value['minValue'])} – {_format_amount(value['maxValue'])}"
+        elif value.get("value") is not None:
+            amount = _format_amount(value["value"])
+        else:
+            return None
+    else:
+        amount = _format_amount(value)
+    text = f"{currency} {amount}".strip()
+    if unit:
+        text += f" per {unit.lower()}"
+    return text
+
+
+def _fields_from_job_posting(posting: dict) -> dict:
+    """Map a schema.org `JobPosting` onto `JobDescription` fields."""
+    fields = {}
+    organization = posting.get("hiringOrganization")
+    fields["company"] = _clean_text(organization)
+    fields["job_title"] = _clean_text(posting.get("title"))
+    fields["salary"] = _format_salary(
+        posting.get("baseSalary") or posting.get("estimatedSalary")
+    )
+    location_types = posting.get("jobLocationType", [])
+    location_types = location_types if isinstance(location_types, list) else [location_types]
+    if location_types:
+        fields["is_fully_remote"] = any(
+            str(t).upper() in REMOTE_LOCATION_TYPES for t in location_types
+        )
+    qualifications = _split_items(posting.get("qualifications"))
+    for key in ("experienceRequirements", "educationRequirements"):
+        qualifications.extend(_split_items(posting.get(key)))
+    fields["qualifications"] = qualifications
+    fields["duties"] = _split_items(posting.get("responsibilities"))
+    return fields
+
+
+def extract_structured_job_fields(html: str) -> dict:
+    """Fill `JobDescription` fields from the schema.org `JobPosting` JSON-LD in a page.
+
+    OpenGraph metadata is not used: on job boards and aggregators `og:site_name` is
+    the board, not the employer, and `og:title` is a headline rather than the title.
+
+    Args:
+        html (str): The raw HTML of the posting.
+
+    Returns:
+        dict: The fields that could be determined. Missing fields are omitted.
+    """
+    if not html:
+        return {}
+    soup = BeautifulSoup(html, HTML_PARSER)
+    fields = {}
+    posting = next((o for o in _iter_json_ld(soup) if _is_job_posting(o)), None)
+    if posting is not None:
+        fields.update(
+            {k: v for k, v in _fields_from_job_posting(posting).items() if v not in (None, [])}
+        )
+    if fields:
+        config.logger.info(
+            f"Found {sorted(fields)} in the structured data of the job post."
+        )
+    return fields
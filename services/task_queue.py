@@ -0,0 +1,416 @@
+import concurrent.futures
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from typing import Optional
+from ..config import config
+from .html_archive import canonicalize_url
+from .resume_improver import ResumeImprover
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class QueuedTask:
+    """A row of the task queue."""
+
+    def __init__(self, row: sqlite3.Row):
+        """Initialize the task from a `tasks` row.
+
+        Args:
+            row (sqlite3.Row): The database row.
+        """
+        self.id = row["id"]
+        self.task_key = row["task_key"]
+        self.config = json.loads(row["config"])
+        self.status = row["status"]
+        self.stage = row["stage"]
+        self.attempts = row["attempts"]
+        self.output_paths = json.loads(row["output_paths"])
+        self.error = row["error"]
+        self.worker_id = row["worker_id"]
+        self.created_at = row["created_at"]
+        self.updated_at = row["updated_at"]
+
+    def as_dict(self) -> dict:
+        """Summarize the task."""
+        return dict(self.__dict__)
+
+
+def _default_task_key(task_config: dict) -> str:
+    """Identify a task by its canonical job post URL and resume."""
+    resume_location = task_config.get("resume_location") or config.DEFAULT_RESUME_PATH
+    return f"{canonicalize_url(task_config['url'])} {os.path.abspath(resume_location)}"
+
+
+def _worker_is_alive(worker_id: Optional[str]) -> bool:
+    """Check whether the process that owns a worker ID is still running.
+
+    Worker IDs on other hosts are assumed to be alive; their leases expire instead.
+    """
+    try:
+        host, pid, _ = worker_id.split(":", 2)
+        pid = int(pid)
+    except (AttributeError, ValueError):
+        return False
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class TaskQueue:
+    """Durable SQLite queue of draft tailoring tasks.
+
+    Each task records its config, status, current stage, attempts, output paths and
+    last error. Workers claim tasks atomically under a lease, so several threads or
+    processes can share a queue file, and a restarted process requeues the work that
+    was in flight when it died.
+    """
+
+    def __init__(
+        self,
+        database_path: str = None,
+        lease_seconds: float = None,
+        max_attempts: int = None,
+    ):
+        """Initialize the queue. The database file is created on first use.
+
+        Args:
+            database_path (str, optional): Path to the SQLite file. Defaults to `config.TASK_QUEUE_PATH`.
+            lease_seconds (float, optional): How long a claim lasts without a stage update before
+                another worker may take the task over. Defaults to `config.TASK_QUEUE_LEASE_SECONDS`.
+            max_attempts (int, optional): Attempts before a task is marked failed. Defaults to
+                `config.TASK_QUEUE_MAX_ATTEMPTS`.
+        """
+        self.database_path = database_path or config.TASK_QUEUE_PATH
+        self.lease_seconds = lease_seconds or config.TASK_QUEUE_LEASE_SECONDS
+        self.max_attempts = max_attempts or config.TASK_QUEUE_MAX_ATTEMPTS
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the queue database, creating its table if needed."""
+        if not self._schema_ready:
+            os.makedirs(os.path.dirname(self.database_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.database_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, task_key TEXT NOT NULL UNIQUE, "
+                "config TEXT NOT NULL, status TEXT NOT NULL, stage TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, output_paths TEXT NOT NULL DEFAULT '{}', "
+                "error TEXT, worker_id TEXT, lease_expires_at REAL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, id)"
+            )
+            self._schema_ready = True
+        return conn
+
+    def enqueue(self, task_config: dict, task_key: str = None) -> int:
+        """Add a task unless one with the same key is already queued.
+
+        Args:
+            task_config (dict): The task config, with the same keys as a
+                `create_draft_tailored_resumes_in_background` config.
+            task_key (str, optional): Deduplication key. Defaults to the canonical job post URL
+                and the resume path.
+
+        Returns:
+            int: The ID of the new or existing task.
+        """
+        task_key = task_key or _default_task_key(task_config)
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO tasks (task_key, config, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (task_key, json.dumps(task_config), PENDING, now, now),
+            )
+            return conn.execute(
+                "SELECT id FROM tasks WHERE task_key = ?", (task_key,)
+            ).fetchone()["id"]
+
+    def claim(self, worker_id: str) -> Optional[QueuedTask]:
+        """Atomically take the oldest pending task, or one whose lease has expired.
+
+        Tasks whose lease expired after their last attempt are marked failed instead.
+
+        Args:
+            worker_id (str): ID of the claiming worker.
+
+        Returns:
+            Optional[QueuedTask]: The claimed task, or None if there is nothing to do.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                exhausted = conn.execute(
+                    "UPDATE tasks SET status = ?, error = ?, lease_expires_at = NULL, "
+                    "updated_at = ? WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                    (
+                        FAILED,
+                        "Exceeded max attempts: the lease of the last attempt expired.",
+                        now,
+                        RUNNING,
+                        now,
+                        self.max_attempts,
+                    ),
+                ).rowcount
+                row = conn.execute(
+                    "SELECT id FROM tasks WHERE status = ? OR (status = ? "
+                    "AND lease_expires_at < ? AND attempts < ?) ORDER BY id LIMIT 1",
+                    (PENDING, RUNNING, now, self.max_attempts),
+                ).fetchone()
+                if exhausted:
+                    config.logger.warning(
+                        f"Marked {exhausted} tasks failed after their last attempt expired."
+                    )
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE tasks SET status = ?, attempts = attempts + 1, worker_id = ?, "
+                    "lease_expires_at = ?, error = NULL, updated_at = ? WHERE id = ?",
+                    (RUNNING, worker_id, now + self.lease_seconds, now, row["id"]),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def update_stage(self, task_id: int, stage: str, output_paths: dict = None):
+        """Record the stage a task has reached and renew its lease.
+
+        Args:
+            task_id (int): The task ID.
+            stage (str): The stage name.
+            output_paths (dict, optional): Output files produced so far.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE tasks SET stage = ?, output_paths = COALESCE(?, output_paths), "
+                "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                (
+                    stage,
+                    json.dumps(output_paths) if output_paths is not None else None,
+                    now + self.lease_seconds,
+                    now,
+                    task_id,
+                ),
+            )
+
+    def complete(self, task_id: int, output_paths: dict = None):
+        """Mark a task as completed.
+
+        Args:
+            task_id (int): The task ID.
+            output_paths (dict, optional): The files the task produced.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, stage = ?, "
+                "output_paths = COALESCE(?, output_paths), lease_expires_at = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (
+                    COMPLETED,
+                    COMPLETED,
+                    json.dumps(output_paths) if output_paths is not None else None,
+                    now,
+                    task_id,
+                ),
+            )
+
+    def fail(self, task_id: int, error: str):
+        """Record a failed attempt, requeueing the task unless it is out of attempts.
+
+        Args:
+            task_id (int): The task ID.
+            error (str): Description of the error.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "error = ?, lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                (self.max_attempts, FAILED, PENDING, error, now, task_id),
+            )
+
+    def requeue_stale(self) -> int:
+        """Requeue running tasks whose lease expired or whose worker process has died.
+
+        Tasks that are out of attempts are marked failed instead.
+
+        Returns:
+            int: The number of requeued tasks.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                stale = [
+                    row["id"]
+                    for row in conn.execute(
+                        "SELECT id, worker_id, lease_expires_at FROM tasks WHERE status = ?",
+                        (RUNNING,),
+                    )
+                    if (row["lease_expires_at"] or 0) < now
+                    or not _worker_is_alive(row["worker_id"])
+                ]
+                conn.executemany(
+                    "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                    "lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                    [
+                        (self.max_attempts, FAILED, PENDING, now, task_id)
+                        for task_id in stale
+                    ],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if stale:
+            config.logger.info(f"Requeued {len(stale)} interrupted tasks.")
+        return len(stale)
+
+    def get(self, task_id: int) -> Optional[QueuedTask]:
+        """Return a task by ID, or None if it does not exist."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return QueuedTask(row) if row is not None else None
+
+    def tasks(self, status: str = None) -> list[QueuedTask]:
+        """Return every task, optionally only those with the given status."""
+        with closing(self._connect()) as conn:
+            if status is None:
+                rows = conn.execute("SELECT * FROM tasks ORDER BY id").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM tasks WHERE status = ? ORDER BY id", (status,)
+                ).fetchall()
+        return [QueuedTask(row) for row in rows]
+
+    def counts(self) -> dict:
+        """Return the number of tasks in each status."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS count FROM tasks GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["count"] for row in rows}
+
+
+def process_queued_task(queue: TaskQueue, task: QueuedTask) -> dict:
+    """Draft a tailored resume for a claimed task, recording each stage in the queue.
+
+    Stages already recorded as done (e.g. by a previous, interrupted attempt) are skipped.
+
+    Args:
+        queue (TaskQueue): The queue the task was claimed from.
+        task (QueuedTask): The claimed task.
+
+    Returns:
+        dict: The output paths of the task.
+    """
+    output_paths = dict(task.output_paths)
+    resume_improver = ResumeImprover(
+        url=task.config["url"],
+        resume_location=task.config.get("resume_location"),
+        raw_html=task.config.get("raw_html"),
+        defer=True,
+    )
+    if not os.path.exists(output_paths.get("resume_yaml", "")):
+        queue.update_stage(task.id, "prepare")
+        resume_improver.prepare()
+        output_paths["job_yaml"] = os.path.join(
+            resume_improver.job_data_location, "job.yaml"
+        )
+        queue.update_stage(task.id, "draft", output_paths=output_paths)
+        resume_improver._create_tailored_resume_in_background(
+            auto_open=False, manual_review=False
+        )
+        output_paths["resume_yaml"] = resume_improver.yaml_loc
+        queue.update_stage(task.id, "drafted", output_paths=output_paths)
+
+    if task.config.get("create_pdf") and not os.path.exists(
+        output_paths.get("pdf", "")
+    ):
+        queue.update_stage(task.id, "pdf")
+        resume_improver.yaml_loc = output_paths["resume_yaml"]
+        resume_improver.job_data_location = os.path.dirname(output_paths["resume_yaml"])
+        output_paths["pdf"] = resume_improver.create_pdf(auto_open=False)
+    return output_paths
+
+
+def run_task_queue(
+    queue: TaskQueue = None,
+    max_workers: int = None,
+    stop_when_empty: bool = True,
+    poll_interval: float = None,
+) -> dict:
+    """Process queued tasks with a pool of worker threads.
+
+    Interrupted tasks from a previous run are requeued first, so a restarted batch
+    picks up where it left off.
+
+    Args:
+        queue (TaskQueue, optional): The queue to process. Defaults to a `TaskQueue` at `config.TASK_QUEUE_PATH`.
+        max_workers (int, optional): Number of worker threads. Defaults to `config.MAX_CONCURRENT_WORKERS`.
+        stop_when_empty (bool, optional): Return once no task is left, instead of polling for
+            new ones. Defaults to True.
+        poll_interval (float, optional): Seconds between polls of an empty queue. Defaults to
+            `config.TASK_QUEUE_POLL_INTERVAL`.
+
+    Returns:
+        dict: The number of tasks in each status when the workers stop.
+    """
+    queue = queue or TaskQueue()
+    max_workers = max_workers or config.MAX_CONCURRENT_WORKERS
+    poll_interval = poll_interval or config.TASK_QUEUE_POLL_INTERVAL
+    queue.requeue_stale()
+    run_id = uuid.uuid4().hex[:8]
+
+    def work(index):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{run_id}-{index}"
+        while True:
+            task = queue.claim(worker_id)
+            if task is None:
+                if stop_when_empty:
+                    return
+                time.sleep(poll_interval)
+                continue
+            config.logger.info(
+                f"Worker {worker_id} claimed task {task.id} ({task.config['url']}), "
+                f"attempt {task.attempts}."
+            )
+            try:
+                output_paths = process_queued_task(queue, task)
+            except Exception as e:
+                config.logger.error(f"Task {task.id} failed: {e}")
+                queue.fail(task.id, f"{type(e).__name__}: {e}")
+            else:
+                queue.complete(task.id, output_paths)
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="TaskQueueWorker"
+    ) as executor:
+        for future in [executor.submit(work, i) for i in range(max_workers)]:
+            future.result()
+    return queue.counts()
@@ -1,5 +1,8 @@
+import json
 import unittest
+from unittest import mock
 from ..models.job_post import JobDescription, JobPost
+from .. import services
 from ..models.resume import ResumeSectionHighlight, ResumeSectionHighlighterOutput, ResumeSkills, ResumeSkillsMatcherOutput, ResumeSummarizerOutput, ResumeImprovements, ResumeImproverOutput
 
 class TestJobDescription(unittest.TestCase):
@@ -10,6 +13,74 @@ class TestJobDescription(unittest.TestCase):
         self.assertIn("Python", job_description.technical_skills)
         self.assertIn("Communication", job_description.non_technical_skills)
 
+JOB_POSTING_JSON_LD = {
+    "@context": "https://schema.org",
+    "@type": "JobPosting",
+    "title": "Data Engineer",
+    "hiringOrganization": {"@type": "Organization", "name": "Example Corp"},
+    "jobLocationType": "TELECOMMUTE",
+    "baseSalary": {
+        "@type": "MonetaryAmount",
+        "currency": "USD",
+        "value": {"@type": "QuantitativeValue", "minValue": 150000, "maxValue": 200000, "unitText": "YEAR"},
+    },
+    "qualifications": "<ul><li>5+ years of Python</li><li>SQL</li></ul>",
+    "responsibilities": "Build pipelines\nOwn the warehouse",
+}
+JOB_POSTING_HTML = (
+    "<html><head><script type='application/ld+json'>"
+    + json.dumps(JOB_POSTING_JSON_LD)
+    + "</script></head><body>Data Engineer at Example Corp</body></html>"
+)
+
+
+class TestJobPost(unittest.TestCase):
+    def _job_post(self, llm_output):
+        job_post = JobPost("Data Engineer at Example Corp", html=JOB_POSTING_HTML)
+        job_post.extractor_llm = mock.Mock()
+        structured_llm = job_post.extractor_llm.with_structured_output.return_value
+        structured_llm.invoke.side_effect = lambda posting: schema(**llm_output)
+
+        def with_structured_output(model):
+            nonlocal schema
+            schema = model
+            return structured_llm
+
+        schema = None
+        job_post.extractor_llm.with_structured_output.side_effect = with_structured_output
+        return job_post
+
+    def test_structured_data_fills_fields(self):
+        job_post = self._job_post({"job_summary": "Build data systems."})
+        parsed = job_post.parse_job_post()
+        schema = job_post.extractor_llm.with_structured_output.call_args[0][0]
+        self.assertNotIn("company", schema.__fields__)
+        self.assertIn("job_summary", schema.__fields__)
+        self.assertEqual(parsed["company"], "Example Corp")
+        self.assertEqual(parsed["job_title"], "Data Engineer")
+        self.assertEqual(parsed["salary"], "USD 150,000 – 200,000 per year")
+        self.assertTrue(parsed["is_fully_remote"])
+        self.assertEqual(parsed["qualifications"], ["5+ years of Python", "SQL"])
+        self.assertEqual(parsed["duties"], ["Build pipelines", "Own the warehouse"])
+        self.assertEqual(parsed["job_summary"], "Build data systems.")
+
+    def test_aggregator_open_graph_is_not_taken_for_the_employer(self):
+        html = (
+            "<html><head>"
+            "<meta property='og:site_name' content='LinkedIn'>"
+            "<meta property='og:title' content='Acme hiring Senior Data Engineer in New York, NY | LinkedIn'>"
+            "</head><body>Acme is hiring a Senior Data Engineer.</body></html>"
+        )
+        self.assertEqual(services.extract_structured_job_fields(html), {})
+        job_post = self._job_post({"company": "Acme", "job_title": "Senior Data Engineer"})
+        job_post.html = html
+        parsed = job_post.parse_job_post()
+        schema = job_post.extractor_llm.with_structured_output.call_args[0][0]
+        self.assertIs(schema, JobDescription)
+        self.assertEqual(parsed["company"], "Acme")
+        self.assertEqual(parsed["job_title"], "Senior Data Engineer")
+
+
 class TestResumeModels(unittest.TestCase):
     def test_resume_section_highlight(self):
         highlight = ResumeSectionHighlight(highlight="Led a team", relevance=5)
@@ -1,13 +1,34 @@
 import unittest
-from ..pdf_generation.resume_pdf_generator import ResumePDFGenerator
+from unittest import mock
+from reportlab.pdfbase import pdfmetrics, ttfonts
+from ..pdf_generation import batch_render, fonts, render_cache, resume_pdf_styles
+from ..pdf_generation import resume_pdf_generator
+from ..pdf_generation.resume_pdf_generator import (
+    ResumePDFGenerator,
+    get_resume_pdf_generator,
+)
 from ..config import config
 from ..utils import utils
 import os
+import copy
+import shutil
+import tempfile
+import time
+
+
+def disable_render_cache(test_case):
+    """Render for real in `test_case`, without reading or filling the repo's PDF cache."""
+    patcher = mock.patch.object(
+        resume_pdf_generator.config, "USE_PDF_RENDER_CACHE", False
+    )
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
 
 
 class TestResumePDFGenerator(unittest.TestCase):
     def setUp(self):
         self.pdf_generator = ResumePDFGenerator()
+        disable_render_cache(self)
 
     def test_generate_resume(self):
         data = utils.read_yaml(filename=config.DEFAULT_RESUME_PATH)
@@ -15,6 +36,218 @@ class TestResumePDFGenerator(unittest.TestCase):
         self.pdf_generator.generate_resume(job_data_location=file_path, data=data)
         self.assertTrue(os.path.exists(file_path))
 
+    def test_generate_resume_bytes(self):
+        data = utils.read_yaml(filename=config.DEFAULT_RESUME_PATH)
+        pdf = self.pdf_generator.generate_resume_bytes(data)
+        self.assertIsInstance(pdf, bytes)
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        self.assertIn(b"%%EOF", pdf[-32:])
+        view = self.pdf_generator.generate_resume_bytes(data, as_memoryview=True)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(bytes(view[:4]), b"%PDF")
+
+    def test_generate_resume_bytes_can_save(self):
+        data = utils.read_yaml(filename=config.DEFAULT_RESUME_PATH)
+        job_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, job_dir)
+        pdf = self.pdf_generator.generate_resume_bytes(data, job_data_location=job_dir)
+        pdf_location = resume_pdf_styles.resume_pdf_location(
+            data["basic"]["name"], job_dir
+        )
+        with open(pdf_location, "rb") as stream:
+            self.assertEqual(stream.read(), pdf)
+
+
+class TestSectionCache(unittest.TestCase):
+    def setUp(self):
+        self.pdf_generator = ResumePDFGenerator()
+        self.pdf_generator._register_fonts()
+        self.data = utils.read_yaml(filename=config.DEFAULT_RESUME_PATH)
+
+    def test_edit_rebuilds_only_changed_section(self):
+        self.pdf_generator._build_table(self.data)
+        sections = self.pdf_generator.section_misses
+        self.assertEqual(self.pdf_generator.section_hits, 0)
+        edited = copy.deepcopy(self.data)
+        edited["experiences"][0]["highlights"][0] += " Edited."
+        self.pdf_generator._build_table(edited)
+        self.assertEqual(self.pdf_generator.section_misses, sections + 1)
+        self.assertEqual(self.pdf_generator.section_hits, sections - 1)
+
+    def test_cached_paragraphs_are_copies(self):
+        first = self.pdf_generator._build_table(self.data)
+        second = self.pdf_generator._build_table(self.data)
+        first_cell = first._cellvalues[0][0]
+        second_cell = second._cellvalues[0][0]
+        self.assertIsNot(first_cell, second_cell)
+        self.assertIs(first_cell.frags, second_cell.frags)
+
+    def test_shifted_styles_match_direct_build(self):
+        table_data, table_styles = [], []
+        self.pdf_generator.add_experiences(
+            table_data, table_styles, 0, self.data["experiences"]
+        )
+        sections = [(self.pdf_generator._add_section_heading, "Experience")] + [
+            (self.pdf_generator._add_experience, job) for job in self.data["experiences"]
+        ]
+        shifted, offset = [], 0
+        for builder, *content in sections:
+            rows, styles = self.pdf_generator._cached_section(builder, *content)
+            shifted.extend(
+                resume_pdf_generator._shift_rows(style, offset) for style in styles
+            )
+            offset += len(rows)
+        self.assertEqual(shifted, table_styles)
+        self.assertEqual(offset, len(table_data))
+
+
+class TestFontRegistry(unittest.TestCase):
+    def test_fonts_used_by_styles(self):
+        used = fonts.fonts_used_by(resume_pdf_styles.PARAGRAPH_STYLES.values())
+        self.assertTrue(used <= set(resume_pdf_styles.FONT_NAMES.values()))
+
+    def test_fonts_are_loaded_once(self):
+        fonts.ensure_fonts_registered(
+            font_names=resume_pdf_styles.FONT_NAMES.values()
+        )
+        registered = pdfmetrics.getRegisteredFontNames()
+        for name in resume_pdf_styles.FONT_NAMES.values():
+            self.assertIn(name, registered)
+        with mock.patch.object(ttfonts, "TTFont") as font_loader:
+            loaded = fonts.ensure_fonts_registered(
+                font_names=resume_pdf_styles.FONT_NAMES.values()
+            )
+            ResumePDFGenerator()._register_fonts()
+        self.assertEqual(loaded, set())
+        font_loader.assert_not_called()
+
+    def test_unknown_fonts_are_ignored(self):
+        self.assertFalse(fonts.register_font("Helvetica"))
+
+    def test_generator_is_shared(self):
+        self.assertIs(get_resume_pdf_generator(), get_resume_pdf_generator())
+
+
+class TestBatchRender(unittest.TestCase):
+    def setUp(self):
+        disable_render_cache(self)
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.job_dirs = []
+        for name in ("company_a/job", "company_b/job"):
+            job_dir = os.path.join(self.root, name)
+            os.makedirs(job_dir)
+            shutil.copy(
+                config.DEFAULT_RESUME_PATH, os.path.join(job_dir, "resume.yaml")
+            )
+            self.job_dirs.append(job_dir)
+        self.empty_dir = os.path.join(self.root, "company_c")
+        os.makedirs(self.empty_dir)
+
+    def test_find_job_directories(self):
+        self.assertEqual(batch_render.find_job_directories(self.root), self.job_dirs)
+
+    def test_render_pdfs_across_processes(self):
+        results = list(
+            batch_render.render_pdfs(self.job_dirs + [self.empty_dir], max_workers=2)
+        )
+        by_dir = {result.job_data_location: result for result in results}
+        self.assertEqual(set(by_dir), set(self.job_dirs + [self.empty_dir]))
+        for job_dir in self.job_dirs:
+            self.assertTrue(by_dir[job_dir].ok, by_dir[job_dir].error)
+            self.assertTrue(os.path.exists(by_dir[job_dir].pdf_location))
+        self.assertFalse(by_dir[self.empty_dir].ok)
+        self.assertIsNone(by_dir[self.empty_dir].pdf_location)
+
+    def test_cli_searches_recursively(self):
+        with mock.patch("sys.stdout"), mock.patch("sys.stderr"):
+            exit_code = batch_render.batch_render_main(["-r", "-j", "1", self.root])
+        self.assertEqual(exit_code, 0)
+        for job_dir in self.job_dirs:
+            self.assertTrue(any(name.endswith(".pdf") for name in os.listdir(job_dir)))
+
+
+class TestPDFRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.cache = render_cache.PDFRenderCache(
+            root=self.root, max_entries=2, ttl_seconds=60
+        )
+        patcher = mock.patch.object(
+            resume_pdf_generator, "get_pdf_render_cache", return_value=self.cache
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.data = utils.read_yaml(filename=config.DEFAULT_RESUME_PATH)
+
+    def test_key_ignores_key_order(self):
+        reordered = dict(reversed(list(self.data.items())))
+        self.assertEqual(
+            render_cache.render_cache_key(self.data),
+            render_cache.render_cache_key(reordered),
+        )
+        reviewed = dict(self.data, editing=not self.data.get("editing", False))
+        self.assertEqual(
+            render_cache.render_cache_key(self.data),
+            render_cache.render_cache_key(reviewed),
+        )
+        edited = copy.deepcopy(self.data)
+        edited["objective"] += " Edited."
+        self.assertNotEqual(
+            render_cache.render_cache_key(self.data),
+            render_cache.render_cache_key(edited),
+        )
+
+    def test_unchanged_data_is_not_rendered_again(self):
+        generator = ResumePDFGenerator()
+        with mock.patch.object(
+            generator, "_build_table", wraps=generator._build_table
+        ) as build_table:
+            first = generator.generate_resume_bytes(self.data, use_cache=True)
+            second = generator.generate_resume_bytes(
+                copy.deepcopy(self.data), use_cache=True
+            )
+        self.assertEqual(first, second)
+        self.assertEqual(build_table.call_count, 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_generate_resume_writes_cached_pdf(self):
+        job_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, job_dir)
+        generator = ResumePDFGenerator()
+        pdf = generator.generate_resume_bytes(self.data, use_cache=True)
+        pdf_location = generator.generate_resume(job_dir, self.data, use_cache=True)
+        with open(pdf_location, "rb") as stream:
+            self.assertEqual(stream.read(), pdf)
+
+    def test_store_scans_only_when_eviction_is_due(self):
+        with mock.patch.object(self.cache, "evict", wraps=self.cache.evict) as evict:
+            self.cache.store("aa1", b"%PDF")
+            self.cache.store("aa1", b"%PDF")
+            self.cache.store("bb2", b"%PDF")
+            self.assertEqual(evict.call_count, 1)
+            self.cache.store("cc3", b"%PDF")
+            self.assertEqual(evict.call_count, 2)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        with mock.patch.object(render_cache, "EVICTION_INTERVAL", 2), mock.patch.object(
+            self.cache, "evict", wraps=self.cache.evict
+        ) as evict:
+            self.cache.store("aa1", b"%PDF")
+            self.cache.store("aa1", b"%PDF")
+            self.assertEqual(evict.call_count, 1)
+
+    def test_eviction(self):
+        now = time.time()
+        for age, key in ((10, "aa1"), (20, "bb2"), (30, "cc3"), (120, "dd4")):
+            utils.atomic_write(self.cache._path(key), b"%PDF")
+            os.utime(self.cache._path(key), (now - age, now - age))
+        self.assertEqual(self.cache.evict(), 2)
+        self.assertIsNotNone(self.cache.load("aa1"))
+        self.assertIsNotNone(self.cache.load("bb2"))
+        self.assertIsNone(self.cache.load("cc3"))
+        self.assertIsNone(self.cache.load("dd4"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,13 +1,85 @@
+import asyncio
+import gc
+import os
+import shutil
+import tempfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
 import unittest
+from datetime import datetime
+import httpx
+import requests
+from unittest import mock
 from ..services.resume_improver import ResumeImprover
+from ..models.resume import ResumeSectionHighlighterOutput
+from ..services.stage_graph import StageGraph
+from ..services.background_runner import BackgroundRunner
+from ..services.llm_cache import TieredLLMCache
+from ..services.http_client import (
+    close_http_client,
+    get_http_client,
+    get_http_client_stats,
+)
+from ..services.downloader import JobPostDownloader, TokenBucket, parse_retry_after
+from ..services.async_fetcher import fetch_job_posts
+from ..services.html_archive import HTMLArchive, canonicalize_url
+from ..services.html_extractor import HTMLTextExtractor
+from ..services import task_queue
+from ..services.task_queue import TaskQueue, run_task_queue
+from ..services.checkpoints import StageCheckpoints
+from ..services.rate_governor import (
+    AsyncGovernedTransport,
+    GovernedTransport,
+    RateGovernor,
+)
+from ..services import resume_digest
+from ..services.resume_digest import get_resume_digest
+from langchain.prompts import ChatPromptTemplate
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
 from ..services.langchain_helpers import (
     create_llm,
+    get_compiled_chain,
     format_list_as_string,
     format_prompt_inputs_as_strings,
     parse_date,
     datediff_years,
+    chain_formatter,
+    get_cumulative_time_from_titles,
 )
 from ..config import config
+from ..prompts import Prompts
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for job boards and the OpenAI API."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = f"<html><body><h1>Posting {self.path}</h1></body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServerTestCase(unittest.TestCase):
+    handler = StandInHandler
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
 
 
 class TestResumeImproverExtractor(unittest.TestCase):
@@ -117,10 +189,885 @@ class TestResumeImproverExtractor(unittest.TestCase):
         self.assertTrue(self.resume_improver.yaml_loc.endswith("resume.yaml"))
 
 
+class TestResumeImproverRewrites(unittest.TestCase):
+    def setUp(self):
+        self.resume_improver = ResumeImprover("https://example.com/job", defer=True)
+        self.resume_improver._prepared = True
+        self.resume_improver.experiences = [
+            {"company": f"Company {i}", "highlights": [f"Did {i}"]} for i in range(8)
+        ]
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def _fake_rewrite_section(self, section, **chain_kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return [section["company"]]
+
+    def test_rewrite_unedited_experiences_is_concurrent_and_ordered(self):
+        with mock.patch.object(
+            self.resume_improver, "rewrite_section", self._fake_rewrite_section
+        ), mock.patch.object(config, "MAX_CONCURRENT_WORKERS", 3):
+            result = self.resume_improver.rewrite_unedited_experiences()
+        self.assertEqual(
+            [exp["highlights"] for exp in result],
+            [[f"Company {i}"] for i in range(8)],
+        )
+        self.assertGreater(self.max_active, 1)
+        self.assertLessEqual(self.max_active, 3)
+
+    def test_llm_calls_of_all_stages_share_the_cap(self):
+        with mock.patch.object(config, "MAX_CONCURRENT_WORKERS", 3):
+            improver = ResumeImprover("https://example.com/job", defer=True)
+        improver._prepared = True
+        test = self
+
+        class FakeChain:
+            def invoke(self, inputs):
+                test._fake_rewrite_section({"company": "Company"})
+                return mock.Mock(dict=lambda: {})
+
+        with mock.patch.object(
+            improver, "_chain_updater", return_value=(FakeChain(), [])
+        ):
+            threads = [
+                threading.Thread(target=improver._invoke_chain, args=(key, None))
+                for key in ("SKILLS_MATCHER", "OBJECTIVE_WRITER") * 4
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(self.max_active, 3)
+
+    def test_objective_is_written_from_matched_skills(self):
+        matched = [dict(category="Technical", skills=["SQL", "Python"])]
+        self.resume_improver.skills = [dict(category="Technical", skills=["COBOL"])]
+        objective_inputs = []
+
+        class FakeChain:
+            def invoke(self, inputs):
+                objective_inputs.append(inputs)
+                return mock.Mock(dict=lambda: {"final_answer": "Objective"})
+
+        with mock.patch.object(
+            self.resume_improver, "extract_matched_skills", return_value=matched
+        ), mock.patch.object(
+            self.resume_improver, "rewrite_unedited_experiences", return_value=[]
+        ), mock.patch.object(
+            self.resume_improver, "rewrite_unedited_projects", return_value=[]
+        ), mock.patch.object(
+            self.resume_improver,
+            "_chain_updater",
+            return_value=(FakeChain(), ["skills"]),
+        ):
+            self.resume_improver._run_draft_stages()
+        self.assertEqual(self.resume_improver.objective, "Objective")
+        prompt = ChatPromptTemplate(messages=Prompts.lookup["OBJECTIVE_WRITER"])
+        inputs = {key: "" for key in prompt.input_variables}
+        inputs.update(objective_inputs[0])
+        prompt_text = prompt.format(**inputs)
+        self.assertIn("Technical: Proficient in SQL, Python", prompt_text)
+        self.assertNotIn("COBOL", prompt_text)
+
+
+
+class TestDeferredResumeImprover(unittest.TestCase):
+    def setUp(self):
+        self.downloads = []
+        self.resumes_loaded = []
+        patches = [
+            mock.patch.object(
+                ResumeImprover,
+                "download_and_parse_job_post",
+                lambda improver: self.downloads.append(
+                    (improver.url, threading.current_thread())
+                )
+                or setattr(improver, "parsed_job", {}),
+            ),
+            mock.patch.object(
+                ResumeImprover,
+                "_update_resume_fields",
+                lambda improver: self.resumes_loaded.append(improver.url)
+                or setattr(improver, "resume", {}),
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_deferred_improver_prepares_once(self):
+        improver = ResumeImprover("https://example.com/job", defer=True)
+        self.assertEqual(self.downloads, [])
+        self.assertEqual(self.resumes_loaded, [])
+        improver.prepare()
+        improver.prepare()
+        self.assertEqual([url for url, _ in self.downloads], ["https://example.com/job"])
+        self.assertEqual(self.resumes_loaded, ["https://example.com/job"])
+
+    def test_background_batch_downloads_each_post_once_in_the_worker(self):
+        urls = [f"https://example.com/job/{i}" for i in range(3)]
+        with mock.patch.object(ResumeImprover, "_create_tailored_resume_in_background"):
+            output = ResumeImprover.create_draft_tailored_resumes_in_background(
+                [dict(url=url) for url in urls]
+            )
+            output["background_runner"].wait(timeout=5)
+        self.assertCountEqual([url for url, _ in self.downloads], urls)
+        self.assertNotIn(
+            threading.current_thread(), [thread for _, thread in self.downloads]
+        )
+        self.assertCountEqual(self.resumes_loaded, urls)
+
+
+class TestStageCheckpoints(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.resume_improver = ResumeImprover("https://example.com/job", defer=True)
+        self.resume_improver._prepared = True
+        self.resume_improver.parsed_job = {"job_title": "Engineer"}
+        self.resume_improver.experiences = [
+            {"company": f"Company {i}", "highlights": [f"Did {i}"]} for i in range(3)
+        ]
+        self.resume_improver.checkpoints = StageCheckpoints(self.tmp_dir.name)
+        self.invoked = []
+        chain = mock.Mock()
+        chain.invoke.side_effect = self._fake_invoke
+        patch = mock.patch.object(
+            self.resume_improver,
+            "_chain_updater",
+            return_value=(chain, ["section", "job_title"]),
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def _fake_invoke(self, chain_inputs):
+        self.invoked.append(chain_inputs["section"]["company"])
+        return ResumeSectionHighlighterOutput(
+            plan=[],
+            additional_steps=[],
+            work=[],
+            final_answer=[
+                {"highlight": h, "relevance": 5}
+                for h in chain_inputs["section"]["highlights"]
+            ]
+        )
+
+    def test_only_changed_sections_are_rewritten(self):
+        first = self.resume_improver.rewrite_unedited_experiences()
+        self.assertCountEqual(self.invoked, ["Company 0", "Company 1", "Company 2"])
+
+        self.invoked.clear()
+        self.resume_improver.experiences[1] = {
+            "company": "Company 1",
+            "highlights": ["Did something else"],
+        }
+        second = self.resume_improver.rewrite_unedited_experiences()
+        self.assertEqual(self.invoked, ["Company 1"])
+        self.assertEqual(second[0], first[0])
+        self.assertEqual(second[1]["highlights"], ["Did something else"])
+        self.assertEqual(
+            self.resume_improver.checkpoints.stats(), {"hits": 2, "misses": 4}
+        )
+
+    def test_job_change_invalidates_checkpoints(self):
+        self.resume_improver.rewrite_unedited_experiences()
+        self.invoked.clear()
+        self.resume_improver.parsed_job = {"job_title": "Manager"}
+        self.resume_improver.rewrite_unedited_experiences()
+        self.assertEqual(len(self.invoked), 3)
+
+
+class TestResumeDigest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.resume_path = os.path.join(self.tmp_dir.name, "resume.yaml")
+        shutil.copy(config.DEFAULT_RESUME_PATH, self.resume_path)
+        resume_digest._resume_digests.clear()
+        self.addCleanup(resume_digest._resume_digests.clear)
+
+    def test_digest_is_computed_once_and_stored_on_disk(self):
+        with mock.patch.object(
+            resume_digest.utils, "load_resume", wraps=resume_digest.utils.load_resume
+        ) as load_resume:
+            digest = get_resume_digest(self.resume_path)
+            self.assertIs(get_resume_digest(self.resume_path), digest)
+            resume_digest._resume_digests.clear()
+            self.assertEqual(
+                get_resume_digest(self.resume_path).fragments, digest.fragments
+            )
+        self.assertEqual(load_resume.call_count, 1)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.tmp_dir.name, ".resume.yaml.digest.json"))
+        )
+
+    def test_digest_is_recomputed_on_a_new_day(self):
+        digest = get_resume_digest(self.resume_path)
+        # Experience durations ending at Present depend on the day they were counted on
+        self.assertIn("years experience in:", digest.fragments["experiences"])
+        with mock.patch.object(
+            resume_digest, "_today", return_value="2999-01-01"
+        ), mock.patch.object(
+            resume_digest.utils, "load_resume", wraps=resume_digest.utils.load_resume
+        ) as load_resume:
+            tomorrow = get_resume_digest(self.resume_path)
+            resume_digest._resume_digests.clear()
+            self.assertIsNot(tomorrow, digest)
+            self.assertEqual(tomorrow.as_of, "2999-01-01")
+            get_resume_digest(self.resume_path)
+        self.assertEqual(load_resume.call_count, 1)
+
+    def test_improver_uses_digest_until_a_field_is_replaced(self):
+        improver = ResumeImprover(
+            "https://example.com/job", resume_location=self.resume_path, defer=True
+        )
+        improver._update_resume_fields()
+        improver.parsed_job = {}
+        inputs = improver._get_formatted_chain_inputs(["experiences", "skills"])
+        self.assertEqual(
+            inputs,
+            {
+                "experiences": str(chain_formatter("experiences", improver.experiences)),
+                "skills": str(chain_formatter("skills", improver.skills)),
+            },
+        )
+        improver.experiences = improver.experiences[:1]
+        inputs = improver._get_formatted_chain_inputs(["experiences"])
+        self.assertEqual(
+            inputs["experiences"], str(chain_formatter("experiences", improver.experiences))
+        )
+
+
+class TestStageGraph(unittest.TestCase):
+    def test_independent_stages_run_in_parallel(self):
+        graph = StageGraph(max_workers=4)
+        for name in ["skills", "objective", "experiences", "projects"]:
+            graph.add_stage(name, lambda name=name: time.sleep(0.1) or name, outputs=[name])
+        start = time.perf_counter()
+        results = graph.run()
+        self.assertLess(time.perf_counter() - start, 0.3)
+        self.assertEqual(results["projects"], "projects")
+        self.assertEqual(set(graph.timings), {"skills", "objective", "experiences", "projects"})
+
+    def test_stage_waits_for_its_inputs(self):
+        graph = StageGraph()
+        graph.add_stage("double", lambda value: value * 2, inputs=["value"], outputs=["doubled"])
+        graph.add_stage("add", lambda doubled, value: doubled + value, inputs=["doubled", "value"], outputs=["total"])
+        self.assertEqual(graph.run({"value": 3})["total"], 9)
+
+    def test_unsatisfied_inputs_raise(self):
+        graph = StageGraph()
+        graph.add_stage("orphan", lambda missing: missing, inputs=["missing"])
+        with self.assertRaises(ValueError):
+            graph.run()
+
+
+class TestTieredLLMCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.tmpdir.name, "llm_cache.sqlite3")
+        self.generations = [ChatGeneration(message=AIMessage(content="cached"))]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_entries_survive_a_restart(self):
+        TieredLLMCache(self.database_path).update("prompt", "llm", self.generations)
+        cache = TieredLLMCache(self.database_path)
+        self.assertEqual(cache.lookup("prompt", "llm")[0].text, "cached")
+        self.assertEqual(cache.lookup("prompt", "llm")[0].text, "cached")
+        self.assertIsNone(cache.lookup("prompt", "other llm"))
+        self.assertEqual(cache.stats()["disk_hits"], 1)
+        self.assertEqual(cache.stats()["memory_hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_memory_and_disk_tiers_are_bounded(self):
+        cache = TieredLLMCache(self.database_path, max_memory_entries=2, max_disk_entries=3)
+        for i in range(5):
+            cache.update(f"prompt {i}", "llm", self.generations)
+        self.assertEqual(cache.stats()["memory_entries"], 2)
+        self.assertIsNone(cache.lookup("prompt 0", "llm"))
+        self.assertIsNotNone(cache.lookup("prompt 2", "llm"))
+
+    def test_expired_entries_are_misses(self):
+        cache = TieredLLMCache(self.database_path, ttl_seconds=60)
+        cache.update("prompt", "llm", self.generations)
+        with mock.patch("time.time", return_value=time.time() + 120):
+            self.assertIsNone(cache.lookup("prompt", "llm"))
+
+
+class TestSharedHTTPClient(StandInServerTestCase):
+    def test_connections_are_reused(self):
+        before = get_http_client_stats()
+        for i in range(3):
+            get_http_client().get(f"{self.base_url}/{i}").raise_for_status()
+        after = get_http_client_stats()
+        self.assertEqual(after["requests"] - before["requests"], 3)
+        self.assertEqual(after["new_connections"] - before["new_connections"], 1)
+
+
+class RateLimitedHandler(StandInHandler):
+    """Stand-in job board that rejects every other request with a 429."""
+
+    requests_seen = 0
+
+    def do_GET(self):
+        type(self).requests_seen += 1
+        if type(self).requests_seen % 2:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_GET()
+
+
+class TestJobPostDownloader(StandInServerTestCase):
+    handler = RateLimitedHandler
+
+    def test_token_bucket_paces_requests(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            bucket.acquire()
+        self.assertAlmostEqual(now[0], 1.0)
+        bucket.pause(10)
+        bucket.acquire()
+        self.assertGreaterEqual(now[0], 11.0)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_retries_after_rate_limit(self):
+        RateLimitedHandler.requests_seen = 0
+        downloader = JobPostDownloader(rate_per_host=100, burst_per_host=10)
+        response = downloader.get(f"{self.base_url}/job")
+        self.assertIn("Posting /job", response.text)
+        self.assertEqual(RateLimitedHandler.requests_seen, 2)
+
+    def test_retries_connection_errors(self):
+        downloader = JobPostDownloader(
+            rate_per_host=100, burst_per_host=10, max_retries=3, backoff_factor=0
+        )
+        ok = mock.Mock(status_code=200)
+        with mock.patch.object(
+            downloader.session,
+            "get",
+            side_effect=[requests.ConnectionError("reset"), ok],
+        ) as get:
+            self.assertIs(downloader.get(f"{self.base_url}/job"), ok)
+        self.assertEqual(get.call_count, 2)
+
+    def test_does_not_pause_host_after_last_attempt(self):
+        downloader = JobPostDownloader(
+            rate_per_host=100, burst_per_host=10, max_retries=2, backoff_factor=0
+        )
+        busy = mock.Mock(status_code=503, headers={"Retry-After": "30"})
+        with mock.patch.object(
+            downloader.session, "get", return_value=busy
+        ), mock.patch.object(downloader.rate_limiter, "pause") as pause:
+            with self.assertRaises(requests.exceptions.RetryError):
+                downloader.get(f"{self.base_url}/job")
+        pause.assert_called_once()
+
+
+class SlowHandler(StandInHandler):
+    """Stand-in job board that takes a while to answer and has no `/missing` page."""
+
+    def do_GET(self):
+        time.sleep(0.2)
+        if self.path == "/missing":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_GET()
+
+
+class TestAsyncFetcher(StandInServerTestCase):
+    handler = SlowHandler
+
+    async def _collect(self, urls, **kwargs):
+        return [result async for result in fetch_job_posts(urls, **kwargs)]
+
+    def test_fetches_concurrently(self):
+        urls = [f"{self.base_url}/job{i}" for i in range(6)]
+        start = time.perf_counter()
+        results = asyncio.run(self._collect(urls, max_concurrency=6, max_per_host=6))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual({url for url, _ in results}, set(urls))
+        for url, html in results:
+            self.assertIn(f"Posting /{url.rsplit('/', 1)[1]}", html)
+
+    def test_per_host_cap(self):
+        urls = [f"{self.base_url}/job{i}" for i in range(4)]
+        start = time.perf_counter()
+        asyncio.run(self._collect(urls, max_concurrency=4, max_per_host=1))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.8)
+
+    def test_busy_host_does_not_starve_other_hosts(self):
+        port = self.server.server_address[1]
+        busy = [f"http://127.0.0.1:{port}/a{i}" for i in range(12)]
+        other = [f"http://localhost:{port}/b{i}" for i in range(2)]
+        finished = {}
+
+        async def collect():
+            start = time.perf_counter()
+            async for url, _ in fetch_job_posts(
+                busy + other, max_concurrency=4, max_per_host=2
+            ):
+                finished[url] = time.perf_counter() - start
+
+        asyncio.run(collect())
+        self.assertEqual(set(finished), set(busy + other))
+        self.assertLess(max(finished[url] for url in other), 0.6)
+
+    def test_failed_download_yields_none(self):
+        results = asyncio.run(self._collect([f"{self.base_url}/missing"]))
+        self.assertEqual(results, [(f"{self.base_url}/missing", None)])
+
+
+class ETagHandler(StandInHandler):
+    """Stand-in job board that answers conditional GETs."""
+
+    not_modified = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            type(self).not_modified += 1
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b"<html><body>Posting v1</body></html>"
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestHTMLArchive(StandInServerTestCase):
+    handler = ETagHandler
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.archive = HTMLArchive(self.tmpdir.name)
+
+    def tearDown(self):
+        super().tearDown()
+        self.tmpdir.cleanup()
+
+    def test_canonicalize_url(self):
+        self.assertEqual(
+            canonicalize_url("HTTPS://Jobs.Example.com:443/role?utm_source=x&b=2&a=1#apply"),
+            "https://jobs.example.com/role?a=1&b=2",
+        )
+
+    def test_store_and_load(self):
+        self.archive.store("https://example.com/job?utm_medium=email", "<p>Job</p>", etag='"abc"')
+        self.assertEqual(self.archive.load("https://example.com/job"), "<p>Job</p>")
+        self.assertEqual(
+            self.archive.conditional_headers("https://example.com/job"),
+            {"If-None-Match": '"abc"'},
+        )
+        self.assertEqual(
+            list(self.archive.iter_postings()), [("https://example.com/job", "<p>Job</p>")]
+        )
+
+    def test_unchanged_posting_uses_archived_copy(self):
+        ETagHandler.not_modified = 0
+        downloader = JobPostDownloader(rate_per_host=100, burst_per_host=10)
+        url = f"{self.base_url}/job"
+        first = downloader.fetch_text(url, archive=self.archive)
+        second = downloader.fetch_text(url, archive=self.archive)
+        self.assertEqual(first, second)
+        self.assertEqual(ETagHandler.not_modified, 1)
+
+
+class TestHTMLTextExtractor(unittest.TestCase):
+    def test_extracts_job_description(self):
+        with open(
+            os.path.join(config.TESTS_DATA_PATH, "example_job_posting.html"), encoding="utf-8"
+        ) as stream:
+            html = stream.read()
+        result = HTMLTextExtractor().extract(html)
+        self.assertIn("Data Infrastructure Engineer", result.text)
+        self.assertIn("$200K – $385K", result.text)
+        self.assertNotIn("Terms of use", result.text)
+        self.assertGreater(result.chars_saved, 0)
+        self.assertEqual(result.tokens_saved, result.chars_saved // 4)
+
+    def test_drops_boilerplate_without_main_region(self):
+        html = (
+            "<html><head><title>Engineer</title><style>p {}</style></head>"
+            "<body class='modal-open'><header>Site</header><nav>Home</nav>"
+            "<div id='cookie-banner'>Accept cookies</div><p>Build things.</p>"
+            "<footer>Legal</footer><script>track()</script></body></html>"
+        )
+        result = HTMLTextExtractor(parser="html.parser").extract(html)
+        self.assertEqual(result.text, "Engineer Build things.")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRateGovernor(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.governor = RateGovernor(
+            requests_per_minute=60,
+            tokens_per_minute=6000,
+            max_concurrency=8,
+            clock=self.clock,
+            sleep=self.clock.sleep,
+        )
+
+    def test_enforces_request_budget(self):
+        for _ in range(60):
+            self.governor.release(self.governor.acquire())
+        self.assertEqual(self.clock.now, 0)
+        self.governor.release(self.governor.acquire())
+        self.assertAlmostEqual(self.clock.now, 1.0)
+        self.assertAlmostEqual(self.governor.stats()["max_queued_seconds"], 1.0)
+
+    def test_enforces_token_budget(self):
+        self.governor.release(self.governor.acquire(estimated_tokens=6000))
+        self.assertEqual(self.clock.now, 0)
+        self.governor.release(self.governor.acquire(estimated_tokens=600))
+        self.assertAlmostEqual(self.clock.now, 6.0)
+
+    def test_aimd_concurrency_limit(self):
+        self.governor.release(self.governor.acquire(), status_code=429)
+        self.assertEqual(self.governor.stats()["concurrency_limit"], 4)
+        self.governor.release(self.governor.acquire(), status_code=429)
+        self.assertEqual(self.governor.stats()["concurrency_limit"], 4)
+        self.clock.now += 2
+        self.governor.release(self.governor.acquire(), status_code=503)
+        self.assertEqual(self.governor.stats()["concurrency_limit"], 2)
+        for _ in range(10):
+            self.governor.release(self.governor.acquire(), status_code=200)
+        self.assertGreater(self.governor.stats()["concurrency_limit"], 2)
+        stats = self.governor.stats()
+        self.assertEqual((stats["throttled"], stats["overloaded"]), (2, 1))
+
+    def test_transport_reports_usage_and_retry_after(self):
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "5"}),
+            httpx.Response(200, json={"usage": {"total_tokens": 3000}}),
+        ]
+        transport = GovernedTransport(
+            httpx.MockTransport(lambda request: responses.pop(0)), self.governor
+        )
+        with httpx.Client(transport=transport) as client:
+            body = {"messages": [{"role": "user", "content": "hi"}], "max_tokens": 10}
+            self.assertEqual(client.post("http://llm/", json=body).status_code, 429)
+            response = client.post("http://llm/", json=body)
+        self.assertEqual(response.json()["usage"]["total_tokens"], 3000)
+        self.assertGreaterEqual(self.clock.now, 5)
+        self.assertEqual(self.governor.stats()["throttled"], 1)
+        # The 3000 tokens used were charged, not just the ~30 estimated.
+        self.assertAlmostEqual(self.governor.token_bucket._tokens, 3000, delta=100)
+
+    def test_acquire_times_out_when_no_slot_frees_up(self):
+        governor = RateGovernor(max_concurrency=1, acquire_timeout=0.05)
+        permit = governor.acquire()
+        with self.assertRaises(TimeoutError):
+            governor.acquire()
+        governor.release(permit)
+        self.assertEqual(governor.stats()["in_flight"], 0)
+
+    def test_cancelled_async_request_does_not_leak_its_slot(self):
+        governor = RateGovernor(max_concurrency=1)
+        transport = AsyncGovernedTransport(
+            httpx.MockTransport(lambda request: httpx.Response(200)), governor
+        )
+        held = governor.acquire()
+
+        async def post():
+            async with httpx.AsyncClient(transport=transport) as client:
+                await asyncio.wait_for(client.get("http://llm/"), timeout=0.1)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(post())
+        # The abandoned wait gets the slot once it frees up, then hands it back
+        governor.release(held)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            stats = governor.stats()
+            if stats["requests"] == 2 and stats["in_flight"] == 0:
+                break
+            time.sleep(0.01)
+        self.assertEqual((stats["requests"], stats["in_flight"]), (2, 0))
+
+    def test_async_transport_reports_usage(self):
+        transport = AsyncGovernedTransport(
+            httpx.MockTransport(
+                lambda request: httpx.Response(200, json={"usage": {"total_tokens": 3000}})
+            ),
+            self.governor,
+        )
+
+        async def post():
+            async with httpx.AsyncClient(transport=transport) as client:
+                body = {"messages": [{"role": "user", "content": "hi"}], "max_tokens": 10}
+                return await client.post("http://llm/", json=body)
+
+        response = asyncio.run(post())
+        self.assertEqual(response.json()["usage"]["total_tokens"], 3000)
+        self.assertEqual(self.governor.stats()["in_flight"], 0)
+        self.assertAlmostEqual(self.governor.token_bucket._tokens, 3000, delta=100)
+
+
+class TestBackgroundRunner(unittest.TestCase):
+    def setUp(self):
+        self.runner = BackgroundRunner(max_workers=2)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_results_exceptions_and_bounded_workers(self):
+        active = []
+        max_active = []
+        lock = threading.Lock()
+
+        def work(i):
+            with lock:
+                active.append(i)
+                max_active.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(i)
+            if i == 3:
+                raise ValueError("bad posting")
+            return i * 2
+
+        futures = [self.runner.run_in_background(work, i) for i in range(6)]
+        results = self.runner.wait()
+        self.assertEqual(futures[1].result(), 2)
+        self.assertIsInstance(results[3], ValueError)
+        self.assertLessEqual(max(max_active), 2)
+        statuses = [task["status"] for task in self.runner.check_status()]
+        self.assertEqual(statuses.count("failed"), 1)
+        self.assertEqual(statuses.count("completed"), 5)
+
+    def test_stop_all_tasks_cancels_queued_work(self):
+        event = threading.Event()
+        for _ in range(4):
+            self.runner.run_in_background(event.wait, 5)
+        while sum(task.started_at is not None for task in self.runner.tasks) < 2:
+            time.sleep(0.01)
+        self.runner.stop_all_tasks()
+        event.set()
+        statuses = [task["status"] for task in self.runner.check_status()]
+        self.assertEqual(statuses.count("cancelled"), 2)
+
+    def test_failed_posting_is_reported_as_failed(self):
+        def create(improver, **kwargs):
+            if improver.url.endswith("bad"):
+                raise ValueError("bad posting")
+
+        with mock.patch.object(ResumeImprover, "prepare"), mock.patch.object(
+            ResumeImprover, "_create_tailored_resume_in_background", create
+        ):
+            output = ResumeImprover.create_draft_tailored_resumes_in_background(
+                [
+                    dict(url="https://example.com/good"),
+                    dict(url="https://example.com/bad"),
+                ]
+            )
+            runner = output["background_runner"]
+            self.addCleanup(runner.shutdown)
+            results = runner.wait()
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], ValueError)
+        statuses = [task["status"] for task in runner.check_status()]
+        self.assertEqual(statuses, ["completed", "failed"])
+
+
+class TestTaskQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.queue = TaskQueue(
+            database_path=os.path.join(self.tmp_dir.name, "queue.sqlite3"),
+            max_attempts=2,
+        )
+
+    def test_enqueue_is_idempotent(self):
+        first = self.queue.enqueue({"url": "https://Example.com/job?utm_source=x"})
+        second = self.queue.enqueue({"url": "https://example.com/job"})
+        self.assertEqual(first, second)
+        self.assertEqual(self.queue.counts(), {"pending": 1})
+
+    def test_claims_are_exclusive(self):
+        for i in range(20):
+            self.queue.enqueue({"url": f"https://example.com/job/{i}"})
+        claimed = []
+
+        def claim_all(worker_id):
+            while (task := self.queue.claim(worker_id)) is not None:
+                claimed.append(task.id)
+
+        threads = [
+            threading.Thread(target=claim_all, args=(f"worker-{i}",)) for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertCountEqual(claimed, range(1, 21))
+
+    def test_interrupted_tasks_are_requeued(self):
+        task_id = self.queue.enqueue({"url": "https://example.com/job"})
+        self.queue.claim("some-host:1:dead")
+        self.queue.update_stage(task_id, "draft", output_paths={"job_yaml": "job.yaml"})
+        self.assertIsNone(self.queue.claim("worker"))
+        with mock.patch("socket.gethostname", return_value="some-host"), mock.patch(
+            "os.kill", side_effect=ProcessLookupError
+        ):
+            self.assertEqual(self.queue.requeue_stale(), 1)
+        task = self.queue.claim("worker")
+        self.assertEqual(task.stage, "draft")
+        self.assertEqual(task.attempts, 2)
+        self.assertEqual(task.output_paths, {"job_yaml": "job.yaml"})
+
+    def test_expired_last_attempt_is_marked_failed_on_claim(self):
+        task_id = self.queue.enqueue({"url": "https://example.com/job"})
+        self.queue.lease_seconds = -1
+        self.queue.claim("worker-1")
+        self.assertEqual(self.queue.claim("worker-2").attempts, 2)
+        self.assertIsNone(self.queue.claim("worker-3"))
+        task = self.queue.get(task_id)
+        self.assertEqual(task.status, "failed")
+        self.assertIn("Exceeded max attempts", task.error)
+
+    def test_run_task_queue_retries_then_fails(self):
+        self.queue.enqueue({"url": "https://example.com/ok"})
+        self.queue.enqueue({"url": "https://example.com/broken"})
+
+        def process(queue, task):
+            if "broken" in task.config["url"]:
+                raise RuntimeError("no job post")
+            return {"resume_yaml": "resume.yaml"}
+
+        with mock.patch.object(task_queue, "process_queued_task", process):
+            counts = run_task_queue(self.queue, max_workers=2)
+        self.assertEqual(counts, {"completed": 1, "failed": 1})
+        failed = self.queue.tasks(status="failed")[0]
+        self.assertEqual(failed.attempts, 2)
+        self.assertIn("no job post", failed.error)
+        completed = self.queue.tasks(status="completed")[0]
+        self.assertEqual(completed.output_paths, {"resume_yaml": "resume.yaml"})
+
+
 class TestLangchainHelpers(unittest.TestCase):
     def test_create_llm(self):
         llm = create_llm()
         self.assertIsNotNone(llm)
+        self.assertIs(llm.http_client, create_llm().http_client)
+        self.assertIsInstance(llm.http_async_client, httpx.AsyncClient)
+        self.assertIs(llm.http_async_client, create_llm().http_async_client)
+
+    def test_closing_http_clients_drops_compiled_chains(self):
+        chain = get_compiled_chain("SECTION_HIGHLIGHTER", ResumeSectionHighlighterOutput)[0]
+        client = get_http_client()
+        close_http_client()
+        self.assertTrue(client.is_closed)
+        self.assertIsNot(
+            chain,
+            get_compiled_chain("SECTION_HIGHLIGHTER", ResumeSectionHighlighterOutput)[0],
+        )
+        self.assertIsNot(client, create_llm().http_client)
+
+    def test_closing_inside_an_event_loop_closes_the_async_client(self):
+        async def close():
+            client = create_llm().http_async_client
+            close_http_client()
+            await asyncio.sleep(0)
+            gc.collect()
+            await asyncio.sleep(0.05)
+            return client
+
+        self.assertTrue(asyncio.run(close()).is_closed)
+
+    def test_get_compiled_chain_is_reused(self):
+        chain, input_keys = get_compiled_chain(
+            "SECTION_HIGHLIGHTER", ResumeSectionHighlighterOutput
+        )
+        self.assertIs(
+            chain,
+            get_compiled_chain("SECTION_HIGHLIGHTER", ResumeSectionHighlighterOutput)[0],
+        )
+        self.assertIn("section", input_keys)
+        self.assertIsNot(
+            chain,
+            get_compiled_chain(
+                "SECTION_HIGHLIGHTER", ResumeSectionHighlighterOutput, temperature=0.0
+            )[0],
+        )
+
+    def test_parse_date_fast_paths_match_dateutil(self):
+        from dateutil import parser as dateparser
+
+        default = datetime(datetime.today().year, 1, 1)
+        dates = [2019, "2024", "Jan 2024", "September 2021", "Sept. 2021"]
+        dates += ["2023-05", "2023-05-17", "05/2023"]
+        for text in dates:
+            self.assertEqual(
+                parse_date(text), dateparser.parse(str(text), default=default), text
+            )
+        self.assertEqual(parse_date("Present").date(), datetime.today().date())
+        self.assertEqual(parse_date("current").date(), datetime.today().date())
+
+    def test_dates_without_a_year_follow_the_current_year(self):
+        from ..services import langchain_helpers
+
+        class NextYear(datetime):
+            @classmethod
+            def today(cls):
+                return datetime(datetime.today().year + 1, 1, 1)
+
+        this_year = parse_date("March 5").year
+        with mock.patch.object(langchain_helpers, "datetime", NextYear):
+            self.assertEqual(parse_date("March 5").year, this_year + 1)
+
+    def test_invalid_date_leaves_llm_cache_alone(self):
+        with mock.patch.object(TieredLLMCache, "clear") as clear:
+            with self.assertRaises(ValueError):
+                parse_date("not a date")
+        clear.assert_not_called()
+
+    def test_cumulative_time_skips_titles_without_dates(self):
+        titles = [
+            {"name": "Intern"},
+            {"name": "Engineer", "startdate": "Jan 2020", "enddate": "Jan 2023"},
+        ]
+        self.assertEqual(get_cumulative_time_from_titles(titles), 3)
 
 
 if __name__ == "__main__":
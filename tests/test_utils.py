@@ -1,11 +1,22 @@
 import unittest
 from ..utils.yaml_handler import read_yaml, write_yaml, dict_to_yaml_string
+from ..utils import resume_format_checker
+from ..utils.resume_format_checker import check_resume_format, load_resume
+from ..utils import file_watcher
+from ..utils.file_watcher import PollingWatch, wait_until_review_complete
+from ..utils.singleton import process_singleton
 from ..utils.file_handler import (
     read_jobfile,
     generator_key_in_nested_dict,
     get_dict_field,
+    atomic_write,
 )
 import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
 from ..config import config
 
 
@@ -31,6 +42,185 @@ class TestYamlHandler(unittest.TestCase):
         yaml_string = dict_to_yaml_string(data)
         self.assertIn("key: value", yaml_string)
 
+    def test_read_yaml_text(self):
+        self.assertEqual(read_yaml(yaml_text="key: [1, 2]"), {"key": [1, 2]})
+
+    def test_tuples_are_written_as_lists(self):
+        yaml_string = dict_to_yaml_string({"key": ("a", "b")})
+        self.assertEqual(read_yaml(yaml_text=yaml_string), {"key": ["a", "b"]})
+
+    def test_round_trip_keeps_comments(self):
+        filename = os.path.join(config.TESTS_DATA_PATH, "test_round_trip.yaml")
+        self.addCleanup(os.remove, filename)
+        with open(filename, "w") as stream:
+            stream.write("# Reviewed\nediting: true  # set to false when done\nname: Jane\n")
+        data = read_yaml(filename=filename, round_trip=True)
+        data["editing"] = False
+        write_yaml(data, filename=filename, round_trip=True)
+        with open(filename, "r") as stream:
+            text = stream.read()
+        self.assertIn("# Reviewed", text)
+        self.assertIn("editing: false", text)
+        self.assertIn("# set to false when done", text)
+
+
+class TestAtomicWrite(unittest.TestCase):
+    def test_atomic_write_creates_directories_and_replaces(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "nested", "file.bin")
+            atomic_write(path, b"first")
+            atomic_write(path, memoryview(b"second"))
+            with open(path, "rb") as stream:
+                self.assertEqual(stream.read(), b"second")
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["file.bin"])
+
+    def test_atomic_write_keeps_permissions(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "resume.yaml")
+            atomic_write(path, b"first")
+            plain_path = os.path.join(tmp_dir, "plain.yaml")
+            open(plain_path, "wb").close()
+            self.assertEqual(os.stat(path).st_mode, os.stat(plain_path).st_mode)
+            os.chmod(path, 0o640)
+            atomic_write(path, b"second")
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+
+    def test_atomic_write_to_a_bare_file_name(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cwd = os.getcwd()
+            os.chdir(tmp_dir)
+            try:
+                atomic_write("resume.yaml", b"data")
+            finally:
+                os.chdir(cwd)
+            self.assertEqual(os.listdir(tmp_dir), ["resume.yaml"])
+
+
+class TestProcessSingleton(unittest.TestCase):
+    def test_concurrent_first_calls_build_one_instance(self):
+        built = []
+
+        @process_singleton
+        def get_instance():
+            time.sleep(0.05)
+            built.append(object())
+            return built[-1]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_instance()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(built), 1)
+        self.assertEqual(set(map(id, results)), {id(built[0])})
+        self.assertEqual(get_instance.__name__, "get_instance")
+
+
+class TestResumeLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.resume_path = os.path.join(self.tmp_dir.name, "resume.yaml")
+        shutil.copy(config.DEFAULT_RESUME_PATH, self.resume_path)
+
+    def test_check_resume_format_accepts_parsed_data(self):
+        resume = read_yaml(filename=self.resume_path)
+        self.assertEqual(
+            check_resume_format(resume), check_resume_format(self.resume_path)
+        )
+        resume["experiences"][0]["titles"][0]["startdate"] = 2020.5
+        self.assertFalse(check_resume_format(resume))
+
+    def test_error_in_list_entry_shows_example(self):
+        resume = read_yaml(filename=self.resume_path)
+        del resume["experiences"][0]["company"]
+        with mock.patch.object(config.logger, "error") as log_error:
+            self.assertFalse(check_resume_format(resume))
+        message = log_error.call_args[0][0]
+        self.assertIn("'company'", message)
+        self.assertIn(resume_format_checker.EXAMPLE_SNIPPETS["experiences"], message)
+        self.assertNotIn("None", message)
+
+    def test_resume_is_parsed_once_until_it_changes(self):
+        with mock.patch.object(
+            resume_format_checker, "read_yaml", wraps=read_yaml
+        ) as parse:
+            first = load_resume(self.resume_path)
+            first["basic"]["name"] = "Changed"
+            second = load_resume(self.resume_path)
+            self.assertEqual(parse.call_count, 1)
+            self.assertNotEqual(second["basic"]["name"], "Changed")
+
+            with open(self.resume_path, "a") as stream:
+                stream.write("\n# edited\n")
+            load_resume(self.resume_path)
+            self.assertEqual(parse.call_count, 2)
+
+
+class TestFileWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "resume.yaml")
+        write_yaml({"editing": True, "name": "Jane"}, filename=self.path)
+
+    def _finish_review_after(self, delay):
+        def finish():
+            time.sleep(delay)
+            write_yaml({"editing": True, "name": "Jane Doe"}, filename=self.path)
+            time.sleep(delay)
+            self.saved_at = time.monotonic()
+            write_yaml({"editing": False, "name": "Jane Doe"}, filename=self.path)
+
+        thread = threading.Thread(target=finish)
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def test_wakes_up_when_review_is_saved(self):
+        self._finish_review_after(0.1)
+        self.assertTrue(wait_until_review_complete(self.path, timeout=5))
+        self.assertLess(time.monotonic() - self.saved_at, 0.1)
+
+    def test_polling_fallback(self):
+        self._finish_review_after(0.1)
+        with mock.patch.object(
+            file_watcher,
+            "watch_file",
+            lambda path: PollingWatch(path, poll_interval=0.01),
+        ):
+            self.assertTrue(wait_until_review_complete(self.path, timeout=5))
+
+    def test_timeout(self):
+        start = time.monotonic()
+        self.assertFalse(wait_until_review_complete(self.path, timeout=0.2))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_concurrent_reviews(self):
+        other_path = os.path.join(self.tmp_dir.name, "other.yaml")
+        write_yaml({"editing": True}, filename=other_path)
+        results = {}
+        threads = [
+            threading.Thread(
+                target=lambda p=p: results.update(
+                    {p: wait_until_review_complete(p, timeout=5)}
+                )
+            )
+            for p in (self.path, other_path)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        write_yaml({"editing": False}, filename=other_path)
+        threads[1].join()
+        self.assertEqual(results, {other_path: True})
+        write_yaml({"editing": False}, filename=self.path)
+        threads[0].join()
+        self.assertEqual(results, {other_path: True, self.path: True})
+
 
 class TestFileHandler(unittest.TestCase):
     def test_generator_key_in_nested_dict(self):
@@ -1,4 +1,6 @@
 from .yaml_handler import *
 from .file_handler import *
 from .pdf_generator import *
-from .resume_format_checker import *
\ No newline at end of file
+from .resume_format_checker import *
+from .file_watcher import *
+from .singleton import *
@@ -1,4 +1,6 @@
 import os
+import stat
+import tempfile
 from typing import Union, List, Generator, Optional
 from .. import config
 from .. import utils
@@ -63,3 +65,37 @@ def get_dict_field(field: str, data_dict: dict) -> Optional[dict]:
         message = f"`{field}` is missing in raw resume."
         config.logger.warning(message)
     return None
+
+
+# Read once, since reading the umask briefly changes it for every thread
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """
+    Writes bytes to a file so that readers never see a partial file.
+
+    The data is written to a temporary file in the same directory, which then
+    replaces `path`. Missing parent directories are created. An existing file keeps
+    its permissions; a new one gets the default permissions for the umask.
+
+    Args:
+        path (str): Path to the file.
+        data (bytes): The content, as bytes or any bytes-like object.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as stream:
+            stream.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
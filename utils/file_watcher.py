@@ -0,0 +1,213 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Optional
+from .. import config
+from .yaml_handler import YAML_ERRORS, read_yaml
+
+# inotify event masks, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def _load_libc():
+    """Load libc if it provides inotify, else return None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+_libc = _load_libc()
+INOTIFY_AVAILABLE = _libc is not None
+
+
+class PollingWatch:
+    """Detect writes to a file by polling its modification time and size."""
+
+    def __init__(self, path: str, poll_interval: float = None):
+        """Start watching a file.
+
+        Args:
+            path (str): The file to watch.
+            poll_interval (float, optional): Seconds between checks. Defaults to `config.FILE_WATCH_POLL_INTERVAL`.
+        """
+        self.path = path
+        self.poll_interval = poll_interval or config.FILE_WATCH_POLL_INTERVAL
+        self._signature = self._stat()
+
+    def _stat(self):
+        """Return the file's modification time and size, or None if it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the file is written.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait. Defaults to no limit.
+
+        Returns:
+            bool: True if the file changed, False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            signature = self._stat()
+            if signature != self._signature:
+                self._signature = signature
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            delay = self.poll_interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class InotifyWatch:
+    """Detect writes to a file with Linux inotify.
+
+    The file's directory is watched, so editors that save by writing a new file and
+    renaming it over the old one are noticed too. Events fire when the file is closed
+    after writing, never on a half-written file.
+    """
+
+    def __init__(self, path: str):
+        """Start watching a file.
+
+        Args:
+            path (str): The file to watch.
+        """
+        self.path = path
+        self._name = os.fsencode(os.path.basename(path))
+        self._fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        directory = os.path.dirname(os.path.abspath(path))
+        if _libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO
+        ) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, os.strerror(errno), directory)
+
+    def _file_written(self) -> bool:
+        """Drain pending events and report whether any of them concerns the file."""
+        written = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return written
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                written = written or name == self._name
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the file is written.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait. Defaults to no limit.
+
+        Returns:
+            bool: True if the file changed, False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if readable and self._file_written():
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self):
+        """Stop watching and release the inotify instance."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def watch_file(path: str, poll_interval: float = None):
+    """Start watching a file for writes, with inotify when available, else by polling.
+
+    Args:
+        path (str): The file to watch.
+        poll_interval (float, optional): Seconds between checks when polling.
+
+    Returns:
+        InotifyWatch | PollingWatch: The watch. Use it as a context manager or call `close`.
+    """
+    if INOTIFY_AVAILABLE:
+        try:
+            return InotifyWatch(path)
+        except OSError as e:
+            config.logger.warning(f"Could not watch {path} with inotify ({e}). Polling instead.")
+    return PollingWatch(path, poll_interval=poll_interval)
+
+
+def _is_editing(path: str) -> bool:
+    """Read the `editing` flag of a resume YAML file. Unreadable files count as still being edited."""
+    try:
+        return bool((read_yaml(filename=path) or {}).get("editing", False))
+    except (OSError, *YAML_ERRORS):
+        return True
+
+
+def wait_until_review_complete(path: str, timeout: Optional[float] = None) -> bool:
+    """Block until the reviewer sets `editing: false` in a resume YAML file.
+
+    The file is only re-read after it has been written, so the wait costs nothing
+    while the reviewer is working and returns as soon as they save.
+
+    Args:
+        path (str): The resume YAML file under review.
+        timeout (float, optional): Maximum number of seconds to wait. Defaults to no limit.
+
+    Returns:
+        bool: True if the review is complete, False if the timeout expired first.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with watch_file(path) as watch:
+        while _is_editing(path):
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+            watch.wait(remaining)
+    return True
@@ -1,59 +1,54 @@
-import yaml
+import copy
+import os
+import threading
+from typing import Callable, Union
 from .. import config
+from .yaml_handler import read_yaml
 
-def check_resume_format(yaml_file_path: str) -> bool:
-    """Check if the resume format is correct and provide suggestions for corrections.
-
-    Args:
-        yaml_file_path (str): The path to the resume YAML file.
-
-    Returns:
-        bool: True if the format is correct, False otherwise.
-    """
-    expected_format = {
-        "editing": bool,
-        "debug": bool,
-        "basic": {
+RESUME_FORMAT = {
+    "editing": bool,
+    "debug": bool,
+    "basic": {
+        "name": str,
+        "address": str,
+        "email": str,
+        "phone": str,
+        "websites": [str],
+    },
+    "objective": str,
+    "education": [{"school": str, "degrees": [{"names": [str]}]}],
+    "experiences": [
+        {
+            "company": str,
+            "skip_name": bool,
+            "location": str,
+            "titles": [
+                {
+                    "name": str,
+                    "startdate": (int, str),  # startdate can be int or str
+                    "enddate": (int, str),  # enddate can be int or str
+                }
+            ],
+            "highlights": [str],
+        }
+    ],
+    "projects": [
+        {
             "name": str,
-            "address": str,
-            "email": str,
-            "phone": str,
-            "websites": [str],
-        },
-        "objective": str,
-        "education": [{"school": str, "degrees": [{"names": [str]}]}],
-        "experiences": [
-            {
-                "company": str,
-                "skip_name": bool,
-                "location": str,
-                "titles": [
-                    {
-                        "name": str,
-                        "startdate": (int, str),  # startdate can be int or str
-                        "enddate": (int, str),  # enddate can be int or str
-                    }
-                ],
-                "highlights": [str],
-            }
-        ],
-        "projects": [
-            {
-                "name": str,
-                "hyperlink": bool,
-                "show_link": bool,
-                "date": str,
-                "link": str,
-                "highlights": [str],
-            }
-        ],
-        "skills": [{"category": str, "skills": [str]}],
-    }
-    
-    example_snippets = {
-        "editing": "editing: true",
-        "debug": "debug: false",
-        "basic": """basic:
+            "hyperlink": bool,
+            "show_link": bool,
+            "date": str,
+            "link": str,
+            "highlights": [str],
+        }
+    ],
+    "skills": [{"category": str, "skills": [str]}],
+}
+
+EXAMPLE_SNIPPETS = {
+    "editing": "editing: true",
+    "debug": "debug: false",
+    "basic": """basic:
   name: John Doe
   address: Los Angeles, CA
   email: johndoe@example.com
@@ -61,8 +56,8 @@ def check_resume_format(yaml_file_path: str) -> bool:
   websites:
       - https://linkedin.com/johndoe
       - https://github.com/johndoe""",
-        "objective": "objective: A Software Engineer with over 8 years of experience...",
-        "education": """education:
+    "objective": "objective: A Software Engineer with over 8 years of experience...",
+    "education": """education:
   - school: University of California, Berkeley
     degrees:
       - names:
@@ -71,7 +66,7 @@ def check_resume_format(yaml_file_path: str) -> bool:
     degrees:
       - names:
           - M.S. Computer Science""",
-        "experiences": """experiences:
+    "experiences": """experiences:
   - company: Tech Innovators Inc.
     skip_name: false
     location: San Francisco, CA
@@ -84,7 +79,7 @@ def check_resume_format(yaml_file_path: str) -> bool:
       - Implemented a microservices architecture, reducing system downtime by 30%.
       - Mentored a team of junior developers, fostering a culture of continuous learning and improvement.
       - Spearheaded the integration of AI-driven features, enhancing product capabilities and user satisfaction.""",
-      "projects":"""projects:
+    "projects": """projects:
 - name: Example Github Project
   link: https://www.github.com/username/project
   date: Jan 2024
@@ -97,7 +92,7 @@ def check_resume_format(yaml_file_path: str) -> bool:
       - Wrote comprehensive documentation and unit tests, ensuring code quality and ease of collaboration.
       - Conducted code reviews and collaborated with open-source contributors, fostering a community-driven development process.
       - Achieved over 1,000 stars on GitHub, demonstrating the project's popularity and utility within the developer community.""",
-        "skills": """skills:
+    "skills": """skills:
   - category: Technical
     skills:
       - JavaScript
@@ -119,60 +114,84 @@ def check_resume_format(yaml_file_path: str) -> bool:
       - Team leadership
       - Project management
       - Agile methodologies"""
-    }
-    
-    def validate_format(actual, expected, path=""):
-        """Recursively validate the format of the actual YAML content against the expected format.
-
-        Args:
-            actual (Any): The actual content from the YAML file.
-            expected (Any): The expected format to validate against.
-            path (str, optional): The current path in the YAML structure. Defaults to "".
-
-        Returns:
-            list: A list of errors found during validation.
-        """
-        if isinstance(expected, dict):
+}
+
+def _type_name(expected) -> str:
+    """Describe an expected type, e.g. `int or str` for `(int, str)`."""
+    if isinstance(expected, tuple):
+        return " or ".join(t.__name__ for t in expected)
+    return expected.__name__
+
+
+def _compile_format(expected) -> Callable[[object, str], list]:
+    """Compile an expected format into a validator function.
+
+    The validator takes the actual content and its path in the YAML structure, and
+    returns a list of `(path, expected type, actual type)` errors. Errors for missing
+    keys have `"missing"` as the actual type.
+
+    Args:
+        expected (Any): A dict or single-item list of expected formats, a type, or a tuple of types.
+
+    Returns:
+        Callable[[object, str], list]: The validator.
+    """
+    if isinstance(expected, dict):
+        fields = [
+            (key, _compile_format(value), value) for key, value in expected.items()
+        ]
+
+        def validate_dict(actual, path=""):
             if not isinstance(actual, dict):
                 return [(path, "dict", type(actual).__name__)]
             errors = []
-            for key, expected_type in expected.items():
+            for key, validate_value, value in fields:
                 if key not in actual:
-                    errors.append((f"{path}/{key}", expected_type, "missing"))
+                    errors.append((f"{path}/{key}", value, "missing"))
                 else:
-                    errors.extend(validate_format(actual[key], expected_type, f"{path}/{key}"))
+                    errors.extend(validate_value(actual[key], f"{path}/{key}"))
             return errors
-        elif isinstance(expected, list):
+
+        return validate_dict
+    if isinstance(expected, list):
+        validate_item = _compile_format(expected[0]) if expected else None
+
+        def validate_list(actual, path=""):
             if not isinstance(actual, list):
                 return [(path, "list", type(actual).__name__)]
-            if len(expected) == 0:
+            if validate_item is None:
                 return []  # No specific type to check against
             errors = []
             for index, item in enumerate(actual):
-                errors.extend(validate_format(item, expected[0], f"{path}[{index}]"))
+                errors.extend(validate_item(item, f"{path}[{index}]"))
             return errors
-        else:
-            if not isinstance(actual, expected):
-                return [(path, expected.__name__, type(actual).__name__)]
-            return []
 
-    with open(yaml_file_path, "r") as file:
-        actual_yaml_dict = yaml.safe_load(file)
+        return validate_list
+    expected_name = _type_name(expected)
 
-    errors = validate_format(actual_yaml_dict, expected_format)
+    def validate_value(actual, path=""):
+        if not isinstance(actual, expected):
+            return [(path, expected_name, type(actual).__name__)]
+        return []
 
-    def get_example_snippet(path):
-        """Retrieve an example snippet for a given path.
+    return validate_value
 
-        Args:
-            path (str): The path in the YAML structure.
 
-        Returns:
-            str: An example snippet corresponding to the path.
-        """
-        key = path.split('/')[1]
-        key = key.split('[')[0]
-        return example_snippets.get(key, None)
+validate_resume_format = _compile_format(RESUME_FORMAT)
+
+
+def check_resume_format(resume: Union[str, dict]) -> bool:
+    """Check if the resume format is correct and provide suggestions for corrections.
+
+    Args:
+        resume (Union[str, dict]): The path to the resume YAML file, or its already parsed content.
+
+    Returns:
+        bool: True if the format is correct, False otherwise.
+    """
+    if isinstance(resume, str):
+        resume = read_yaml(filename=resume)
+    errors = validate_resume_format(resume)
 
     consolidated_errors = {}
 
@@ -193,14 +212,12 @@ def check_resume_format(yaml_file_path: str) -> bool:
         
         if actual == "missing":
             consolidated_errors[main_key]["missing"].append(sub_key)
-        elif isinstance(expected, str):
-            consolidated_errors[main_key]["incorrect"].append((sub_key, actual, expected))
         else:
-            consolidated_errors[main_key]["incorrect"].append((sub_key, actual, expected.__name__))
+            consolidated_errors[main_key]["incorrect"].append((sub_key, actual, expected))
     logger_error = ""
     if consolidated_errors:
         for main_key, issues in consolidated_errors.items():
-            example_snippet = get_example_snippet(f"/{main_key}")
+            example_snippet = EXAMPLE_SNIPPETS.get(main_key.split("[")[0])
             if main_key == "experiences" and issues["entries"]:
                 entries = ", ".join(set(issues["entries"]))
                 logger_error+=f"\nYou have formatting errors in these experiences entries: '{entries}'. Make sure they are formatted like this example:\n\n```yaml\n{example_snippet}\n```"
@@ -220,3 +237,32 @@ def check_resume_format(yaml_file_path: str) -> bool:
         return False
     else:
         return True
+
+
+_resume_cache = {}
+_resume_cache_lock = threading.Lock()
+
+
+def load_resume(filename: str) -> dict:
+    """Parse and validate a resume YAML file, reusing the result while the file is unchanged.
+
+    Results are cached per process, keyed by the file's path, modification time and
+    size. Each call returns a deep copy, so callers may modify it freely.
+
+    Args:
+        filename (str): The path to the resume YAML file.
+
+    Returns:
+        dict: The parsed resume.
+    """
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _resume_cache_lock:
+        cached = _resume_cache.get(path)
+        if cached is None or cached[0] != key:
+            resume = read_yaml(filename=path)
+            check_resume_format(resume)
+            cached = (key, resume)
+            _resume_cache[path] = cached
+    return copy.deepcopy(cached[1])
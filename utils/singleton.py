@@ -0,0 +1,32 @@
+import functools
+import threading
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def process_singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """
+    Decorates a factory so that every call returns the same object.
+
+    The object is built on the first call. A lock makes sure concurrent first
+    calls from several threads still build only one.
+
+    Args:
+        factory (Callable[[], T]): Builds the shared object.
+
+    Returns:
+        Callable[[], T]: Returns the shared object.
+    """
+    instance = None
+    lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def get_instance() -> T:
+        nonlocal instance
+        with lock:
+            if instance is None:
+                instance = factory()
+            return instance
+
+    return get_instance
@@ -1,17 +1,58 @@
+import sys
 import yaml
-from ruamel.yaml.error import YAMLError
+from ruamel.yaml import YAML
+from ruamel.yaml.error import YAMLError as RoundTripYAMLError
 from io import StringIO
 from typing import Optional
 from .. import config
 
+# Use the libyaml C implementation when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
 
-def read_yaml(yaml_text: str = "", filename: str = "") -> Optional[dict]:
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+    LIBYAML_AVAILABLE = False
+
+YAML_ERRORS = (yaml.YAMLError, RoundTripYAMLError)
+
+
+class ResumeDumper(SafeDumper):
+    """Safe YAML dumper that writes tuples as plain lists."""
+
+
+ResumeDumper.add_representer(tuple, ResumeDumper.represent_list)
+
+
+def _round_trip_yaml() -> YAML:
+    """Create a ruamel.yaml instance that preserves comments, key order and quoting."""
+    round_trip = YAML(typ="rt")
+    round_trip.preserve_quotes = True
+    round_trip.allow_unicode = True
+    return round_trip
+
+
+def _dump(data, stream, round_trip: bool = False):
+    """Dump data to a stream with the fast safe dumper or, if requested, ruamel.yaml."""
+    if round_trip:
+        _round_trip_yaml().dump(data, stream)
+    else:
+        yaml.dump(data, stream, Dumper=ResumeDumper, allow_unicode=True)
+
+
+def read_yaml(
+    yaml_text: str = "", filename: str = "", round_trip: bool = False
+) -> Optional[dict]:
     """
     Reads YAML content from a string or a file.
 
     Args:
         yaml_text (str): YAML content as a string.
         filename (str): Path to the YAML file.
+        round_trip (bool): Load with ruamel.yaml so that comments and formatting of
+            user-edited files survive a later `write_yaml(..., round_trip=True)`.
 
     Returns:
         dict: Parsed YAML content as a dictionary.
@@ -21,39 +62,44 @@ def read_yaml(yaml_text: str = "", filename: str = "") -> Optional[dict]:
         return None
     if yaml_text:
         try:
-            return yaml.load(yaml_text)
-        except YAMLError as e:
+            if round_trip:
+                return _round_trip_yaml().load(yaml_text)
+            return yaml.load(yaml_text, Loader=SafeLoader)
+        except YAML_ERRORS as e:
             config.logger.error(f"The text could not be read.")
             raise e
     try:
         with open(filename, "r") as data:
-            return yaml.safe_load(data)
-    except YAMLError as e:
+            if round_trip:
+                return _round_trip_yaml().load(data)
+            return yaml.load(data, Loader=SafeLoader)
+    except YAML_ERRORS as e:
         config.logger.error(f"The {filename} could not be read.")
         raise e
     except Exception as e:
         config.logger.error(
-            f"The {filename} could not be written due to an unknown error."
+            f"The {filename} could not be read due to an unknown error."
         )
         raise e
 
 
-def write_yaml(data: dict, filename: str = None) -> None:
+def write_yaml(data: dict, filename: str = None, round_trip: bool = False) -> None:
     """
     Writes a dictionary to a YAML file or prints it to stdout.
 
     Args:
         data (dict): Data to be written to YAML.
         filename (str): Path to the YAML file.
+        round_trip (bool): Write with ruamel.yaml, keeping the comments and formatting
+            of data loaded with `read_yaml(..., round_trip=True)`.
     """
-    yaml.allow_unicode = True
     try:
         if filename:
             with open(filename, "w") as stream:
-                yaml.dump(data, stream)
+                _dump(data, stream, round_trip=round_trip)
         else:
-            yaml.dump(data, sys.stdout)
-    except YAMLError as e:
+            _dump(data, sys.stdout, round_trip=round_trip)
+    except YAML_ERRORS as e:
         config.logger.error(f"The {filename} could not be written.")
         raise e
     except Exception as e:
@@ -73,12 +119,10 @@ def dict_to_yaml_string(data: dict) -> str:
     Returns:
         str: YAML-formatted string.
     """
-    yaml.allow_unicode = True
     try:
-        yaml.allow_unicode = True
         stream = StringIO()
-        yaml.dump(data, stream=stream)
+        _dump(data, stream)
         return stream.getvalue()
-    except YAMLError as e:
+    except YAML_ERRORS as e:
         config.logger.error("Failed to convert dict to YAML string.")
         raise e